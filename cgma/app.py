@@ -1,19 +1,22 @@
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
-from cgmalexer import run as lexer_run
-from cgmaparser import LL1Parser
-from cfg import cfg, predict_sets
+from cgmalexer import cached_run as lexer_run, token_cache
+from cgmaparser import parser
 from cgmasemantic import SemanticAnalyzer
 import os
 
 from cgmasemantic import build_ast
 from cgmasemantic import SemanticError
-from cgmasemantic import symbol_table
 from cgmasemantic import SymbolTable
 
 app = Flask(__name__)
 CORS(app)
 
+# Keeps responses to pasted binaries and minified blobs small
+LEX_MAX_ERRORS = 100
+# Syntax errors reported per /api/parse request, so one round trip shows them all
+PARSE_MAX_ERRORS = 50
+
 @app.route('/')
 def index():
     return send_from_directory(os.path.dirname(__file__), 'index.html')
@@ -30,19 +33,26 @@ def script():
 def lex():
     data = request.json
     source_code = data.get('source_code', '')
-    tokens, errors = lexer_run('<stdin>', source_code)
+    tokens, errors = lexer_run('<stdin>', source_code, max_errors=LEX_MAX_ERRORS)
     return jsonify({'tokens': [{'type': token.type, 'value': token.value} for token in tokens], 'errors': [error.as_string() for error in errors]})
 
+@app.route('/api/lex/cache', methods=['GET'])
+def lex_cache():
+    return jsonify(token_cache.stats())
+
 @app.route('/api/parse', methods=['POST'])
 def parse():
     data = request.json
     source_code = data.get('source_code', '')
-    tokens, errors = lexer_run('<stdin>', source_code)
-    if errors:
-        return jsonify({'success': False, 'errors': [error.as_string() for error in errors]})
-
-    parser = LL1Parser(cfg, predict_sets)
-    success, parse_errors = parser.parse(tokens)
+    # runSyntax() calls /api/lex first, so the tokens are usually cached.
+    # Otherwise the source is lexed as it is parsed, and both stop at the
+    # first lexical error; cached tokens with lexical errors go the same way
+    # so the errors come out in the same order.
+    cached = token_cache.get('<stdin>', source_code, max_errors=LEX_MAX_ERRORS)
+    if cached is not None and not cached[1]:
+        success, parse_errors = parser.parse(cached[0], max_errors=PARSE_MAX_ERRORS)
+    else:
+        success, parse_errors = parser.parse_stream('<stdin>', source_code, max_errors=PARSE_MAX_ERRORS)
     if not success:
         return jsonify({'success': False, 'errors': parse_errors})
     return jsonify({'success': True, 'errors': []})
@@ -54,25 +64,21 @@ def semantic_analysis():
     data = request.json
     source_code = data.get('source_code', '')
 
-    global symbol_table
-    symbol_table = SymbolTable()
-
-    tokens, errors = lexer_run('<stdin>', source_code)
+    tokens, errors = lexer_run('<stdin>', source_code, max_errors=LEX_MAX_ERRORS)
     if errors:
         return jsonify({'success': False, 'errors': [error.as_string() for error in errors]})
 
-    parser = LL1Parser(cfg, predict_sets)
-    success, parse_errors = parser.parse(tokens)
+    derivation = []
+    success, parse_errors = parser.parse(tokens, derivation=derivation)
 
     if not success:
         return jsonify({'success': False, 'errors': ['Syntax errors found']})
 
     try:
-        semantic_tokens = [token for token in tokens if getattr(token, 'type', token) not in {"NL", "\n"}]
-        ast_root = build_ast(semantic_tokens)
+        ast_root = build_ast(derivation, tokens)
         ast_root.print_tree()
-        semantic_analyzer = SemanticAnalyzer(symbol_table)  
-        semantic_analyzer.analyze(ast_root)  
+        semantic_analyzer = SemanticAnalyzer(SymbolTable())
+        semantic_analyzer.analyze(ast_root)
         return jsonify({'success': True, 'message': 'Semantic analysis completed successfully'})
 
     except SemanticError as e:
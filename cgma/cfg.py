@@ -1,41 +1,113 @@
+import os
+import pickle
 from collections import defaultdict
+from hashlib import blake2b
+
+def close_over(nodes, depends, base):
+    """
+    Smallest sets with sets[n] ⊇ base[n] and sets[n] ⊇ sets[m] for every m in
+    depends[n]. Strongly connected components are found with an iterative
+    Tarjan search, which finishes a component only after everything it
+    depends on, so each component is unioned once and every edge read once.
+    """
+    sets = {}
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(depends[root]))]
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = low[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(depends[successor])))
+                    break
+                if successor in on_stack:
+                    low[node] = min(low[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    result = set()
+                    for member in component:
+                        result |= base[member]
+                        for successor in depends[member]:
+                            if successor in sets:
+                                result |= sets[successor]
+                    for member in component:
+                        sets[member] = set(result)
+    return sets
 
 def compute_first(cfg):
-    first = defaultdict(set)  # Stores First sets
-    epsilon = "ε"  # Represents epsilon (empty string)
-    
-    # Step 1: Initialize FIRST for terminals
+    epsilon = "ε"
+
+    # Step 1: Find the non-terminals that derive ε, revisiting a production
+    # only when one of its symbols became nullable
+    nullable = set()
+    users = defaultdict(list)
     for lhs, productions in cfg.items():
         for prod in productions:
-            if prod[0] not in cfg:  # If the first symbol is a terminal
-                first[lhs].add(prod[0])
-            if prod[0] == epsilon:  # If epsilon is a production
-                first[lhs].add(epsilon)
-    
-    # Step 2: Compute FIRST iteratively until no changes occur
-    changed = True
-    while changed:
-        changed = False
-        for lhs, productions in cfg.items():
-            for prod in productions:
-                before = len(first[lhs])  # Track changes
-                
-                for symbol in prod:
-                    if symbol in cfg:  # If non-terminal
-                        first[lhs] |= (first[symbol] - {epsilon})  # Add FIRST(symbol) excluding ε
-                        
-                        if epsilon not in first[symbol]:  
-                            break  # Stop if ε is not in FIRST(symbol)
-                    else:  # If terminal, add it and stop
-                        first[lhs].add(symbol)
+            for symbol in prod:
+                if symbol in cfg:
+                    users[symbol].append((lhs, prod))
+    pending = [(lhs, prod) for lhs, productions in cfg.items() for prod in productions]
+    while pending:
+        lhs, prod = pending.pop()
+        if lhs in nullable:
+            continue
+        for symbol in prod:
+            if symbol in cfg:
+                if symbol not in nullable:
+                    break  # Stop if ε is not in FIRST(symbol)
+            elif symbol == epsilon:
+                nullable.add(lhs)
+                break
+            else:
+                break
+        else:  # If all symbols had ε, add ε to FIRST(lhs)
+            nullable.add(lhs)
+        if lhs in nullable:
+            pending.extend(users[lhs])
+
+    # Step 2: FIRST(lhs) takes the terminals and the FIRST sets of the
+    # non-terminals up to the first symbol that cannot derive ε
+    terminals = defaultdict(set)
+    depends = defaultdict(set)
+    for lhs, productions in cfg.items():
+        for prod in productions:
+            for symbol in prod:
+                if symbol in cfg:  # If non-terminal
+                    depends[lhs].add(symbol)
+                    if symbol not in nullable:
                         break
-                    
-                else:  # If all symbols had ε, add ε to FIRST(lhs)
-                    first[lhs].add(epsilon)
+                else:  # If terminal, add it and stop
+                    terminals[lhs].add(symbol)
+                    break
 
-                if len(first[lhs]) > before:
-                    changed = True  # Continue loop if changes occurred
-    
+    sets = close_over(cfg, depends, terminals)
+    first = defaultdict(set)  # Stores First sets
+    for lhs in cfg:
+        first[lhs] = sets[lhs] - {epsilon}
+        if lhs in nullable or epsilon in terminals[lhs]:
+            first[lhs].add(epsilon)
     return first
 
 def compute_follow(cfg, first):
@@ -44,30 +116,31 @@ def compute_follow(cfg, first):
     start_symbol = next(iter(cfg))  # Get the start symbol
     follow[start_symbol].add("$")  # Rule 1: Add $ to start symbol's Follow set
 
-    changed = True
-    while changed:
-        changed = False
-        for lhs, productions in cfg.items():
-            for prod in productions:
-                for i, symbol in enumerate(prod):
-                    if symbol in cfg:  # Only compute Follow for non-terminals
-                        before = len(follow[symbol])
+    # FIRST is final here, so Rule 2 only adds fixed terminals and Rule 3
+    # says Follow(symbol) depends on Follow(lhs)
+    depends = defaultdict(set)
+    for lhs, productions in cfg.items():
+        for prod in productions:
+            for i, symbol in enumerate(prod):
+                if symbol in cfg:  # Only compute Follow for non-terminals
+                    follow[symbol]
 
-                        # Rule 2: Everything in First(B) except ε is added to Follow(A)
-                        if i + 1 < len(prod):  # Check next symbol
-                            next_symbol = prod[i + 1]
-                            if next_symbol in cfg:
-                                follow[symbol] |= (first[next_symbol] - {epsilon})
-                            else:
-                                follow[symbol].add(next_symbol)
-                        
-                        # Rule 3: If ε is in First(B) or A → αA (A is at the end)
-                        if i + 1 == len(prod) or (next_symbol in cfg and epsilon in first[next_symbol]):
-                            follow[symbol] |= follow[lhs]
+                    # Rule 2: Everything in First(B) except ε is added to Follow(A)
+                    if i + 1 < len(prod):  # Check next symbol
+                        next_symbol = prod[i + 1]
+                        if next_symbol in cfg:
+                            follow[symbol] |= (first[next_symbol] - {epsilon})
+                        else:
+                            follow[symbol].add(next_symbol)
 
-                        if len(follow[symbol]) > before:
-                            changed = True
+                    # Rule 3: If ε is in First(B) or A → αA (A is at the end)
+                    if i + 1 == len(prod) or (next_symbol in cfg and epsilon in first[next_symbol]):
+                        follow[lhs]
+                        depends[symbol].add(lhs)
 
+    sets = close_over(list(follow), depends, follow)
+    for symbol in list(follow):
+        follow[symbol] = sets[symbol]
     return follow
 
 
@@ -98,7 +171,60 @@ def compute_predict(cfg, first, follow):
                 predict[predict_key] |= follow[lhs]
     
     return predict
-    
+
+
+def compute_parsing_table(cfg, predict):
+    parsing_table = {}
+    for non_terminal, productions in cfg.items():
+        parsing_table[non_terminal] = {}
+        for production in productions:
+            predict_key = (non_terminal, tuple(production))
+            if predict_key in predict:
+                for terminal in predict[predict_key]:
+                    parsing_table[non_terminal][terminal] = production
+    return parsing_table
+
+
+# The finished sets and parse table are pickled next to this file, keyed by
+# a hash of the grammar and TABLES_VERSION, so they are only recomputed when
+# cfg or the way the tables are computed changes
+TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cfg_tables.pickle')
+# Bump when compute_first, compute_follow, compute_predict,
+# compute_parsing_table or the layout of the pickle change
+TABLES_VERSION = 1
+
+def grammar_hash(cfg):
+    return blake2b(repr((TABLES_VERSION, cfg)).encode('utf-8'), digest_size=16).hexdigest()
+
+def build_tables(cfg):
+    first = compute_first(cfg)
+    follow = compute_follow(cfg, first)
+    predict = compute_predict(cfg, first, follow)
+    return {
+        'hash': grammar_hash(cfg),
+        'first': first,
+        'follow': follow,
+        'predict': predict,
+        'parsing_table': compute_parsing_table(cfg, predict),
+    }
+
+def load_tables(cfg, path=TABLES_PATH):
+    try:
+        with open(path, 'rb') as file:
+            tables = pickle.load(file)
+        if tables.get('hash') == grammar_hash(cfg):
+            return tables
+    except (OSError, EOFError, AttributeError, pickle.UnpicklingError):
+        pass
+    tables = build_tables(cfg)
+    try:
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as file:
+            pickle.dump(tables, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+    except OSError:
+        pass
+    return tables
 
 cfg = {
     "<program>": [["<start>"]],
@@ -254,9 +380,11 @@ cfg = {
                 
 
 
-first_sets = compute_first(cfg)
-follow_sets = compute_follow(cfg, first_sets)
-predict_sets = compute_predict(cfg, first_sets, follow_sets)
+tables = load_tables(cfg)
+first_sets = tables['first']
+follow_sets = tables['follow']
+predict_sets = tables['predict']
+parsing_table = tables['parsing_table']
 
 '''print("Context-Free Grammar (CFG):\n")
 for non_terminal, productions in cfg.items():
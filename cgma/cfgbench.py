@@ -0,0 +1,155 @@
+"""
+Benchmark the FIRST/FOLLOW computation in cfg.py.
+
+    python cfgbench.py [--rules N ...] [--repeat N]
+
+Times cfg.compute_first/compute_follow against the fixed-point versions
+they replaced, kept below as fixpoint_first/fixpoint_follow, on the real
+grammar and on synthetic grammars, and checks that both give the same sets.
+"""
+import argparse
+import random
+import time
+from collections import defaultdict
+
+import cfg as grammar
+
+
+# The original fixed-point loops, rescanning every production until no set changes
+
+def fixpoint_first(cfg):
+    first = defaultdict(set)  # Stores First sets
+    epsilon = "ε"  # Represents epsilon (empty string)
+    
+    # Step 1: Initialize FIRST for terminals
+    for lhs, productions in cfg.items():
+        for prod in productions:
+            if prod[0] not in cfg:  # If the first symbol is a terminal
+                first[lhs].add(prod[0])
+            if prod[0] == epsilon:  # If epsilon is a production
+                first[lhs].add(epsilon)
+    
+    # Step 2: Compute FIRST iteratively until no changes occur
+    changed = True
+    while changed:
+        changed = False
+        for lhs, productions in cfg.items():
+            for prod in productions:
+                before = len(first[lhs])  # Track changes
+                
+                for symbol in prod:
+                    if symbol in cfg:  # If non-terminal
+                        first[lhs] |= (first[symbol] - {epsilon})  # Add FIRST(symbol) excluding ε
+                        
+                        if epsilon not in first[symbol]:  
+                            break  # Stop if ε is not in FIRST(symbol)
+                    else:  # If terminal, add it and stop
+                        first[lhs].add(symbol)
+                        break
+                    
+                else:  # If all symbols had ε, add ε to FIRST(lhs)
+                    first[lhs].add(epsilon)
+
+                if len(first[lhs]) > before:
+                    changed = True  # Continue loop if changes occurred
+    
+    return first
+
+def fixpoint_follow(cfg, first):
+    follow = defaultdict(set)
+    epsilon = "ε"
+    start_symbol = next(iter(cfg))  # Get the start symbol
+    follow[start_symbol].add("$")  # Rule 1: Add $ to start symbol's Follow set
+
+    changed = True
+    while changed:
+        changed = False
+        for lhs, productions in cfg.items():
+            for prod in productions:
+                for i, symbol in enumerate(prod):
+                    if symbol in cfg:  # Only compute Follow for non-terminals
+                        before = len(follow[symbol])
+
+                        # Rule 2: Everything in First(B) except ε is added to Follow(A)
+                        if i + 1 < len(prod):  # Check next symbol
+                            next_symbol = prod[i + 1]
+                            if next_symbol in cfg:
+                                follow[symbol] |= (first[next_symbol] - {epsilon})
+                            else:
+                                follow[symbol].add(next_symbol)
+                        
+                        # Rule 3: If ε is in First(B) or A → αA (A is at the end)
+                        if i + 1 == len(prod) or (next_symbol in cfg and epsilon in first[next_symbol]):
+                            follow[symbol] |= follow[lhs]
+
+                        if len(follow[symbol]) > before:
+                            changed = True
+
+    return follow
+
+
+def synthetic_grammar(rules, seed=0):
+    """
+    A random LL-style grammar with about rules productions. Non-terminals
+    mostly refer to ones defined later, with some ε productions and back
+    references, so FIRST and FOLLOW have to travel along long chains.
+    """
+    rng = random.Random(seed)
+    count = max(rules // 3, 2)
+    names = [f"<n{index}>" for index in range(count)]
+    terminals = [f"t{index}" for index in range(max(count // 4, 4))]
+    cfg = {}
+    for index, name in enumerate(names):
+        productions = []
+        for _ in range(3):
+            production = []
+            for _ in range(rng.randint(1, 4)):
+                if rng.random() < 0.5:
+                    ahead = rng.randint(index + 1, min(index + 8, count - 1)) if index + 1 < count else index
+                    back = rng.randint(0, index)
+                    production.append(names[ahead if rng.random() < 0.85 else back])
+                else:
+                    production.append(rng.choice(terminals))
+            productions.append(production)
+        if rng.random() < 0.3:
+            productions[-1] = ["ε"]
+        cfg[name] = productions
+    return cfg
+
+
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def compare(label, cfg, repeat):
+    first = grammar.compute_first(cfg)
+    follow = grammar.compute_follow(cfg, first)
+    old_first = fixpoint_first(cfg)
+    old_follow = fixpoint_follow(cfg, old_first)
+    assert dict(first) == dict(old_first), f"FIRST differs on {label}"
+    assert dict(follow) == dict(old_follow), f"FOLLOW differs on {label}"
+
+    old = best_time(lambda: fixpoint_follow(cfg, fixpoint_first(cfg)), repeat)
+    new = best_time(lambda: grammar.compute_follow(cfg, grammar.compute_first(cfg)), repeat)
+    rules = sum(len(productions) for productions in cfg.values())
+    print(f"{label:<18} {rules:>6} rules   fixed point {old * 1000:9.2f} ms   SCC {new * 1000:9.2f} ms   {old / new:5.1f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rules', type=int, nargs='*', default=[300, 3000, 10000], help='sizes of the synthetic grammars')
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs, the best one is reported')
+    args = parser.parse_args(argv)
+
+    compare('cfg.py', grammar.cfg, args.repeat)
+    for rules in args.rules:
+        compare(f'synthetic {rules}', synthetic_grammar(rules), max(1, args.repeat // (1 + rules // 3000)))
+
+
+if __name__ == '__main__':
+    main()
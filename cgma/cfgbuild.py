@@ -0,0 +1,231 @@
+"""
+Check the grammar in cfg.py and build a compressed LL(1) table from it.
+
+    python cfgbuild.py [--output PATH]
+
+Reports what cfg and compute_parsing_table let through without a word:
+non-terminals defined twice in the cfg literal (only the later definition
+is kept), LL(1) conflicts (terminals predicting more than one production
+of a non-terminal, where the later production is the one in the table),
+non-terminals the start symbol never reaches, non-terminals that derive no
+string of terminals, and <names> used but never defined, which are taken
+for terminals.
+
+Then compresses the dense table an LL1Parser builds: identical rows are
+stored once, and each row keeps a default production, its most common
+entry, with only the entries that differ from it listed. A terminal with
+no entry gets the default too, so an error is only caught when a terminal
+fails to match, as with the default reductions of yacc tables; the parser
+itself keeps the dense table for its "Expected one of" messages. Sizes and
+density are printed for both, and --output pickles the compressed table.
+
+The exit status is 1 when the grammar has any of the problems above.
+"""
+import argparse
+import ast
+import pickle
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+import cfg as grammar
+from cgmalexer import KIND_NAMES
+from cgmaparser import parser
+
+
+def duplicate_keys(path, name='cfg'):
+    # {key: [line, ...]} for keys given more than once in the dict literal
+    # assigned to name in the source file at path
+    with open(path, encoding='utf-8') as file:
+        tree = ast.parse(file.read(), path)
+    lines = {}
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Assign) and isinstance(node.value, ast.Dict)
+                and any(isinstance(target, ast.Name) and target.id == name for target in node.targets)):
+            for key in node.value.keys:
+                if isinstance(key, ast.Constant):
+                    lines.setdefault(key.value, []).append(key.lineno)
+    return {key: found for key, found in lines.items() if len(found) > 1}
+
+
+def conflicts(cfg, predict):
+    # [(non_terminal, productions, terminals)] for every set of productions
+    # of one non-terminal that share predicting terminals. The last
+    # production is the one compute_parsing_table keeps.
+    found = []
+    for non_terminal, productions in cfg.items():
+        predicting = {}
+        for production in productions:
+            for terminal in predict.get((non_terminal, tuple(production)), ()):
+                predicting.setdefault(terminal, []).append(tuple(production))
+        grouped = {}
+        for terminal, chosen in predicting.items():
+            if len(chosen) > 1:
+                grouped.setdefault(tuple(chosen), []).append(terminal)
+        for chosen, terminals in grouped.items():
+            found.append((non_terminal, chosen, sorted(terminals)))
+    return found
+
+
+def unreachable(cfg):
+    start = next(iter(cfg))
+    reached = {start}
+    pending = [start]
+    while pending:
+        for production in cfg[pending.pop()]:
+            for symbol in production:
+                if symbol in cfg and symbol not in reached:
+                    reached.add(symbol)
+                    pending.append(symbol)
+    return [non_terminal for non_terminal in cfg if non_terminal not in reached]
+
+
+def unproductive(cfg):
+    # Non-terminals no production of which ends up as terminals only
+    productive = set()
+    changed = True
+    while changed:
+        changed = False
+        for non_terminal, productions in cfg.items():
+            if non_terminal not in productive and any(
+                    all(symbol not in cfg or symbol in productive for symbol in production)
+                    for production in productions):
+                productive.add(non_terminal)
+                changed = True
+    return [non_terminal for non_terminal in cfg if non_terminal not in productive]
+
+
+def undefined(cfg):
+    used = {symbol for productions in cfg.values() for production in productions for symbol in production}
+    return sorted(symbol for symbol in used
+                  if symbol not in cfg and len(symbol) > 2 and symbol[0] == '<' and symbol[-1] == '>')
+
+
+def compress(parser):
+    """
+    Compress the dense table of parser, an LL1Parser. rows maps each kind
+    to a row of the compressed table, -1 for terminals. Row r has the
+    default production defaults[r] and lists the terminals with another
+    production in terminals[starts[r]:starts[r + 1]], sorted, with the
+    productions at the same places in entries. Production ids are those of
+    parser.productions.
+    """
+    width, table = parser.width, parser.table
+    rows = array('h', [-1]) * width
+    defaults, starts, terminals, entries = array('H'), array('I', [0]), array('H'), array('H')
+    indices = {}  # Offset in the dense table to compressed row
+    for kind in range(width):
+        offset = parser.rows[kind]
+        if offset < 0:
+            continue
+        if offset not in indices:
+            row = table[offset:offset + width]
+            counts = Counter(production for production in row if production)
+            default = min(counts, key=lambda production: (-counts[production], production)) if counts else 0
+            for terminal, production in enumerate(row):
+                if production and production != default:
+                    terminals.append(terminal)
+                    entries.append(production)
+            indices[offset] = len(defaults)
+            defaults.append(default)
+            starts.append(len(terminals))
+        rows[kind] = indices[offset]
+    return {
+        'hash': grammar.grammar_hash(parser.cfg),
+        'names': tuple(KIND_NAMES[:width]),
+        'productions': parser.productions,
+        'rows': rows,
+        'defaults': defaults,
+        'starts': starts,
+        'terminals': terminals,
+        'entries': entries,
+    }
+
+
+def lookup(compressed, non_terminal, terminal):
+    # Production id for non_terminal on terminal, both kinds
+    row = compressed['rows'][non_terminal]
+    starts, terminals = compressed['starts'], compressed['terminals']
+    low, high = starts[row], starts[row + 1]
+    index = bisect_left(terminals, terminal, low, high)
+    if index < high and terminals[index] == terminal:
+        return compressed['entries'][index]
+    return compressed['defaults'][row]
+
+
+def size(*arrays):
+    return sum(values.itemsize * len(values) for values in arrays)
+
+
+def statistics(parser, compressed):
+    non_terminals = [kind for kind in range(parser.width) if parser.rows[kind] >= 0]
+    cells = len(non_terminals) * parser.width
+    filled = sum(1 for kind in non_terminals
+                 for terminal in range(parser.width) if parser.table[parser.rows[kind] + terminal])
+    stored = len(compressed['defaults']) + len(compressed['entries'])
+    dense_bytes = size(parser.rows, parser.table)
+    compressed_bytes = size(compressed['rows'], compressed['defaults'], compressed['starts'],
+                            compressed['terminals'], compressed['entries'])
+    return [
+        f'{len(non_terminals)} non-terminals x {parser.width} kinds, {len(parser.productions) - 1} productions',
+        f'dense:      {cells:>6} cells, {filled} filled ({filled / cells:.1%} density), {dense_bytes} bytes',
+        f'compressed: {len(compressed["defaults"]):>6} distinct rows, {stored} entries '
+        f'({len(compressed["entries"])} besides the defaults), {compressed_bytes} bytes '
+        f'({compressed_bytes / dense_bytes:.1%} of dense)',
+    ]
+
+
+def check(parser, compressed):
+    # Every filled cell of the dense table has to come back out unchanged
+    for kind in range(parser.width):
+        offset = parser.rows[kind]
+        if offset < 0:
+            continue
+        for terminal in range(parser.width):
+            production = parser.table[offset + terminal]
+            if production:
+                assert lookup(compressed, kind, terminal) == production, (KIND_NAMES[kind], KIND_NAMES[terminal])
+
+
+def report(cfg, predict, path):
+    # Lines describing every problem found, empty when there are none
+    lines = []
+    for key, found in duplicate_keys(path).items():
+        lines.append(f'{key} is defined {len(found)} times, on lines {", ".join(map(str, found))}; '
+                     f'only the one on line {found[-1]} is used')
+    for non_terminal, chosen, terminals in conflicts(cfg, predict):
+        alternatives = ' | '.join(' '.join(production) for production in chosen)
+        lines.append(f'conflict in {non_terminal} on {" ".join(terminals)}: {alternatives}; '
+                     f'the table keeps {" ".join(chosen[-1])}')
+    for non_terminal in unreachable(cfg):
+        lines.append(f'{non_terminal} is unreachable from {next(iter(cfg))}')
+    for non_terminal in unproductive(cfg):
+        lines.append(f'{non_terminal} derives no string of terminals')
+    for symbol in undefined(cfg):
+        lines.append(f'{symbol} is used but not defined, so it is taken for a terminal')
+    return lines
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument('--output', metavar='PATH', help='pickle the compressed table to this file')
+    args = arguments.parse_args(argv)
+
+    problems = report(grammar.cfg, grammar.predict_sets, grammar.__file__)
+    for line in problems:
+        print(line)
+    print(f'{len(problems)} problems found')
+
+    compressed = compress(parser)
+    check(parser, compressed)
+    for line in statistics(parser, compressed):
+        print(line)
+    if args.output:
+        with open(args.output, 'wb') as file:
+            pickle.dump(compressed, file, pickle.HIGHEST_PROTOCOL)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
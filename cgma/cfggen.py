@@ -0,0 +1,205 @@
+"""
+Generate a recursive-descent parser module from the LL(1) tables.
+
+generate() reads the dense table an LL1Parser compiles from cfg and
+predict_sets and writes one function per non-terminal. Each function
+dispatches on the lookahead terminal with an if/elif over the terminals
+that select each production, then matches or calls the production's
+symbols in order, so nothing is looked up or pushed at parse time.
+
+A production that ends in its own non-terminal loops instead of calling
+itself, and one that ends in another non-terminal returns that
+non-terminal's function for the caller to run. The right-recursive
+statement and declaration lists in cfg therefore do not nest Python calls;
+only nested blocks and parentheses do. parse() accepts the same programs
+as LL1Parser.parse and fails with the same first error message.
+
+load() keeps the result next to the sources as cgmadescent.py, through
+generated.load, and only rewrites it when the tables change.
+"""
+import hashlib
+
+from cgmalexer import KIND_NAMES, TOKEN_KIND, TT_EOF
+import generated
+
+GENERATED_NAME = 'cgmadescent'
+# Hashed with the tables, so cgmadescent.py is rebuilt when the output of
+# generate() changes for the same tables
+GENERATOR_VERSION = 2
+
+
+def tables_hash(parser, skipped):
+    names = KIND_NAMES[:parser.width]
+    text = repr((GENERATOR_VERSION, names, parser.start, parser.productions, sorted(skipped)))
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16)
+    digest.update(parser.rows.tobytes())
+    digest.update(parser.table.tobytes())
+    return digest.hexdigest()
+
+
+def branches(parser, non_terminal):
+    # (production id, terminals selecting it) for the row of non_terminal,
+    # in production id order
+    row, width, table = parser.rows[non_terminal], parser.width, parser.table
+    selected = {}
+    for terminal in range(width):
+        production = table[row + terminal]
+        if production:
+            selected.setdefault(production, []).append(terminal)
+    return sorted(selected.items())
+
+
+def test(terminals):
+    if len(terminals) == 1:
+        return f'terminal == {terminals[0]}'
+    return f'terminal in {{{", ".join(map(str, terminals))}}}'
+
+
+def generate(parser, skipped):
+    """
+    Return the source of the recursive-descent module for parser, an
+    LL1Parser, that steps over tokens whose terminal is in skipped.
+    """
+    rows, productions = parser.rows, parser.productions
+    non_terminals = [kind for kind in range(parser.width) if rows[kind] >= 0]
+    eof = TOKEN_KIND[TT_EOF]
+
+    def symbols(production):
+        return productions[production][::-1]
+
+    # Non-terminals with a production ending in another non-terminal return
+    # its function, so whoever calls them has to keep running what they return
+    continues = {
+        kind for kind in non_terminals
+        if any(symbols(production) and rows[symbols(production)[-1]] >= 0 and symbols(production)[-1] != kind
+               for production, _ in branches(parser, kind))
+    }
+    loops = {
+        kind for kind in non_terminals
+        if any(symbols(production)[-1:] == (kind,) for production, _ in branches(parser, kind))
+    }
+
+    lines = [
+        f'# Generated by cfggen from the LL(1) tables in cgmaparser. Do not edit.',
+        f'# tables {tables_hash(parser, skipped)}',
+        'import threading',
+        '',
+        'from cgmalexer import Error',
+        '',
+        f'SKIPPED = frozenset({{{", ".join(map(str, sorted(skipped)))}}})',
+        '',
+        '# Terminals each non-terminal can start with, for "Expected one of"',
+    ]
+    for kind in non_terminals:
+        row = rows[kind]
+        expected = tuple(KIND_NAMES[terminal] for terminal in range(parser.width) if parser.table[row + terminal])
+        lines.append(f'EXPECTED_{kind} = {expected!r}  # {KIND_NAMES[kind]}')
+    lines += [
+        '',
+        '',
+        'class Failure(Exception):',
+        '    pass',
+        '',
+        '',
+        'def build():',
+        '    # The parsing functions, sharing the state of one parse at a time',
+        '    tokens = token = terminal = None',
+        '',
+        '    def advance():',
+        '        nonlocal token, terminal',
+        '        token = next(tokens, None)',
+        '        while True:',
+        '            if isinstance(token, Error):',
+        '                raise Failure(token.as_string())',
+        '            terminal = token.terminal',
+        '            if terminal not in SKIPPED:',
+        '                return',
+        '            token = next(tokens, None)',
+        '',
+        '    def expected_terminal(name):',
+        '        raise Failure(f"Ln {token.line} Syntax Error: Unexpected token \'{token.value}\'. Expected: \'{name}\'")',
+        '',
+        '    def expected_one_of(names):',
+        '        expected = {name for name in names}',
+        '        expected_tokens = list(expected - {\'$\', \'ε\'})',
+        '        raise Failure(f"Ln {token.line} Syntax Error: Unexpected token \'{token.value}\'. Expected one of: {expected_tokens}")',
+    ]
+
+    def call(kind, indent):
+        if kind in continues:
+            return [f'{indent}step = n{kind}()',
+                    f'{indent}while step is not None:',
+                    f'{indent}    step = step()']
+        return [f'{indent}n{kind}()']
+
+    for kind in non_terminals:
+        lines += ['', f'    def n{kind}():', f'        # {KIND_NAMES[kind]}']
+        indent = '            ' if kind in loops else '        '
+        if kind in loops:
+            lines.append('        while True:')
+        keyword = 'if'
+        for production, terminals in branches(parser, kind):
+            lines.append(f'{indent}{keyword} {test(terminals)}:')
+            keyword = 'elif'
+            body = indent + '    '
+            production_symbols = symbols(production)
+            for position, symbol in enumerate(production_symbols):
+                last = position == len(production_symbols) - 1
+                if rows[symbol] < 0:
+                    name = KIND_NAMES[symbol]
+                    lines += [f'{body}if terminal != {symbol} and token.value != {name!r}:',
+                              f'{body}    expected_terminal({name!r})',
+                              f'{body}advance()']
+                elif last and symbol == kind:
+                    lines.append(f'{body}continue')
+                elif last:
+                    lines.append(f'{body}return n{symbol}')
+                else:
+                    lines += call(symbol, body)
+            if not production_symbols or rows[production_symbols[-1]] < 0:
+                lines.append(f'{body}return')
+        lines += [f'{indent}else:', f'{indent}    expected_one_of(EXPECTED_{kind})']
+
+    lines += [
+        '',
+        '    def parse(source):',
+        '        nonlocal tokens, token, terminal',
+        '        tokens = iter(source)',
+        '        try:',
+        '            advance()',
+        *call(parser.start, '            '),
+        f'            if terminal != {eof} and token.value != {KIND_NAMES[eof]!r}:',
+        f'                expected_terminal({KIND_NAMES[eof]!r})',
+        '        except Failure as failure:',
+        '            return False, [failure.args[0]]',
+        '        finally:',
+        '            tokens = token = None',
+        f'        if terminal == {eof}:',
+        '            return True, []',
+        '        return False, ["Error: Tokens remaining after parsing"]',
+        '',
+        '    return parse',
+        '',
+        '',
+        '# Each thread builds the functions once and reuses them',
+        'local = threading.local()',
+        '',
+        '',
+        'def parse(tokens):',
+        '    """Parse tokens like LL1Parser.parse with max_errors=1."""',
+        '    run = getattr(local, \'parse\', None)',
+        '    if run is None:',
+        '        run = local.parse = build()',
+        '    return run(tokens)',
+        '',
+    ]
+    return '\n'.join(lines)
+
+
+def load(parser, skipped, directory=None):
+    """
+    Import the generated module for parser, regenerating it first when it
+    is missing or was built from different tables.
+    """
+    return generated.load(GENERATED_NAME, f'# tables {tables_hash(parser, skipped)}',
+                          lambda: generate(parser, skipped), directory)
@@ -0,0 +1,96 @@
+"""
+Lex many CGMA programs at once.
+
+    python cgmabatch.py [--jobs N] [--max-errors N] [--summary] FILE_OR_GLOB...
+
+Files are shared out across worker processes and each result is written
+to stdout as one JSON line, in the order the files were given:
+
+    {"file": ..., "tokens": ..., "errors": [...], "error_count": ..., "seconds": ...}
+
+A file that cannot be read or decoded gets {"file": ..., "failure": ...}.
+The exit status is 1 when any file had a lexical error or failed.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import cgmalexer
+
+
+def expand(patterns):
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in seen and not os.path.isdir(path):
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def lex_file(path, options):
+    started = time.perf_counter()
+    try:
+        tokens, errors = cgmalexer.run_file(path, **options)
+    except (OSError, UnicodeDecodeError) as failure:
+        return {'file': path, 'failure': str(failure)}
+    return {
+        'file': path,
+        'tokens': len(tokens),
+        'errors': [error.as_string() for error in errors],
+        'error_count': len(errors),
+        'seconds': round(time.perf_counter() - started, 6),
+    }
+
+
+def lex_files(paths, options):
+    return [lex_file(path, options) for path in paths]
+
+
+def batches(paths, size):
+    for start in range(0, len(paths), size):
+        yield paths[start:start + size]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Lex CGMA programs in parallel and print one JSON line per file.')
+    parser.add_argument('paths', nargs='+', metavar='FILE_OR_GLOB', help='files or glob patterns (** is recursive)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='worker processes (default: one per CPU)')
+    parser.add_argument('--batch', type=int, default=32, help='files handed to a worker at a time')
+    parser.add_argument('--max-errors', type=int, default=None, help='stop lexing a file after this many errors')
+    parser.add_argument('--summary', action='store_true', help='group repeated errors by kind and line range')
+    args = parser.parse_args(argv)
+
+    paths = expand(args.paths)
+    options = {'max_errors': args.max_errors, 'summary': args.summary}
+    started = time.perf_counter()
+    failed = 0
+
+    def report(result):
+        nonlocal failed
+        failed += bool(result.get('error_count') or 'failure' in result)
+        sys.stdout.write(json.dumps(result) + '\n')
+
+    if args.jobs <= 1:
+        for path in paths:
+            report(lex_file(path, options))
+    else:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            for results in executor.map(lex_files, batches(paths, max(args.batch, 1)), repeat(options)):
+                for result in results:
+                    report(result)
+                sys.stdout.flush()
+
+    print(f'{len(paths)} files, {failed} with errors, {time.perf_counter() - started:.2f}s', file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Generate a specialized scanner module from the token spec in cgmalexer.
+
+The spec is the rule tables at the top of cgmalexer (keyword and symbol
+rules, delimiter sets, character classes and literal patterns) together
+with cgmalexer.scan, which stays the one readable definition of how they
+are applied. generate() copies scan into a standalone module with every
+table it reads written out as a literal, token kinds folded to integers
+and globals bound to locals, and adds tokenize(), the same scanner with
+each yield rewritten to append straight into a TokenBuffer's columns.
+
+load() keeps the result next to the sources as cgmascan.py, through
+generated.load, and only rewrites it when the hash of the spec changes.
+"""
+import ast
+import hashlib
+import inspect
+import re
+import textwrap
+import types
+
+import generated
+
+GENERATED_NAME = 'cgmascan'
+# Bump when the code generated for an unchanged spec changes
+GENERATOR_VERSION = 1
+
+
+def literal(value):
+    # Source for value, with sets sorted so the text (and its hash) does not
+    # depend on string hashing
+    if isinstance(value, (frozenset, set)):
+        items = ', '.join(sorted(literal(item) for item in value))
+        return f'frozenset({{{items}}})' if items else 'frozenset()'
+    if isinstance(value, dict):
+        return '{' + ', '.join(f'{literal(key)}: {literal(item)}' for key, item in value.items()) + '}'
+    if isinstance(value, tuple):
+        return '(' + ''.join(literal(item) + ', ' for item in value).rstrip(' ') + ')'
+    if isinstance(value, list):
+        return '[' + ', '.join(literal(item) for item in value) + ']'
+    if isinstance(value, types.BuiltinMethodType) and isinstance(value.__self__, re.Pattern):
+        pattern = value.__self__
+        return f're.compile({pattern.pattern!r}, {pattern.flags & ~re.UNICODE}).{value.__name__}'
+    if isinstance(value, re.Pattern):
+        return f're.compile({value.pattern!r}, {value.flags & ~re.UNICODE})'
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return repr(value)
+    raise TypeError(f'cannot write {type(value).__name__} into a generated module')
+
+
+def is_constant(value):
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def collect(function, namespace):
+    # Globals read by function, in first-use order, and the source of the
+    # helper functions among them
+    names = {}
+    helpers = []
+    pending = [function]
+    while pending:
+        code = pending.pop().__code__
+        for name in code.co_names:
+            if name in names or name not in namespace:
+                continue
+            value = namespace[name]
+            names[name] = value
+            if isinstance(value, types.FunctionType):
+                helpers.append(textwrap.dedent(inspect.getsource(value)))
+                pending.append(value)
+    return names, helpers
+
+
+class Specializer(ast.NodeTransformer):
+    """
+    Fold reads of constant globals and of dict globals indexed by constants,
+    and load every other global once into a local.
+    """
+    def __init__(self, names):
+        self.names = names
+        self.aliases = {}
+        self.loaded = {}
+
+    def resolve(self, node):
+        if isinstance(node, ast.Name):
+            name = self.aliases.get(node.id, node.id)
+            if name in self.names:
+                return True, self.names[name]
+        if isinstance(node, ast.Constant):
+            return True, node.value
+        return False, None
+
+    def visit_FunctionDef(self, node):
+        # Local aliases of globals, as in "token_kind = TOKEN_KIND"
+        for statement in node.body:
+            if (isinstance(statement, ast.Assign) and len(statement.targets) == 1
+                    and isinstance(statement.targets[0], ast.Name) and isinstance(statement.value, ast.Name)
+                    and statement.value.id in self.names):
+                self.aliases[statement.targets[0].id] = statement.value.id
+        self.generic_visit(node)
+        body = node.body
+        docstring = body[:1] if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) else []
+        loads = [ast.parse(f'{local} = {name}').body[0] for name, local in self.loaded.items()]
+        node.body = docstring + loads + [
+            statement for statement in body[len(docstring):]
+            if not (isinstance(statement, ast.Assign) and isinstance(statement.value, ast.Name)
+                    and getattr(statement.targets[0], 'id', None) in self.aliases)
+        ]
+        return node
+
+    def visit_Subscript(self, node):
+        found, table = self.resolve(node.value) if isinstance(node.value, ast.Name) else (False, None)
+        known, key = self.resolve(node.slice)
+        if found and known and isinstance(table, dict) and is_constant(key) and key in table and is_constant(table[key]):
+            return ast.copy_location(ast.Constant(table[key]), node)
+        self.generic_visit(node)
+        return node
+
+    def visit_Name(self, node):
+        if not isinstance(node.ctx, ast.Load):
+            return node
+        name = self.aliases.get(node.id, node.id)
+        if name not in self.names:
+            return node
+        value = self.names[name]
+        if is_constant(value):
+            return ast.copy_location(ast.Constant(value), node)
+        local = self.loaded.setdefault(name, '_' + name.lower())
+        return ast.copy_location(ast.Name(local, ast.Load()), node)
+
+
+class Flattener(ast.NodeTransformer):
+    """
+    Turn the yields of scan into appends to TokenBuffer columns and to a
+    list of (start, end, details) errors.
+    """
+    def visit_Expr(self, node):
+        if not isinstance(node.value, ast.Yield):
+            return node
+        kind, start, end, value, _ = node.value.value.elts
+        if isinstance(kind, ast.Constant) and kind.value is None:
+            call = ast.Call(ast.Name('errors_append', ast.Load()), [ast.Tuple([start, end, value], ast.Load())], [])
+            return ast.copy_location(ast.Expr(call), node)
+        source = f'kinds_append({ast.unparse(kind)})\nstarts_append({ast.unparse(start)})\nends_append({ast.unparse(end)})'
+        if not (isinstance(value, ast.Constant) and value.value is None):
+            source = (f'_value = {ast.unparse(value)}\n'
+                      f'if _value != text[{ast.unparse(start)}:{ast.unparse(end)}]:\n'
+                      f'    values[len(kinds)] = _value\n') + source
+        return [ast.copy_location(statement, node) for statement in ast.parse(source).body]
+
+
+def spec_source(function, namespace):
+    names, helpers = collect(function, namespace)
+    constants = [f'{name} = {literal(value)}' for name, value in names.items()
+                 if not isinstance(value, types.FunctionType)]
+    return textwrap.dedent(inspect.getsource(function)), helpers, constants, names
+
+
+def spec_hash(function, namespace):
+    source, helpers, constants, _ = spec_source(function, namespace)
+    text = '\n'.join([f'version {GENERATOR_VERSION}', source] + helpers + constants)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def generate(function, namespace):
+    """
+    Return the source of the specialized module for function, a scanner
+    written like cgmalexer.scan, and the globals in namespace it reads.
+    """
+    source, helpers, constants, names = spec_source(function, namespace)
+
+    tree = ast.parse(source)
+    Specializer(names).visit(tree)
+    scanner = ast.unparse(ast.fix_missing_locations(tree))
+
+    tree = ast.parse(source)
+    definition = tree.body[0]
+    definition.name = 'tokenize'
+    definition.args.args[1:1] = [ast.arg(name) for name in ('kinds', 'starts', 'ends', 'values', 'errors')]
+    definition.body[:1] = ast.parse(
+        '"""Like scan, but appends into the columns of a TokenBuffer and to a list of (start, end, details) errors."""\n'
+        'kinds_append = kinds.append\n'
+        'starts_append = starts.append\n'
+        'ends_append = ends.append\n'
+        'errors_append = errors.append\n'
+    ).body
+    Flattener().visit(tree)
+    Specializer(names).visit(tree)
+    tokenizer = ast.unparse(ast.fix_missing_locations(tree))
+
+    return '\n'.join([
+        f'# Generated by cgmagen from the token spec in cgmalexer. Do not edit.',
+        f'# spec {spec_hash(function, namespace)}',
+        'import re',
+        '',
+        *constants,
+        '',
+        *helpers,
+        scanner,
+        '',
+        tokenizer,
+        '',
+    ])
+
+
+def load(function, namespace, directory=None):
+    """
+    Import the generated module for function, regenerating it first when it
+    is missing or was built from a different spec.
+    """
+    return generated.load(GENERATED_NAME, f'# spec {spec_hash(function, namespace)}',
+                          lambda: generate(function, namespace), directory)
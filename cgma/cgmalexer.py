@@ -1,6 +1,15 @@
 import sys
 import json
+import mmap
+import multiprocessing
+import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from array import array
+from bisect import bisect_left
 #CONSTANTS
 
 ALPHA_LOWER = 'abcdefghijklmnopqrstuvwxyz'
@@ -18,34 +27,42 @@ RELAT_OPER = '<>='
 OPER = ARITH_OPER + RELAT_OPER
 
 #DELIMITERS
-
-clbra_dlm = ' =\n)\t'
-clcur_dlm = ' \n)}\t' + ALPHANUM
-clpar_dlm = ' \n}{)&|}\t.,(' + ARITH_OPER + ALPHANUM
-com_dlm   = ' ('
-comma_dlm = ' "\t' + ALPHANUM
-convert_dlm = ' )\t,\n' + OPER
-comnt_dlm = ' \n\t' + ASCII
-endln_dlm = ' \n\t'
-esc_dlm =   ' "\t'+ ASCII
-equal_dlm = ' [(-"+\t!\'' + ALPHANUM
-hawk_dlm =  ' \n{\t'
-identif_dlm = ' \n)(&|;[],.\t' + OPER
-lit_dlm =   ' ,):\n;\t/+-%*]' + OPER
-lwk_dlm =   ' \n&|=)\t],:' + OPER
-minus_dlm = ' -()\t' + ALPHANUM
-npc_dlm =   ' :\t' + ALPHANUM
-not_dlm =   '=(\t' + ALPHA
-opbra_dlm = ' "]\t!\'' + ALPHANUM 
-opcur_dlm = ' \n\t}' + ALPHANUM
-operator_dlm = ' (\t!' + ALPHANUM
-arith_operator_dlm = ' (\t' + ALPHANUM
-oppar_dlm = ' )("-\t!' + ALPHANUM
-plus_dlm =  ' ("+)\t' + ALPHANUM
-relat_dlm = ' ("\t!' + ALPHANUM
-scolon_dlm = ' +-\t' + ALPHANUM
-spc_dlm =   ' \t'
-unary_dlm = ' )\t\n' + ALPHANUM
+# frozensets, so "may this character follow token kind K" is one O(1) lookup
+
+clbra_dlm = frozenset(' =\n)\t')
+clcur_dlm = frozenset(' \n)}\t' + ALPHANUM)
+clpar_dlm = frozenset(' \n}{)&|}\t.,(' + ARITH_OPER + ALPHANUM)
+com_dlm   = frozenset(' (')
+comma_dlm = frozenset(' "\t' + ALPHANUM)
+convert_dlm = frozenset(' )\t,\n' + OPER)
+comnt_dlm = frozenset(' \n\t' + ASCII)
+endln_dlm = frozenset(' \n\t')
+esc_dlm =   frozenset(' "\t'+ ASCII)
+equal_dlm = frozenset(' [(-"+\t!\'' + ALPHANUM)
+hawk_dlm =  frozenset(' \n{\t')
+identif_dlm = frozenset(' \n)(&|;[],.\t' + OPER)
+lit_dlm =   frozenset(' ,):\n;\t/+-%*]' + OPER)
+lwk_dlm =   frozenset(' \n&|=)\t],:' + OPER)
+minus_dlm = frozenset(' -()\t' + ALPHANUM)
+npc_dlm =   frozenset(' :\t' + ALPHANUM)
+not_dlm =   frozenset('=(\t' + ALPHA)
+opbra_dlm = frozenset(' "]\t!\'' + ALPHANUM)
+opcur_dlm = frozenset(' \n\t}' + ALPHANUM)
+operator_dlm = frozenset(' (\t!' + ALPHANUM)
+arith_operator_dlm = frozenset(' (\t' + ALPHANUM)
+oppar_dlm = frozenset(' )("-\t!' + ALPHANUM)
+plus_dlm =  frozenset(' ("+)\t' + ALPHANUM)
+relat_dlm = frozenset(' ("\t!' + ALPHANUM)
+scolon_dlm = frozenset(' +-\t' + ALPHANUM)
+spc_dlm =   frozenset(' \t')
+unary_dlm = frozenset(' )\t\n' + ALPHANUM)
+
+#CHARACTER CLASSES
+
+ALPHA_SET = frozenset(ALPHA)
+NUM_SET = frozenset(NUM)
+ALPHANUM_SET = frozenset(ALPHANUM)
+BLANK_SET = frozenset(' \t')
 
 #TOKENS
 
@@ -99,6 +116,18 @@ TT_IDENTIFIER   = 'IDENTIFIER' # Identifiers
 TT_ESCAPESEQUENCE = 'ESCAPESEQUENCE' # Escape Sequence
 TT_COMMENT      = 'COMMENT' # Comments
 
+TOKEN_TYPES = [
+    TT_CHUNGUS, TT_CHUDELUXE, TT_FORSEN, TT_FORSENCD, TT_LWK,
+    TT_PLUS, TT_MINUS, TT_MUL, TT_DIV, TT_MOD, TT_IS, TT_NEGAT,
+    TT_EQ, TT_NEQ, TT_INC, TT_DEC,
+    TT_NOT, TT_AND, TT_OR, TT_LT, TT_GT, TT_LTE, TT_GTE,
+    TT_OPPAR, TT_CLPAR, TT_OPBRA, TT_CLBRA, TT_OPCUR, TT_CLCUR,
+    TT_SEMICOL, TT_COL, TT_COMMA, TT_DOT, TT_DBLQT,
+    TT_SPC, TT_NL, TT_TAB, TT_EOF,
+    TT_KEYWORD, TT_IDENTIFIER, TT_ESCAPESEQUENCE, TT_COMMENT
+]
+TOKEN_KIND = {type_: kind for kind, type_ in enumerate(TOKEN_TYPES)}
+
 RESERVED_KEYWORDS = ['append', 'aura', 'back', 'caseoh', 'chat', 'chudeluxe', 'chungus', 'false', 'forsen', 'getout', 'gng', 'hawk', 'hawk tuah', 'insert', 'jit', 'lethimcook', 'lwk', 'nocap', 'npc', 'pause', 'plug', 'remove', 'skibidi', 'sturdy', 'true', 'tuah', 'yap']
 RESERVED_SYMBOLS = [
     # Unary Operators
@@ -117,6 +146,125 @@ RESERVED_SYMBOLS = [
     '“', '\\', '(', ')', '[', ']', '{', '}', ',', '//', '/*', '*/', ';'
 ]
 
+
+#KEYWORD AND SYMBOL RULES
+# word -> (token type, delimiters allowed after it, may end the file)
+
+KEYWORD_RULES = {
+    'append':     (TT_KEYWORD, com_dlm, False),
+    'aura':       (TT_KEYWORD, spc_dlm, True),
+    'back':       (TT_KEYWORD, endln_dlm, True),
+    'caseoh':     (TT_KEYWORD, spc_dlm, True),
+    'chat':       (TT_KEYWORD, com_dlm, False),
+    'chudeluxe':  (TT_KEYWORD, convert_dlm, True),
+    'chungus':    (TT_KEYWORD, convert_dlm, True),
+    'false':      (TT_LWK, lwk_dlm, True),
+    'forsen':     (TT_KEYWORD, spc_dlm, True),
+    'forsencd':   (TT_KEYWORD, spc_dlm, True),
+    'getout':     (TT_KEYWORD, endln_dlm, True),
+    'gng':        (TT_KEYWORD, spc_dlm, True),
+    'hawk':       (TT_KEYWORD, hawk_dlm, False),
+    'hawktuah':   (TT_KEYWORD, com_dlm, False),
+    'insert':     (TT_KEYWORD, com_dlm, False),
+    'jit':        (TT_KEYWORD, com_dlm, True),
+    'lethimcook': (TT_KEYWORD, com_dlm, False),
+    'lil':        (TT_KEYWORD, hawk_dlm, True),
+    'lwk':        (TT_KEYWORD, spc_dlm, True),
+    'nocap':      (TT_KEYWORD, spc_dlm, True),
+    'npc':        (TT_KEYWORD, npc_dlm, True),
+    'pause':      (TT_KEYWORD, endln_dlm, True),
+    'plug':       (TT_KEYWORD, com_dlm, False),
+    'remove':     (TT_KEYWORD, com_dlm, False),
+    'skibidi':    (TT_KEYWORD, com_dlm, False),
+    'sturdy':     (TT_KEYWORD, spc_dlm, True),
+    'taper':      (TT_KEYWORD, com_dlm, True),
+    'true':       (TT_LWK, lwk_dlm, True),
+    'ts':         (TT_KEYWORD, com_dlm, True),
+    'tuah':       (TT_KEYWORD, com_dlm, True),
+    'yap':        (TT_KEYWORD, com_dlm, False),
+}
+
+# '&', '|' and '\' are only valid as the first half of a longer symbol
+SYMBOL_RULES = {
+    '+':   (TT_PLUS, plus_dlm, False),
+    '++':  (TT_INC, unary_dlm, True),
+    '-':   (TT_MINUS, minus_dlm, False),
+    '--':  (TT_DEC, unary_dlm, True),
+    '*':   (TT_MUL, arith_operator_dlm, True),
+    '/':   (TT_DIV, arith_operator_dlm, False),
+    '%':   (TT_MOD, arith_operator_dlm, False),
+    '=':   (TT_IS, equal_dlm, False),
+    '==':  (TT_EQ, relat_dlm, False),
+    '!':   (TT_NOT, not_dlm, False),
+    '!=':  (TT_NEQ, relat_dlm, False),
+    '<':   (TT_LT, arith_operator_dlm, False),
+    '<=':  (TT_LTE, arith_operator_dlm, False),
+    '>':   (TT_GT, arith_operator_dlm, False),
+    '>=':  (TT_GTE, arith_operator_dlm, False),
+    '&&':  (TT_AND, operator_dlm, False),
+    '||':  (TT_OR, operator_dlm, False),
+    '(':   (TT_OPPAR, oppar_dlm, False),
+    ')':   (TT_CLPAR, clpar_dlm, True),
+    '[':   (TT_OPBRA, opbra_dlm, False),
+    ']':   (TT_CLBRA, clbra_dlm, True),
+    '{':   (TT_OPCUR, opcur_dlm, False),
+    '}':   (TT_CLCUR, clcur_dlm, True),
+    ',':   (TT_COMMA, comma_dlm, False),
+    ';':   (TT_SEMICOL, scolon_dlm, False),
+    ':':   (TT_COL, endln_dlm, True),
+    '\\"': (TT_ESCAPESEQUENCE, esc_dlm, True),
+    '\\/': (TT_ESCAPESEQUENCE, esc_dlm, True),
+    '\\{': (TT_ESCAPESEQUENCE, esc_dlm, True),
+    '\\}': (TT_ESCAPESEQUENCE, esc_dlm, True),
+    '\\n': (TT_ESCAPESEQUENCE, esc_dlm, True),
+    '\\t': (TT_ESCAPESEQUENCE, esc_dlm, True),
+}
+
+ESCAPE_CHARACTERS = {
+    'n': '\n',
+    't': '\t',
+    '{': '\\{',
+    '}': '\\}'
+}
+
+MAX_IDENTIFIER_LENGTH = 20
+
+#TOKEN KINDS
+
+# One integer space for token types, keywords, symbols and the rest of the
+# grammar's symbols, which the parser interns when it builds its table.
+# Token types keep their TOKEN_KIND ids. Keywords and symbols are lexed
+# straight to their own kind; KIND_TYPE gives the token type of a kind and
+# KIND_TERMINAL the grammar terminal it matches.
+KIND_NAMES = list(TOKEN_TYPES)
+KIND_TYPE = list(TOKEN_TYPES)
+KIND_TERMINAL = list(range(len(TOKEN_TYPES)))
+
+def intern_kind(name):
+    kind = TOKEN_KIND.get(name)
+    if kind is None:
+        kind = TOKEN_KIND[name] = len(KIND_NAMES)
+        KIND_NAMES.append(name)
+        KIND_TYPE.append(name)
+        KIND_TERMINAL.append(kind)
+    return kind
+
+for word, (type_, _, _) in {**KEYWORD_RULES, **SYMBOL_RULES}.items():
+    kind = intern_kind(word)
+    KIND_TYPE[kind] = type_
+    if type_ == TT_LWK:
+        KIND_TERMINAL[kind] = TOKEN_KIND[TT_LWK]
+KIND_TERMINAL[TOKEN_KIND[TT_NEGAT]] = TOKEN_KIND['-']
+KIND_TERMINAL[TOKEN_KIND[TT_DOT]] = intern_kind('.')
+
+def terminal_kind(type_, value):
+    # Grammar terminal of a token that was not produced by scan(). The value
+    # only picks the kind when it is a keyword or symbol of that token type,
+    # so Token('NL', '\n') is still a newline.
+    rule = (KEYWORD_RULES.get(value) or SYMBOL_RULES.get(value)) if isinstance(value, str) else None
+    kind = TOKEN_KIND[value] if rule is not None and rule[0] == type_ else intern_kind(type_)
+    return KIND_TERMINAL[kind]
+
 #POSITION TRACK
 
 class Position:
@@ -139,6 +287,23 @@ class Position:
     
     def copy(self):
         return Position(self.idx, self.ln, self.col, self.fn, self.ftxt)
+
+
+class LineIndex:
+    # Offsets of every newline in a source, built once so that lines and
+    # columns are only worked out when an error or the UI asks for them
+    def __init__(self, text, newlines=None):
+        if newlines is None:
+            newlines = [match.start() for match in re.finditer('\n', text)]
+        self.newlines = newlines
+
+    def line(self, offset):
+        return bisect_left(self.newlines, offset) + 1
+
+    def locate(self, offset):
+        ln = bisect_left(self.newlines, offset)
+        col = offset - self.newlines[ln - 1] - 1 if ln else offset
+        return ln, col
         
 
 
@@ -164,1464 +329,907 @@ class IllegalCharError(Error):
         self.details = self.details.replace('\n', '\\n')
         return f"Ln {self.pos_start.ln + 1} Lexical Error: {self.details}"
 
+class ErrorSummary(IllegalCharError):
+    # Stands in for count errors of the same kind between two lines
+    def __init__(self, pos_start, pos_end, details, count):
+        super().__init__(pos_start, pos_end, details)
+        self.count = count
+    def as_string(self):
+        self.details = self.details.replace('\n', '\\n')
+        return f"Ln {self.pos_start.ln + 1}-{self.pos_end.ln + 1} Lexical Error: {self.details} (x{self.count})"
+
+# Quoted source text is dropped so that errors differing only in the
+# offending characters share a kind
+ERROR_KIND = re.compile(r"'.*'", re.S)
+
+def error_kind(details):
+    return ERROR_KIND.sub("'...'", details)
+
 #TOKEN
 
 class Token:
-    def __init__(self, type_, value=None, line=1):
+    def __init__(self, type_, value=None, line=1, start=None, end=None, lines=None, terminal=None):
         self.type = type_
         self.value = value
-        self.line = line
+        self.terminal = terminal_kind(type_, value) if terminal is None else terminal
+        self._line = line
+        self.start = start
+        self.end = end
+        self.lines = lines
+
+    @property
+    def line(self):
+        if self._line is None:
+            self._line = self.lines.line(self.start)
+        return self._line
+
+    @line.setter
+    def line(self, line):
+        self._line = line
 
     def __repr__(self):
         if self.value: return f'{self.type}:{self.value} (Ln {self.line})'  
         return f'{self.type}'
-    
+
+
+class TokenView:
+    # Token-compatible view of one entry of a TokenBuffer
+    __slots__ = ('buffer', 'index')
+
+    def __init__(self, buffer, index):
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def type(self):
+        return KIND_TYPE[self.buffer.kinds[self.index]]
+
+    @property
+    def terminal(self):
+        return KIND_TERMINAL[self.buffer.kinds[self.index]]
+
+    @property
+    def value(self):
+        return self.buffer.value(self.index)
+
+    @property
+    def line(self):
+        return self.buffer.line(self.index)
+
+    @property
+    def start(self):
+        return self.buffer.starts[self.index]
+
+    @property
+    def end(self):
+        return self.buffer.ends[self.index]
+
+    def __repr__(self):
+        if self.value: return f'{self.type}:{self.value} (Ln {self.line})'
+        return f'{self.type}'
+
+
+class TokenBuffer:
+    """
+    Columnar lexer output: token kinds and source offsets are kept in
+    arrays, values are sliced from the source on demand and only stored
+    when they differ from the source text (normalized numbers, escapes).
+    """
+    FIXED_VALUES = {TOKEN_KIND[TT_NL]: "\\n", TOKEN_KIND[TT_EOF]: "EOF"}
+
+    def __init__(self, text, line_index=None):
+        self.text = text
+        self.line_index = line_index or LineIndex(text)
+        self.kinds = array('H')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.values = {}
+
+    def append(self, kind, start, end, value=None):
+        if value is not None and value != self.text[start:end]:
+            self.values[len(self.kinds)] = value
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def value(self, index):
+        value = self.values.get(index)
+        if value is None:
+            value = self.FIXED_VALUES.get(self.kinds[index])
+            if value is None:
+                value = self.text[self.starts[index]:self.ends[index]]
+        return value
+
+    def line(self, index):
+        # Looked up per token, so a buffer relex() makes for every edit
+        # does not have to index all its lines to report one error.
+        # NL tokens report the line their run of blank lines ends on.
+        if self.kinds[index] == TOKEN_KIND[TT_NL]:
+            return self.line_index.line(self.ends[index])
+        return self.line_index.line(self.starts[index])
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TokenView(self, i) for i in range(*index.indices(len(self.kinds)))]
+        if index < 0:
+            index += len(self.kinds)
+        if not 0 <= index < len(self.kinds):
+            raise IndexError('token index out of range')
+        return TokenView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield TokenView(self, index)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+#TRANSITION TABLES
+
+def build_dfa(rules):
+    """
+    Build a trie-shaped DFA over the words of a rule table.
+
+    transitions[state] maps a character to the next state and accepting[state]
+    holds the rule of the word that ends there.
+    """
+    transitions = [{}]
+    accepting = [None]
+    for word, rule in rules.items():
+        state = 0
+        for char in word:
+            if char not in transitions[state]:
+                transitions[state][char] = len(transitions)
+                transitions.append({})
+                accepting.append(None)
+            state = transitions[state][char]
+        accepting[state] = rule
+    return transitions, accepting
+
+WORD_RUN = re.compile('[' + ALPHANUM + ']*').match
+# Long runs are matched in one step rather than a character at a time
+BLANK_RUN = re.compile('[ \t]*').match
+NEWLINE_RUN = re.compile('[ \t\n]*').match
+NUMBER_RUN = re.compile('[' + NUM + r']*(\.[' + NUM + ']*)?').match
+NUMBER_BAD_DELIMITER_RUN = re.compile('[^' + re.escape(NUM + ''.join(sorted(lit_dlm))) + ']*').match
+STRING_RUN = re.compile(r'[^"\n\\]*(?:\\.[^"\n\\]*)*', re.S).match
+STRING_ESCAPE = re.compile(r'\\(.)', re.S)
+CHAR_LIT_RUN = re.compile("[^'\n\\\\]*").match
+
+def unescape(match):
+    return ESCAPE_CHARACTERS.get(match[1], match[1])
+SYMBOL_TRANSITIONS, SYMBOL_ACCEPTING = build_dfa(SYMBOL_RULES)
+SYMBOL_START = frozenset(SYMBOL_TRANSITIONS[0])
 
 #LEXER
 
 class Lexer:
-    def __init__(self, fn, text):
+    def __init__(self, fn, text, max_errors=None, fail_fast=False, summary=False):
         self.fn = fn
         self.text = text
-        self.pos = Position(-1, 0, -1, fn, text)
-        self.current_char = None
-        self.advance()
+        self.lines = LineIndex(text)
+        # Lexing stops after max_errors errors (after the first one with
+        # fail_fast). With summary, runs of errors of one kind on adjacent
+        # lines are reported as a single ErrorSummary.
+        self.max_errors = 1 if fail_fast else max_errors
+        self.fail_fast = fail_fast
+        self.summary = summary
 
-    def advance(self):
-        self.pos.advance(self.current_char)
-        self.current_char = self.text[self.pos.idx] if self.pos.idx<len(self.text) else None
+    def position(self, idx):
+        ln, col = self.lines.locate(idx)
+        return Position(idx, ln, col, self.fn, self.text)
+
+    def error(self, start, end, details):
+        return IllegalCharError(self.position(start), self.position(end), details)
 
     def make_tokens(self):
-        tokens = []
-        line = 1
+        tokens = TokenBuffer(self.text, self.lines)
+        emit = tokens.append
         errors = []
-        while self.current_char != None:
-            if self.current_char in ALPHA:
-                ident_str = ''
-                ident_count = 0
-                pos_start = self.pos.copy()
-                #Letter A
-                if self.current_char == "a":
-                    ident_str += self.current_char
-                    ident_count+=1
-                    self.advance()
-                    if self.current_char == "p":
-                        ident_str += self.current_char
-                        ident_count+=1
-                        self.advance()
-                        if self.current_char == "p":
-                            ident_str += self.current_char
-                            ident_count+=1
-                            self.advance()
-                            if self.current_char == "e":
-                                ident_str += self.current_char
-                                ident_count+=1
-                                self.advance()
-                                if  self.current_char == "n":
-                                    ident_str += self.current_char
-                                    ident_count+=1
-                                    self.advance()
-                                    if self.current_char == "d":
-                                        ident_str += self.current_char
-                                        ident_count+=1
-                                        self.advance()
-                                        if self.current_char is not None and self.current_char in com_dlm:
-                                            tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                            continue
-                                        elif self.current_char is not None and self.current_char not in com_dlm and self.current_char not in ALPHANUM:
-                                            errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                            self.advance()
-                                            continue
-                                            
-                    elif self.current_char == "u":
-                        ident_str += self.current_char
-                        ident_count+=1
-                        self.advance()
-                        if self.current_char == "r":
-                            ident_str += self.current_char
-                            ident_count+=1
-                            self.advance()
-                            if self.current_char == "a":
-                                ident_str += self.current_char
-                                ident_count+=1
-                                self.advance()
-                                if self.current_char is None or self.current_char in spc_dlm:
-                                    tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                    continue
-                                elif self.current_char is not None and self.current_char not in spc_dlm and self.current_char not in ALPHANUM:
-                                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                    self.advance()
-                                    continue
-                #Letter B
-                if self.current_char == "b":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "a":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "c":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "k":
-                                ident_str += self.current_char
-                                ident_count+=1
-                                self.advance()
-                                if self.current_char is None or self.current_char in endln_dlm:
-                                    tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                    continue
-                                elif self.current_char is not None and self.current_char not in endln_dlm and self.current_char not in ALPHANUM:
-                                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                    self.advance()
-                                    continue
-
-                #Letter C
-                if self.current_char == "c":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "a":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "s":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "e":
-                                ident_str += self.current_char
-                                ident_count += 1
-                                self.advance()
-                                if self.current_char == "o":
-                                    ident_str += self.current_char
-                                    ident_count += 1
-                                    self.advance()
-                                    if self.current_char == "h":
-                                        ident_str += self.current_char
-                                        ident_count+=1
-                                        self.advance()
-                                        if self.current_char is None or self.current_char in spc_dlm:
-                                            tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                            continue
-                                        elif self.current_char is not None and self.current_char not in spc_dlm and self.current_char not in ALPHANUM:
-                                            errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                            self.advance()
-                                            continue
-                    elif self.current_char == "h":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "a":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "t":
-                                ident_str += self.current_char
-                                ident_count+=1
-                                self.advance()
-                                if self.current_char is not None and self.current_char in com_dlm:
-                                    tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                    continue
-                                elif self.current_char is not None and self.current_char not in com_dlm and self.current_char not in ALPHANUM:
-                                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                    self.advance()
-                                    continue
-                        if self.current_char == "u":
-                            ident_str += self.current_char
-                            ident_count+=1
-                            self.advance()
-                            if self.current_char == "n":
-                                ident_str += self.current_char
-                                ident_count+=1
-                                self.advance()
-                                if self.current_char == "g":
-                                    ident_str += self.current_char
-                                    ident_count+=1
-                                    self.advance() 
-                                    if self.current_char == "u":
-                                        ident_str += self.current_char
-                                        ident_count+=1
-                                        self.advance()      
-                                        if self.current_char == "s":
-                                            ident_str += self.current_char
-                                            ident_count+=1
-                                            self.advance()
-                                            if self.current_char is None or self.current_char in convert_dlm:
-                                                tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                                continue
-                                            elif self.current_char is not None and self.current_char not in convert_dlm and self.current_char not in ALPHANUM:
-                                                errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                                self.advance()
-                                                continue
-                            elif self.current_char == "d":
-                                ident_str += self.current_char
-                                ident_count+=1
-                                self.advance()
-                                if self.current_char == "e":
-                                    ident_str += self.current_char
-                                    ident_count+=1
-                                    self.advance()
-                                    if self.current_char == "l":
-                                        ident_str += self.current_char
-                                        ident_count+=1
-                                        self.advance()
-                                        if self.current_char == "u":
-                                            ident_str += self.current_char
-                                            ident_count+=1
-                                            self.advance()
-                                            if self.current_char == "x":
-                                                ident_str += self.current_char
-                                                ident_count+=1
-                                                self.advance()
-                                                if self.current_char == "e":
-                                                    ident_str += self.current_char
-                                                    ident_count+=1
-                                                    self.advance()
-                                                    if self.current_char is None or self.current_char in convert_dlm:
-                                                        tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                                        continue
-                                                    elif self.current_char is not None and self.current_char not in convert_dlm and self.current_char not in ALPHANUM:
-                                                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                                        self.advance()
-                                                        continue
-
-                # Letter F
-                if self.current_char == "f":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "a":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "l":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "s":
-                                ident_str += self.current_char
-                                ident_count += 1
-                                self.advance()
-                                if self.current_char == "e":
-                                    ident_str += self.current_char
-                                    ident_count+=1
-                                    self.advance()
-                                    if self.current_char is None or self.current_char in lwk_dlm:
-                                        tokens.append(Token(TT_LWK, ident_str, line))
-                                        continue
-                                    elif self.current_char is not None and self.current_char not in lwk_dlm and self.current_char not in ALPHANUM:
-                                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                        self.advance()
-                                        continue
-                    if self.current_char == "o":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "r":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "s":
-                                ident_str += self.current_char
-                                ident_count += 1
-                                self.advance()
-                                if self.current_char == "e":
-                                    ident_str += self.current_char
-                                    ident_count += 1
-                                    self.advance()
-                                    if self.current_char == "n":
-                                        ident_str += self.current_char
-                                        ident_count+=1
-                                        self.advance()
-                                        if self.current_char == "c":
-                                            ident_str += self.current_char
-                                            ident_count += 1
-                                            self.advance()
-                                            if self.current_char == "d":
-                                                ident_str += self.current_char
-                                                ident_count += 1
-                                                self.advance()
-                                                if self.current_char is None or self.current_char in spc_dlm:
-                                                    tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                                    continue
-                                                elif self.current_char is not None and self.current_char not in spc_dlm and self.current_char not in ALPHANUM:
-                                                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                                    self.advance()
-                                                    continue
-                                        if self.current_char is None or self.current_char in spc_dlm:
-                                            tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                            continue
-                                        elif self.current_char is not None and self.current_char not in spc_dlm and self.current_char not in ALPHANUM:
-                                            errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                            self.advance()
-                                            continue
-                                            
-
-                # Letter G
-                if self.current_char == "g":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "e":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "t":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "o":
-                                ident_str += self.current_char
-                                ident_count += 1
-                                self.advance()
-                                if self.current_char == "u":
-                                    ident_str += self.current_char
-                                    ident_count += 1
-                                    self.advance()
-                                    if self.current_char == "t":
-                                        ident_str += self.current_char
-                                        ident_count+=1
-                                        self.advance()
-                                        if self.current_char is None or self.current_char in endln_dlm:
-                                            tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                            continue
-                                        elif self.current_char is not None and self.current_char not in endln_dlm and self.current_char not in ALPHANUM:
-                                            errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                            self.advance()
-                                            continue
-                    if self.current_char == "n":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance
-                        if self.current_char == "g":
-                            ident_str += self.current_char
-                            ident_count+=1
-                            self.advance()
-                            if self.current_char is None or self.current_char in spc_dlm:
-                                tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                continue
-                            elif self.current_char is not None and self.current_char not in spc_dlm and self.current_char not in ALPHANUM:
-                                errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                self.advance()
-                                continue
-
-                # Letter H
-                if self.current_char == "h":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "a":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "w":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "k":
-                                ident_str += self.current_char
-                                ident_count+=1
-                                self.advance()
-                                if self.current_char == "t":
-                                    ident_str += self.current_char
-                                    ident_count += 1
-                                    self.advance()
-                                    if self.current_char == "u":
-                                        ident_str += self.current_char
-                                        ident_count += 1
-                                        self.advance()
-                                        if self.current_char == "a":
-                                            ident_str += self.current_char
-                                            ident_count += 1
-                                            self.advance()
-                                            if self.current_char == "h":
-                                                ident_str += self.current_char
-                                                ident_count+=1
-                                                self.advance()
-                                                if self.current_char is not None and self.current_char in com_dlm:
-                                                    tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                                    continue
-                                                elif self.current_char is not None and self.current_char not in com_dlm and self.current_char not in ALPHANUM:
-                                                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                                    continue
-                                elif self.current_char is not None and self.current_char in hawk_dlm:
-                                    tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                    continue
-                                elif self.current_char is not None and self.current_char not in hawk_dlm and self.current_char not in ALPHANUM:
-                                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                    self.advance()
-                                    continue
-
-                                
-                # Letter I
-                if self.current_char == "i":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "n":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "s":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "e":
-                                ident_str += self.current_char
-                                ident_count += 1
-                                self.advance()
-                                if self.current_char == "r":
-                                    ident_str += self.current_char
-                                    ident_count += 1
-                                    self.advance()
-                                    if self.current_char == "t":
-                                        ident_str += self.current_char
-                                        ident_count+=1
-                                        self.advance()
-                                        if self.current_char is not None and self.current_char in com_dlm:
-                                            tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                            continue
-                                        elif self.current_char is not None and self.current_char not in com_dlm and self.current_char not in ALPHANUM:
-                                            errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                            self.advance()
-                                            continue
-
-                # Letter J
-                if self.current_char == "j":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "i":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "t":
-                            ident_str += self.current_char
-                            ident_count+=1
-                            self.advance()
-                            if self.current_char is None or self.current_char in com_dlm:
-                                tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                continue
-                            elif self.current_char is not None and self.current_char not in com_dlm and self.current_char not in ALPHANUM:
-                                errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                self.advance()
-                                continue
-
-                # Letter L
-                if self.current_char == "l":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "e":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "t":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "h":
-                                ident_str += self.current_char
-                                ident_count += 1
-                                self.advance()
-                                if self.current_char == "i":
-                                    ident_str += self.current_char
-                                    ident_count += 1
-                                    self.advance()
-                                    if self.current_char == "m":
-                                        ident_str += self.current_char
-                                        ident_count += 1
-                                        self.advance()
-                                        if self.current_char == "c":
-                                            ident_str += self.current_char
-                                            ident_count += 1
-                                            self.advance()
-                                            if self.current_char == "o":
-                                                ident_str += self.current_char
-                                                ident_count += 1
-                                                self.advance()
-                                                if self.current_char == "o":
-                                                    ident_str += self.current_char
-                                                    ident_count += 1
-                                                    self.advance()
-                                                    if self.current_char == "k":
-                                                        ident_str += self.current_char
-                                                        ident_count+=1
-                                                        self.advance()
-                                                        if self.current_char is not None and self.current_char in com_dlm:
-                                                            tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                                            continue
-                                                        elif self.current_char is not None and self.current_char not in com_dlm and self.current_char not in ALPHANUM:
-                                                            errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                                            self.advance()
-                                                            continue
-
-                    if self.current_char == "i":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "l":
-                            ident_str += self.current_char
-                            ident_count+=1
-                            self.advance()
-                            if self.current_char is None or self.current_char in hawk_dlm:
-                                tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                continue
-                            elif self.current_char is not None and self.current_char not in hawk_dlm and self.current_char not in ALPHANUM:
-                                errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                self.advance()
-                                continue
-                        
-                    if self.current_char == "w":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "k":
-                            ident_str += self.current_char
-                            ident_count+=1
-                            self.advance()
-                            if self.current_char is None or self.current_char in spc_dlm:
-                                tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                continue
-                            elif self.current_char is not None and self.current_char not in spc_dlm and self.current_char not in ALPHANUM:
-                                errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                self.advance()
-                                continue
-
-                # Letter N
-                if self.current_char == "n":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "o":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "c":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "a":
-                                ident_str += self.current_char
-                                ident_count += 1
-                                self.advance()
-                                if self.current_char == "p":
-                                    ident_str += self.current_char
-                                    ident_count+=1
-                                    self.advance()
-                                    if self.current_char is None or self.current_char in spc_dlm:
-                                        tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                        continue
-                                    elif self.current_char is not None and self.current_char not in spc_dlm and self.current_char not in ALPHANUM:
-                                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                        self.advance()
-                                        continue
-
-                    if self.current_char == "p":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "c":
-                            ident_str += self.current_char
-                            ident_count+=1
-                            self.advance()
-                            if self.current_char is None or self.current_char in npc_dlm:
-                                tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                continue
-                            elif self.current_char is not None and self.current_char not in npc_dlm and self.current_char not in ALPHANUM:
-                                errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                self.advance()
-                                continue
-                        
-                # Letter P
-                if self.current_char == "p":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "a":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "u":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "s":
-                                ident_str += self.current_char
-                                ident_count += 1
-                                self.advance()
-                                if self.current_char == "e":
-                                    ident_str += self.current_char
-                                    ident_count+=1
-                                    self.advance()
-                                    if self.current_char is None or self.current_char in endln_dlm:
-                                        tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                        continue
-                                    elif self.current_char is not None and self.current_char not in endln_dlm and self.current_char not in ALPHANUM:
-                                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                        self.advance()
-                                        continue
-
-                    if self.current_char == "l":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "u":
-                                ident_str += self.current_char
-                                ident_count += 1
-                                self.advance()
-                                if self.current_char == "g":
-                                    ident_str += self.current_char
-                                    ident_count+=1
-                                    self.advance()
-                                    if self.current_char is not None and self.current_char in com_dlm:
-                                        tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                        continue
-                                    elif self.current_char is not None and self.current_char not in com_dlm and self.current_char not in ALPHANUM:
-                                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                        self.advance()
-                                        continue
-
-
-                # Letter R
-                if self.current_char == "r":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "e":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "m":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "o":
-                                ident_str += self.current_char
-                                ident_count += 1
-                                self.advance()
-                                if self.current_char == "v":
-                                    ident_str += self.current_char
-                                    ident_count += 1
-                                    self.advance()
-                                    if self.current_char == "e":
-                                        ident_str += self.current_char
-                                        ident_count+=1
-                                        self.advance()
-                                        if self.current_char is not None and self.current_char in com_dlm:
-                                            tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                            continue
-                                        elif self.current_char is not None and self.current_char not in com_dlm and self.current_char not in ALPHANUM:
-                                            errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                            self.advance()
-                                            continue
-
-                # Letter S
-                if self.current_char == "s":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "k":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "i":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "b":
-                                ident_str += self.current_char
-                                ident_count += 1
-                                self.advance()
-                                if self.current_char == "i":
-                                    ident_str += self.current_char
-                                    ident_count += 1
-                                    self.advance()
-                                    if self.current_char == "d":
-                                        ident_str += self.current_char
-                                        ident_count += 1
-                                        self.advance()
-                                        if self.current_char == "i":
-                                            ident_str += self.current_char
-                                            ident_count+=1
-                                            self.advance()
-                                            if self.current_char is not None and self.current_char in com_dlm:
-                                                tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                                continue
-                                            elif self.current_char is not None and self.current_char not in com_dlm and self.current_char not in ALPHANUM:
-                                                errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                                self.advance()
-                                                continue
-
-                    if self.current_char == "t":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "u":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "r":
-                                ident_str += self.current_char
-                                ident_count += 1
-                                self.advance()
-                                if self.current_char == "d":
-                                    ident_str += self.current_char
-                                    ident_count += 1
-                                    self.advance()
-                                    if self.current_char == "y":
-                                        ident_str += self.current_char
-                                        ident_count+=1
-                                        self.advance()
-                                        if self.current_char is None or self.current_char in spc_dlm:
-                                            tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                            continue
-                                        elif self.current_char is not None and self.current_char not in spc_dlm and self.current_char not in ALPHANUM:
-                                            errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                            self.advance()
-                                            continue
-
-
-                # Letter T
-                if self.current_char == "t":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "a":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "p":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "e":
-                                ident_str += self.current_char
-                                ident_count+=1
-                                self.advance()
-                                if self.current_char == "r":
-                                    ident_str += self.current_char
-                                    ident_count+=1
-                                    self.advance()
-                                    if self.current_char is None or self.current_char in com_dlm:
-                                        tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                        continue
-                                    elif self.current_char is not None and self.current_char not in com_dlm and self.current_char not in ALPHANUM:
-                                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                        self.advance()
-                                        continue
-
-                    if self.current_char == "r":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "u":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "e":
-                                ident_str += self.current_char
-                                ident_count+=1
-                                self.advance()
-                                if self.current_char is None or self.current_char in lwk_dlm:
-                                    tokens.append(Token(TT_LWK, ident_str, line))
-                                    continue
-                                elif self.current_char is not None and self.current_char not in lwk_dlm and self.current_char not in ALPHANUM:
-                                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                    self.advance()
-                                    continue
-
-                    if self.current_char == 's':
-                        ident_str += self.current_char
-                        ident_count+=1
-                        self.advance()
-                        if self.current_char is None or self.current_char in com_dlm:
-                            tokens.append(Token(TT_KEYWORD, ident_str, line))
-                            continue
-                        elif self.current_char is not None and self.current_char not in com_dlm and self.current_char not in ALPHANUM:
-                            errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                            self.advance()
-                            continue
-
-                    if self.current_char == "u":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "a":
-                            ident_str += self.current_char
-                            ident_count += 1
-                            self.advance()
-                            if self.current_char == "h":
-                                ident_str += self.current_char
-                                ident_count+=1
-                                self.advance()
-                                if self.current_char is None or self.current_char in com_dlm:
-                                    tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                    continue
-                                elif self.current_char is not None and self.current_char not in com_dlm and self.current_char not in ALPHANUM:
-                                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                    self.advance()
-                                    continue
-
-                # Letter Y
-                if self.current_char == "y":
-                    ident_str += self.current_char
-                    ident_count += 1
-                    self.advance()
-                    if self.current_char == "a":
-                        ident_str += self.current_char
-                        ident_count += 1
-                        self.advance()
-                        if self.current_char == "p":
-                            ident_str += self.current_char
-                            ident_count+=1
-                            self.advance()
-                            if self.current_char is not None and self.current_char in com_dlm:
-                                tokens.append(Token(TT_KEYWORD, ident_str, line))
-                                continue
-                            elif self.current_char is not None and self.current_char not in com_dlm and self.current_char not in ALPHANUM:
-                                errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                                self.advance()
-                                continue
-
-                            
-                maxIdentifierLength = 20
-
-                while self.current_char is not None and self.current_char in ALPHANUM:
-                    ident_str += self.current_char
-                    self.advance()
-
-                if len(ident_str) > maxIdentifierLength:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Identifier '{ident_str}' exceeds maximum length of {maxIdentifierLength} characters."))
-                    continue
+        n = len(self.text)
+        max_errors = self.max_errors
+        count = 0
+        if max_errors is None and not self.summary:
+            found = []
+            tokenize(self.text, tokens.kinds, tokens.starts, tokens.ends, tokens.values, found)
+            errors = [self.error(start, end, details) for start, end, details in found]
+            emit(TOKEN_KIND[TT_EOF], n, n)
+            return tokens, errors
+        group = None  # [kind, first start, last start, last end, last line, details, count]
+        for kind, start, end, value, resume in scan(self.text):
+            if kind is not None:
+                emit(kind, start, end, value)
+                continue
+            count += 1
+            if not self.summary:
+                errors.append(self.error(start, end, value))
+            else:
+                kind = error_kind(value)
+                line = self.lines.line(start)
+                if group is not None and group[0] == kind and line <= group[4] + 1:
+                    group[2:5] = start, end, line
+                    group[6] += 1
+                else:
+                    self.flush(errors, group)
+                    group = [kind, start, start, end, line, value, 1]
+            if max_errors is not None and count >= max_errors:
+                break
+        else:
+            resume = n
+        self.flush(errors, group)
+        if resume < n and not self.fail_fast:
+            errors.append(self.error(resume, resume, f"Too many errors, lexing stopped after {count}"))
+        emit(TOKEN_KIND[TT_EOF], n, n)
+        return tokens, errors
 
-                elif self.current_char is None or self.current_char in identif_dlm:
-                    tokens.append(Token(TT_IDENTIFIER, ident_str, line))
-                    continue
+    def flush(self, errors, group):
+        if group is None:
+            return
+        kind, first, last, end, line, details, count = group
+        if count == 1:
+            errors.append(self.error(first, end, details))
+        else:
+            errors.append(ErrorSummary(self.position(first), self.position(last), kind, count))
+
+
+def scan(text, i=0):
+    """
+    Recognize tokens in text starting at offset i.
+
+    Yields (kind, start, end, value, resume) for every token and
+    (None, start, end, details, resume) for every lexical error, in source
+    order. value is None when the token's value is its source slice, and
+    resume is the offset scanning continues from. No EOF token is produced.
+    """
+    n = len(text)
+    word_run = WORD_RUN
+    keyword_rules = KEYWORD_RULES
+    token_kind = TOKEN_KIND
+    while i < n:
+        char = text[i]
+        if char in ALPHA_SET:
+            j = word_run(text, i + 1).end()
+            word = text[i:j]
+            follow = text[j] if j < n else None
+            rule = keyword_rules.get(word)
+            if rule is not None and follow is not None and follow not in rule[1]:
+                yield None, i, j, f"Invalid delimiter '{follow}' after '{word}'", j + 1
+                i = j + 1
+            elif rule is not None and (follow is not None or rule[2]):
+                yield token_kind[word], i, j, None, j
+                i = j
+            elif len(word) > MAX_IDENTIFIER_LENGTH:
+                yield None, i, j, f"Identifier '{word}' exceeds maximum length of {MAX_IDENTIFIER_LENGTH} characters.", j
+                i = j
+            elif follow is None or follow in identif_dlm:
+                yield token_kind[TT_IDENTIFIER], i, j, None, j
+                i = j
+            else:
+                yield None, i, j, f"Invalid delimiter '{follow}' after '{word}'", j + 1
+                i = j + 1
 
-                elif self.current_char is not None and self.current_char not in identif_dlm and self.current_char not in ALPHANUM:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
+        elif char in BLANK_SET:
+            i = BLANK_RUN(text, i + 1).end()
 
+        elif char == '/' and i + 1 < n and text[i + 1] == '/':
+            j = text.find('\n', i + 2)
+            i = n if j < 0 else j
 
+        elif char == '/' and i + 1 < n and text[i + 1] == '*':
+            j = text.find('*/', i + 2)
+            if j < 0:
+                yield None, i, n, f"Missing closing '*/' after '{text[i:]}'", n
+                i = n
+            else:
+                i = j + 2
+
+        elif char in SYMBOL_START:
+            transitions = SYMBOL_TRANSITIONS
+            state = 0
+            j = i
+            while j < n:
+                next_state = transitions[state].get(text[j])
+                if next_state is None:
+                    break
+                state = next_state
+                j += 1
+            symbol = text[i:j]
+            follow = text[j] if j < n else None
+            rule = SYMBOL_ACCEPTING[state]
+            if rule is None:
+                yield None, i, j, f"Invalid character '{symbol}'", j + 1
+                i = j + 1
+                continue
+            token_type, delimiters, eof_ok = rule
+            if token_type == TT_MINUS and follow is not None and follow in ALPHANUM_SET:
+                yield token_kind[TT_NEGAT], i, j, None, j
+                i = j
+            elif eof_ok if follow is None else follow in delimiters:
+                yield token_kind[symbol], i, j, None, j
+                i = j
+            else:
+                yield None, i, j, f"Invalid delimiter '{follow}' after '{symbol}'", j + 1
+                i = j + 1
+
+        elif char == '\n':
+            j = NEWLINE_RUN(text, i + 1).end()
+            yield token_kind[TT_NL], i, j, None, j
+            i = j
+
+        elif char in NUM_SET:
+            match = NUMBER_RUN(text, i)
+            j = match.end()
+            literal = text[i:j]
+
+            if j < n and text[j] not in lit_dlm:
+                k = NUMBER_BAD_DELIMITER_RUN(text, j).end()
+                yield None, i, k, f"Invalid delimiter '{text[j:k]}' after '{literal}'", k + 1
+                i = k + 1
+                continue
 
-            elif self.current_char == "+":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char == "+":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is None or self.current_char in unary_dlm:
-                        tokens.append(Token(TT_INC, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                elif self.current_char is not None and self.current_char in plus_dlm:
-                    tokens.append(Token(TT_PLUS, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-                
-            elif self.current_char == "!":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char == "=":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is not None and self.current_char in relat_dlm:
-                        tokens.append(Token(TT_NEQ, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                elif self.current_char is not None and self.current_char in not_dlm:
-                    tokens.append(Token(TT_NOT, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
+            if match[1] is None:
+                literal = literal.lstrip("0") or "0"
+                if len(literal) > 10:
+                    yield None, i, j, f"'{literal}' exceeds maximum number of characters", j + 1
+                    i = j + 1
                     continue
+                yield token_kind[TT_CHUNGUS], i, j, literal, j
+                i = j
 
-                
-            elif self.current_char == "%":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char is not None and self.current_char in arith_operator_dlm:
-                    tokens.append(Token(TT_MOD, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-    
-            elif self.current_char == "&":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char == "&":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is not None and self.current_char in operator_dlm:
-                        tokens.append(Token(TT_AND, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid character '{ident_str}'"))
-                    self.advance()
-                    continue
-                    
-            elif self.current_char == "(":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char is not None and self.current_char in oppar_dlm:
-                    tokens.append(Token(TT_OPPAR, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-                
-            elif self.current_char == ")":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char is None or self.current_char in clpar_dlm:
-                    tokens.append(Token(TT_CLPAR, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-                
-
-            elif self.current_char == "-":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char in ALPHANUM:
-                    tokens.append(Token(TT_NEGAT, ident_str, line))
-                    continue
-                elif self.current_char == "-":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is None or self.current_char in unary_dlm:
-                        tokens.append(Token(TT_DEC, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                elif self.current_char is not None and self.current_char in minus_dlm:
-                    tokens.append(Token(TT_MINUS, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-
-            elif self.current_char == "*":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char is None or self.current_char in arith_operator_dlm:
-                    tokens.append(Token(TT_MUL, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-                
-            elif self.current_char == ",":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char is not None and self.current_char in comma_dlm:
-                    tokens.append(Token(TT_COMMA, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-            
-            elif self.current_char == "\\":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char == "\"":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is None or self.current_char in esc_dlm:
-                        tokens.append(Token(TT_ESCAPESEQUENCE, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                elif self.current_char == "/":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is None or self.current_char in esc_dlm:
-                        tokens.append(Token(TT_ESCAPESEQUENCE, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                elif self.current_char == "{":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is None or self.current_char in esc_dlm:
-                        tokens.append(Token(TT_ESCAPESEQUENCE, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                elif self.current_char == "}":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is None or self.current_char in esc_dlm:
-                        tokens.append(Token(TT_ESCAPESEQUENCE, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                elif self.current_char == "n":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is None or self.current_char in esc_dlm:
-                        tokens.append(Token(TT_ESCAPESEQUENCE, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                elif self.current_char == "t":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is None or self.current_char in esc_dlm:
-                        tokens.append(Token(TT_ESCAPESEQUENCE, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid character '{ident_str}'"))
-                    self.advance()
-                    continue    
-                
-            elif self.current_char == ";":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char is not None and self.current_char in scolon_dlm:
-                    tokens.append(Token(TT_SEMICOL, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-                
-            elif self.current_char == "[":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char is not None and self.current_char in opbra_dlm:
-                    tokens.append(Token(TT_OPBRA, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-                
-            elif self.current_char == "]":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char is None or self.current_char in clbra_dlm:
-                    tokens.append(Token(TT_CLBRA, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-                
-            elif self.current_char == "{":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char is not None and self.current_char in opcur_dlm:
-                    tokens.append(Token(TT_OPCUR, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-                
-            elif self.current_char == "}":
-                ident_str = self.current_char 
-                pos_start = self.pos.copy() 
-                self.advance()
-                if self.current_char is None or self.current_char in clcur_dlm:
-                    tokens.append(Token(TT_CLCUR, ident_str, line))
-                    continue
-                else: 
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
+            else:  # Float case
+                integer_part, fractional_part = literal.split(".")
+                integer_part = integer_part.lstrip("0") or "0"
+                fractional_part = fractional_part.rstrip("0") or "0"
 
-            elif self.current_char == "|":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char == "|":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is not None and self.current_char in operator_dlm:
-                        tokens.append(Token(TT_OR, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid character '{ident_str}'"))
-                    self.advance()
-                    continue
+                literal = f"{integer_part}.{fractional_part}"
 
-            elif self.current_char == "<":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char == "=":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is not None and self.current_char in arith_operator_dlm:
-                        tokens.append(Token(TT_LTE, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                elif self.current_char is not None and self.current_char in arith_operator_dlm:
-                    tokens.append(Token(TT_LT, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
+                if len(integer_part) > 10 or len(fractional_part) > 5:
+                    yield None, i, j, f"'{literal}' exceeds maximum number of characters", j + 1
+                    i = j + 1
                     continue
+                yield token_kind[TT_CHUDELUXE], i, j, literal, j
+                i = j
+
+        elif char == '"':
+            j = STRING_RUN(text, i + 1).end()
+            string = text[i:j]
+            if '\\' in string:
+                string = STRING_ESCAPE.sub(unescape, string)
+            if j < n and text[j] == '\\':
+                # Only a backslash ending the source stops the run
+                j = n
+
+            if j >= n or text[j] != '"':
+                yield None, i, j, f"Missing closing '\"' after '{string}'", j
+                i = j
+                continue
+            string += '"'
+            j += 1
 
-            elif self.current_char == ">":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char == "=":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is not None and self.current_char in arith_operator_dlm:
-                        tokens.append(Token(TT_GTE, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                elif self.current_char is not None and self.current_char in arith_operator_dlm:
-                    tokens.append(Token(TT_GT, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
+            if j < n and text[j] not in lit_dlm:
+                yield None, i, j, f"Invalid delimiter '{text[j]}' after string literal '{string}'", j + 1
+                i = j + 1
+                continue
 
-            elif self.current_char == "=":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char == "=":
-                    ident_str += self.current_char
-                    self.advance()
-                    if self.current_char is not None and self.current_char in relat_dlm:
-                        tokens.append(Token(TT_EQ, ident_str, line))
-                        continue
-                    else:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                        self.advance()
-                        continue
-                elif self.current_char is not None and self.current_char in equal_dlm:
-                    tokens.append(Token(TT_IS, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-            
-            elif self.current_char == ":":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char is None or self.current_char in endln_dlm:
-                    tokens.append(Token(TT_COL, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-                
-            elif self.current_char == ".":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char is not None and self.current_char in ALPHA:
-                    tokens.append(Token(TT_DOT, ident_str, line))
-                    continue
-                elif self.current_char is not None and self.current_char in NUM:
-                    fractional_part = ""
-                    while self.current_char is NUM:
-                        fractional_part += self.current_char
-                        self.advance()
-
-                        if len(fractional_part) > 5:
-                            errors.append(IllegalCharError(pos_start, self.pos, f"'{ident_str}' exceeds maximum number of decimal places"))
-                            continue
-                        
-                    ident_str = f"0.{fractional_part}"
-                    tokens.append(Token(TT_CHUDELUXE, ident_str, line))
-                    continue
-                else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{ident_str}'"))
-                    self.advance()
-                    continue
+            yield token_kind[TT_FORSENCD], i, j, string.replace('\n', '\\n'), j
+            i = j
 
-            elif self.current_char == '\n':
-                pos_start = self.pos.copy()
-                while self.current_char == '\t' or self.current_char == ' ' or self.current_char == '\n':
-                    if self.current_char == '\t' or self.current_char == ' ':
-                        self.advance()
-                    else:
-                        line += 1
-                        self.advance()
+        elif char == "'":
+            j = CHAR_LIT_RUN(text, i + 1).end()
+            char_value = text[i + 1:j]
+            string = "'" + char_value
 
-                tokens.append(Token(TT_NL, "\\n", line))
+            if j >= n or text[j] != "'":
+                yield None, i, j, f"Missing closing '\'' after '{string}'", j
+                i = j
                 continue
-                
-
-            elif self.current_char == '\t':
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                while self.current_char == '\t':
-                    self.advance()
-                
-
-            elif self.current_char == ' ':
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                while self.current_char == ' ':
-                    self.advance()
-                
-
-            elif self.current_char in NUM:
-
-                dot_count = 0
-                ident_str = ""
-                pos_start = self.pos.copy()
-
-                while self.current_char is not None and self.current_char in NUM + ".":
-                    if self.current_char == ".":
-                        if dot_count == 1:
-                            break
-                        dot_count += 1
-                    ident_str += self.current_char
-                    self.advance()
-
-                if self.current_char is not None and self.current_char not in lit_dlm:
-                    invalid_part = ""
-                    while self.current_char is not None and self.current_char not in NUM + lit_dlm:
-                        invalid_part += self.current_char
-                        self.advance()
-
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{invalid_part}' after '{ident_str}'"))
-                    self.advance()
-                    continue
-
-                if dot_count == 0: 
-                    ident_str = ident_str.lstrip("0") or "0"
-                    if len(ident_str) > 10: 
-                        errors.append(IllegalCharError(pos_start, self.pos, f"'{ident_str}' exceeds maximum number of characters"))
-                        self.advance()
-                        continue
-                    tokens.append(Token(TT_CHUNGUS, ident_str, line))
-                    
-                else:  # Float case
-                    parts = ident_str.split(".")
-                    integer_part = parts[0].lstrip("0") or "0"
-                    fractional_part = parts[1].rstrip("0") or "0"
-
-                    ident_str = f"{integer_part}.{fractional_part}"
-
-                    if len(integer_part) > 10 or len(fractional_part) > 5:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"'{ident_str}' exceeds maximum number of characters"))
-                        self.advance()
-                        continue
-                    tokens.append(Token(TT_CHUDELUXE, ident_str, line))
-
-            elif self.current_char == '"':
-                string = ''
-                pos_start = self.pos.copy()
-                escape_character = False
-                string += self.current_char
-                self.advance()
-
-                escape_characters = {
-                    'n': '\n',
-                    't': '\t',
-                    '{': '\\{',
-                    '}': '\\}'
-                }
-
-                while self.current_char is not None and (self.current_char != '"' or escape_character):
-                    if escape_character:
-                        string += escape_characters.get(self.current_char, self.current_char)
-                        escape_character = False
-                    else:
-                        if self.current_char == '\\':
-                            escape_character = True
-                        elif self.current_char == '\n':
-                            pos_end = self.pos.copy()
-                            break
-                        else:
-                            string += self.current_char
-                    self.advance()
-
-                if self.current_char == '"':
-                    string += self.current_char
-                    self.advance()
+            string += "'"
+            j += 1
 
-                else:
-                    pos_end = self.pos.copy()
-                    errors.append(IllegalCharError(pos_start, pos_end, f"Missing closing '\"' after '{string}'"))
-                    continue
+            if len(char_value) > 1:
+                yield None, i, j, f"Character literal '{string}' exceeds maximum length of 1 character.", j
+                i = j
+                continue
 
-                if self.current_char is not None and self.current_char not in lit_dlm:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after string literal '{string}'"))
-                    self.advance()
-                    continue
-            
-                string = string.replace('\n', '\\n')
-                tokens.append(Token(TT_FORSENCD, string, line))
+            if j < n and text[j] not in lit_dlm:
+                yield None, i, j, f"Invalid delimiter '{text[j]}' after '{string}'", j + 1
+                i = j + 1
                 continue
-    
-            elif self.current_char == "'":
-                string = ''
-                char = ''
-                pos_start = self.pos.copy()
-                string += self.current_char
-                self.advance()
-
-                while self.current_char is not None and self.current_char != "'":
-                    if self.current_char == '\n':
-                        pos_end = self.pos.copy()
-                        break
-                    elif self.current_char == '\\':
-                        pos_end = self.pos.copy()
-                        break
-                    else:
-                        string += self.current_char
-                        char += self.current_char
-                    self.advance()
-
-                if self.current_char == "'":
-                    string += self.current_char
-                    self.advance()
-                    
-                else:
-                    pos_end = self.pos.copy()
-                    errors.append(IllegalCharError(pos_start, pos_end, f"Missing closing '\'' after '{string}'"))
-                    continue
 
-                if len(char) > 1:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Character literal '{string}' exceeds maximum length of 1 character."))
-                    continue
+            yield token_kind[TT_FORSEN], i, j, None, j
+            i = j
+
+        elif char == '.':
+            follow = text[i + 1] if i + 1 < n else None
+            if follow is not None and follow in ALPHA_SET:
+                yield token_kind[TT_DOT], i, i + 1, None, i + 1
+                i += 1
+            elif follow is not None and follow in NUM_SET:
+                yield token_kind[TT_CHUDELUXE], i, i + 1, "0.", i + 1
+                i += 1
+            else:
+                yield None, i, i + 1, f"Invalid delimiter '{follow}' after '{char}'", i + 2
+                i += 2
+
+        else:
+            yield None, i, i + 1, f"Invalid character '" + char + "'", i + 2
+            i += 2
+
+
+def tokenize(text, kinds, starts, ends, values, errors, i=0):
+    """
+    Like scan, but appends into the columns of a TokenBuffer and to a list
+    of (start, end, details) errors.
+    """
+    for kind, start, end, value, resume in scan(text, i):
+        if kind is None:
+            errors.append((start, end, value))
+            continue
+        if value is not None and value != text[start:end]:
+            values[len(kinds)] = value
+        kinds.append(kind)
+        starts.append(start)
+        ends.append(end)
+
+
+def run(fn, text, **options):
+    lexer = Lexer(fn, text, **options)
+    tokens, error = lexer.make_tokens()
+    return tokens, error
+
+
+def validate(text, fn='<stdin>', first=10):
+    """
+    Check text without building tokens and return (count, errors), the
+    number of lexical errors and the IllegalCharErrors for the first of
+    them. Lines are only worked out when there is an error to report.
+    """
+    count = 0
+    errors = []
+    lines = None
+    for kind, start, end, details, resume in scan(text):
+        if kind is not None:
+            continue
+        count += 1
+        if count <= first:
+            if lines is None:
+                lines = LineIndex(text)
+            ln, col = lines.locate(start)
+            end_ln, end_col = lines.locate(end)
+            errors.append(IllegalCharError(Position(start, ln, col, fn, text), Position(end, end_ln, end_col, fn, text), details))
+    return count, errors
+
+
+def run_file(path, fn=None, **options):
+    """
+    Lex the file at path, the same as run() on its contents as open() reads
+    them: decoded as UTF-8 without a leading byte order mark, and with
+    '\r\n' and '\r' line breaks turned into '\n'.
+
+    This is not lexing from the mapping: scan() works on str, so the whole
+    file is decoded into one heap string first, and token values are
+    offsets into that string. The file is only mapped so it can be decoded
+    without a read() buffer next to it, which halves the peak memory of
+    loading it.
+    """
+    with open(path, 'rb') as file:
+        if not file.seek(0, 2):
+            return run(fn or path, '', **options)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            text = str(mapping, 'utf-8-sig')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return run(fn or path, text, **options)
+
+
+TOKEN_CACHE_SIZE = 64
+
+class TokenCache:
+    # Bounded LRU of run() results keyed by a digest of the file name and
+    # source, so the same buffer sent to /api/lex, /api/parse and
+    # /api/semantic is only lexed once. Cached tokens and errors are shared
+    # between callers and must not be modified.
+    def __init__(self, maxsize=TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(fn, text, options):
+        digest = blake2b(fn.encode('utf-8', 'surrogatepass'), digest_size=16)
+        digest.update(repr(sorted(options.items())).encode())
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        return digest.digest()
+
+    def get(self, fn, text, **options):
+        # The cached run() result, or None without lexing; only hits count
+        key = self.key(fn, text, options)
+        with self.lock:
+            result = self.entries.get(key)
+            if result is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            return result
+
+    def run(self, fn, text, **options):
+        key = self.key(fn, text, options)
+        with self.lock:
+            result = self.entries.get(key)
+            if result is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = run(fn, text, **options)
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            self.trim()
+        return result
 
-                if self.current_char is not None and self.current_char not in lit_dlm:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{string}'"))
-                    self.advance()
-                    continue
+    def trim(self):
+        while len(self.entries) > max(self.maxsize, 0):
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize):
+        with self.lock:
+            self.maxsize = maxsize
+            self.trim()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self.entries), 'maxsize': self.maxsize}
+
+token_cache = TokenCache()
+
+def cached_run(fn, text, **options):
+    return token_cache.run(fn, text, **options)
+
+
+CHUNK_SIZE = 1 << 16
+
+def iter_tokens(fn, source, chunk_size=CHUNK_SIZE):
+    """
+    Yield Tokens and IllegalCharErrors in source order as they are recognized.
+
+    source is the program text or a text file object. Files are read
+    chunk_size characters at a time, and only the unfinished tail of a
+    chunk is kept between reads, so memory is bounded by the longest token
+    instead of the file size.
+
+    A tail that is still open at the end of the buffer, such as a long
+    comment or blank run, is scanned again from its start. More chunks are
+    read first until the buffer is twice the size of that tail, so the
+    scanning done over any one construct stays linear in its length.
+    """
+    if isinstance(source, str):
+        chunks = iter((source,))
+    else:
+        chunks = iter(lambda: source.read(chunk_size), '')
+    nl_kind = TOKEN_KIND[TT_NL]
+    buffer = ''
+    pending = []    # chunks read since buffer was last scanned
+    waiting = 0     # their total length
+    base = 0        # offset of buffer[0] in the whole source
+    base_ln = 0     # newlines before buffer[0]
+    base_nl = -1    # offset of the last of those newlines
+    chunk = next(chunks, '')
+    while chunk is not None:
+        following = next(chunks, None)
+        final = following is None
+        pending.append(chunk)
+        waiting += len(chunk)
+        if not final and waiting < len(buffer):
+            chunk = following
+            continue
+        buffer += ''.join(pending)
+        pending.clear()
+        waiting = 0
+        n = len(buffer)
+        lines = LineIndex(buffer)
+        consumed = 0
+        for kind, start, end, value, resume in scan(buffer):
+            # A token that reaches the end of the buffer may still grow
+            if end >= n and not final:
+                break
+            if kind is None:
+                ln, col = lines.locate(start)
+                pos_start = Position(base + start, base_ln + ln, col if ln else base + start - base_nl - 1, fn, None)
+                ln, col = lines.locate(end)
+                pos_end = Position(base + end, base_ln + ln, col if ln else base + end - base_nl - 1, fn, None)
+                yield IllegalCharError(pos_start, pos_end, value)
+            else:
+                if value is None:
+                    value = TokenBuffer.FIXED_VALUES.get(kind) or buffer[start:end]
+                line = base_ln + lines.line(end if kind == nl_kind else start)
+                yield Token(KIND_TYPE[kind], value, line, base + start, base + end, terminal=KIND_TERMINAL[kind])
+            consumed = resume
+        done = buffer[:consumed]
+        newlines = done.count('\n')
+        if newlines:
+            base_ln += newlines
+            base_nl = base + done.rfind('\n')
+        base += len(done)
+        buffer = buffer[consumed:]
+        chunk = following
+    n = len(buffer)
+    yield Token(TT_EOF, "EOF", base_ln + buffer.count('\n') + 1, base + n, base + n)
+
+
+class TokenCursor:
+    # The current token of a stream() pass. The one cursor is updated in
+    # place for every token, so a consumer has to read what it needs from
+    # it before asking for the next token. Values and lines are only worked
+    # out when asked for.
+    __slots__ = ('text', 'kind', 'terminal', 'start', 'end', 'literal', 'line_index')
+
+    def __init__(self, text):
+        self.text = text
+        self.line_index = None
+
+    def lines(self):
+        if self.line_index is None:
+            self.line_index = LineIndex(self.text)
+        return self.line_index
+
+    @property
+    def type(self):
+        return KIND_TYPE[self.kind]
+
+    @property
+    def value(self):
+        value = self.literal
+        if value is None:
+            value = TokenBuffer.FIXED_VALUES.get(self.kind)
+            if value is None:
+                value = self.text[self.start:self.end]
+        return value
+
+    @property
+    def line(self):
+        # NL tokens report the line their run of blank lines ends on
+        return self.lines().line(self.end if self.kind == TOKEN_KIND[TT_NL] else self.start)
 
-                tokens.append(Token(TT_FORSEN, string, line))
-                continue
+    def __repr__(self):
+        if self.value: return f'{self.type}:{self.value} (Ln {self.line})'
+        return f'{self.type}'
 
 
-            elif self.current_char == "/":
-                ident_str = self.current_char
-                pos_start = self.pos.copy()
-                self.advance()
-                if self.current_char == "/":
-                    ident_str += self.current_char
-                    self.advance()
-                    while self.current_char is not None and self.current_char != "\n":
-                        ident_str += self.current_char
-                        self.advance()
-                    #tokens.append(Token(TT_COMMENT, ident_str, line))
-                    continue
-                elif self.current_char == "*":
-                    ident_str += self.current_char
-                    self.advance()
-                    while self.current_char is not None:
-                        if self.current_char == "*" and self.text[self.pos.idx + 1] == "/":
-                            ident_str += "*/"
-                            self.advance()
-                            self.advance()
-                            break
-                        else:
-                            ident_str += self.current_char
-                            if self.current_char == "\n":
-                                line += 1
-                            self.advance()
-                    #tokens.append(Token(TT_COMMENT, ident_str, line))
-                    if self.current_char is None:
-                        errors.append(IllegalCharError(pos_start, self.pos, f"Missing closing '*/' after '{ident_str}'"))
-                        continue
-                    continue    
-                elif self.current_char is not None and self.current_char in arith_operator_dlm:
-                    tokens.append(Token(TT_DIV, ident_str, line))
-                    continue
+def stream(fn, text):
+    """
+    Yield the tokens of text one at a time as the scanner recognizes them,
+    for a consumer such as LL1Parser.parse that stops at the first error.
+
+    Nothing is built ahead of the consumer: each token is yielded through
+    the same TokenCursor, and lexical errors as IllegalCharErrors. Closing
+    the generator early stops the lexing too.
+    """
+    cursor = TokenCursor(text)
+    kind_terminal = KIND_TERMINAL
+    for kind, start, end, value, resume in scan(text):
+        if kind is None:
+            lines = cursor.lines()
+            ln, col = lines.locate(start)
+            end_ln, end_col = lines.locate(end)
+            yield IllegalCharError(Position(start, ln, col, fn, text), Position(end, end_ln, end_col, fn, text), value)
+            continue
+        cursor.kind = kind
+        cursor.terminal = kind_terminal[kind]
+        cursor.start = start
+        cursor.end = end
+        cursor.literal = value
+        yield cursor
+    n = len(text)
+    cursor.kind = cursor.terminal = TOKEN_KIND[TT_EOF]
+    cursor.start = cursor.end = n
+    cursor.literal = None
+    yield cursor
+
+
+def relex(fn, tokens, errors, offset, deleted, inserted):
+    """
+    Re-lex a TokenBuffer after replacing deleted characters at offset with
+    inserted, returning the new (tokens, errors) as run() would.
+
+    Tokens that end before the edit are kept, scanning restarts right after
+    the last of them and stops as soon as a new token starts where an old
+    token used to start, shifted by the edit. From there on the old tokens
+    and errors are spliced back in. Comments and strings need no special
+    care: they are never cut by a restart point since the scanner restarts
+    between tokens, and an edit that opens or closes one simply keeps the
+    scan going until the streams line up again.
+    """
+    old_text = tokens.text
+    text = old_text[:offset] + inserted + old_text[offset + deleted:]
+    delta = len(inserted) - deleted
+    edit_end = offset + len(inserted)
+    shift = delta.__add__
+
+    old_newlines = tokens.line_index.newlines
+    newlines = old_newlines[:bisect_left(old_newlines, offset)]
+    newlines.extend(offset + match.start() for match in re.finditer('\n', inserted))
+    newlines.extend(map(shift, old_newlines[bisect_left(old_newlines, offset + deleted):]))
+    line_index = LineIndex(text, newlines)
+
+    def position(idx):
+        ln, col = line_index.locate(idx)
+        return Position(idx, ln, col, fn, text)
+
+    old_starts = tokens.starts
+    last = len(tokens) - 1  # the EOF token is always rebuilt
+    keep = min(bisect_left(tokens.ends, offset), last)
+    restart = tokens.ends[keep - 1] if keep else 0
+
+    result = TokenBuffer(text, line_index)
+    result.kinds = tokens.kinds[:keep]
+    result.starts = old_starts[:keep]
+    result.ends = tokens.ends[:keep]
+    result.values = {index: value for index, value in tokens.values.items() if index < keep}
+    new_errors = [error for error in errors if error.pos_start.idx < restart]
+
+    resync = None
+    for kind, start, end, value, resume in scan(text, restart):
+        if kind is not None and start >= edit_end:
+            index = bisect_left(old_starts, start - delta, keep, last)
+            if index < last and old_starts[index] == start - delta:
+                resync = index
+                break
+        if kind is None:
+            new_errors.append(IllegalCharError(position(start), position(end), value))
+        else:
+            result.append(kind, start, end, value)
+
+    if resync is None:
+        n = len(text)
+        result.append(TOKEN_KIND[TT_EOF], n, n)
+        return result, new_errors
+
+    moved = len(result) - resync
+    result.values.update((index + moved, value) for index, value in tokens.values.items() if index >= resync)
+    result.kinds.extend(tokens.kinds[resync:])
+    result.starts.extend(map(shift, old_starts[resync:]))
+    result.ends.extend(map(shift, tokens.ends[resync:]))
+    old_resync = old_starts[resync]
+    for error in errors:
+        if error.pos_start.idx >= old_resync:
+            new_errors.append(IllegalCharError(position(error.pos_start.idx + delta), position(error.pos_end.idx + delta), error.details))
+    return result, new_errors
+
+
+PARALLEL_MIN_SIZE = 1 << 20
+
+def split_points(text, parts):
+    """
+    Pick up to parts - 1 offsets that split text into similar pieces. Each is
+    the first character after a line break and the blanks and line breaks
+    following it, where the NL token scan() makes of them ends, so indented
+    lines qualify. The line break is not escaped or, as far as the last '/*'
+    and '*/' tell, inside a block comment, so the lexer is very likely
+    between tokens there.
+    """
+    n = len(text)
+    points = []
+    for part in range(1, parts):
+        i = max(n * part // parts, points[-1] if points else 0)
+        while True:
+            i = text.find('\n', i)
+            if i < 0:
+                return points
+            j = NEWLINE_RUN(text, i + 1).end()
+            if j >= n:
+                return points
+            if text[i - 1:i] != '\\' and text.rfind('/*', 0, i) <= text.rfind('*/', 0, i):
+                points.append(j)
+                break
+            i = j
+    return points
+
+shared_text = None
+
+def share_text(text):
+    global shared_text
+    shared_text = text
+
+def lex_range(start, stop):
+    # Worker side of run_parallel: lex the shared text from start until the
+    # scanner moves past stop
+    text = shared_text
+    kinds, starts, ends, values, errors = array('H'), array('I'), array('I'), {}, []
+    resume = start
+    for kind, token_start, end, value, resume in scan(text, start):
+        if kind is None:
+            errors.append((token_start, end, value))
+        else:
+            if value is not None and value != text[token_start:end]:
+                values[len(kinds)] = value
+            kinds.append(kind)
+            starts.append(token_start)
+            ends.append(end)
+        if resume >= stop:
+            break
+    else:
+        resume = len(text)
+    return start, kinds, starts, ends, values, errors, resume
+
+def run_parallel(fn, text, jobs=None):
+    """
+    Lex text in jobs worker processes and return the same (tokens, errors)
+    as run().
+
+    The text is cut at split_points() and every piece is lexed from its
+    start. A piece is only used as is when the previous one ended exactly
+    at its start. Otherwise the scan is continued here from where the
+    previous piece really ended until it produces a token that the piece
+    also starts at, which puts both scanners in the same state, and the
+    rest of the piece is taken from there.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(text) < PARALLEL_MIN_SIZE:
+        return run(fn, text)
+    n = len(text)
+    bounds = [0] + split_points(text, jobs) + [n]
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    with ProcessPoolExecutor(len(bounds) - 1, context, share_text, (text,)) as executor:
+        pieces = list(executor.map(lex_range, bounds[:-1], bounds[1:]))
+
+    lexer = Lexer(fn, text)
+    tokens = TokenBuffer(text, lexer.lines)
+    found = []
+    position = 0
+    for stop, (start, kinds, starts, ends, values, errors, resume) in zip(bounds[1:], pieces):
+        first = 0
+        if position != start:
+            first = None
+            for kind, token_start, end, value, position in scan(text, position):
+                if kind is not None:
+                    index = bisect_left(starts, token_start)
+                    if index < len(starts) and starts[index] == token_start:
+                        first = index
+                        break
+                    tokens.append(kind, token_start, end, value)
                 else:
-                    errors.append(IllegalCharError(pos_start, self.pos, f"Invalid delimiter '{self.current_char}' after '{string}'"))
-                    self.advance()
-                    continue
-            
+                    found.append((token_start, end, value))
+                if position >= stop:
+                    break
             else:
-                pos_start = self.pos.copy()
-                char = self.current_char
-                self.advance()
-                errors.append(IllegalCharError(pos_start, self.pos, f"Invalid character '" + char + "'"))
-                self.advance()
+                position = n
+            if first is None:
                 continue
-                
-        if self.current_char is None:
-            tokens.append(Token(TT_EOF, "EOF", line))
-        return tokens, errors
-
-    
-def run(fn, text):
-    lexer = Lexer(fn, text)
-    tokens, error = lexer.make_tokens()
-    return tokens, error
\ No newline at end of file
+            errors = [error for error in errors if error[0] >= token_start]
+        moved = len(tokens) - first
+        tokens.values.update((index + moved, value) for index, value in values.items() if index >= first)
+        tokens.kinds.extend(kinds[first:])
+        tokens.starts.extend(starts[first:])
+        tokens.ends.extend(ends[first:])
+        found.extend(errors)
+        position = resume
+    tokens.append(TOKEN_KIND[TT_EOF], n, n)
+    return tokens, [lexer.error(start, end, details) for start, end, details in found]
+
+
+#SPECIALIZED SCANNER
+
+# scan() is the reference definition. cgmagen specializes it, and a
+# tokenize() without the generator, for the spec above; frozen builds
+# without sources keep the reference versions.
+reference_scan, reference_tokenize = scan, tokenize
+try:
+    import cgmagen
+    scanner = cgmagen.load(scan, globals())
+    scan, tokenize = scanner.scan, scanner.tokenize
+except (ImportError, OSError, TypeError):
+    pass
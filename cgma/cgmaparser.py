@@ -1,84 +1,444 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from cgmalexer import Lexer
-from cfg import cfg, predict_sets
+from array import array
+from bisect import bisect_left
+from cgmalexer import Lexer, Error, KIND_NAMES, TOKEN_KIND, TT_EOF, TokenView, intern_kind, stream, run, relex
+from cfg import cfg, predict_sets, follow_sets, parsing_table, compute_parsing_table, compute_first, compute_follow
 
 app = Flask(__name__)
 CORS(app)
 
+# Token types the parser steps over
+SKIPPED_KINDS = frozenset(TOKEN_KIND[type_] for type_ in ('SPC', 'TAB', 'COMMENT'))
+
+class ParseNode:
+    # Node of a tree built by LL1Parser.build_parse_tree. A non-terminal
+    # node has one child per symbol of the production applied to it; a
+    # terminal node has none and is shared by every match of its terminal.
+    # width is the number of tokens under the node. Nothing in a subtree
+    # depends on where it starts, so an incremental parse can keep
+    # unchanged subtrees as they are.
+    # errors counts the syntax errors recovered from in the subtree. A node
+    # with more than its children was reached on a token it cannot start
+    # with, and the tokens dropped then come before its children; a
+    # terminal node of width 0 was missing.
+    __slots__ = ('kind', 'children', 'width', 'errors')
+
+    def __init__(self, kind, children=(), width=1, errors=0):
+        self.kind = kind
+        self.children = children
+        self.width = width
+        self.errors = errors
+
+    @property
+    def name(self):
+        return KIND_NAMES[self.kind]
+
+    def __repr__(self):
+        return f'{self.name} ({self.width} tokens)'
+
+
 # LL(1) Parser Class
 class LL1Parser:
-    def __init__(self, cfg, predict_sets):
+    def __init__(self, cfg, predict_sets, parsing_table=None, follow_sets=None):
         self.cfg = cfg
         self.predict_sets = predict_sets
-        self.parsing_table = self.construct_parsing_table()
-        self.stack = []
-        self.tokens = []
-        self.current_token_index = 0
+        self.parsing_table = self.construct_parsing_table() if parsing_table is None else parsing_table
+        self.follow_sets = compute_follow(cfg, compute_first(cfg)) if follow_sets is None else follow_sets
+        # Everything below is built once and only read by parse(), so one
+        # parser can be shared between threads
+        self.start = intern_kind(next(iter(self.cfg)))
+        self.rows, self.width, self.table, self.productions = self.construct_dense_table()
+        self.sync = self.construct_sync_sets()
+        self.leaves = {kind: ParseNode(kind) for kind in range(self.width) if self.rows[kind] < 0}
+        self.missing = {kind: ParseNode(kind, (), 0, 1) for kind in self.leaves}
+        # No token is '$', so with it at the bottom of the stack derive()
+        # parses a single symbol as if it were the whole input
+        self.end = intern_kind('$')
 
     def construct_parsing_table(self):
-        parsing_table = {}
+        return compute_parsing_table(self.cfg, self.predict_sets)
+
+    def construct_dense_table(self):
+        """
+        Compile parsing_table over interned kinds. table is a flat array
+        with one row of width entries per non-terminal, where
+        table[rows[non_terminal] + terminal] is a production id, 0 meaning
+        no entry. Non-terminals with identical rows share one.
+        productions[id] holds the production's symbol kinds, reversed for
+        pushing on the stack. rows is -1 for terminals.
+        """
         for non_terminal, productions in self.cfg.items():
-            parsing_table[non_terminal] = {}
+            intern_kind(non_terminal)
             for production in productions:
-                predict_key = (non_terminal, tuple(production))
-                if predict_key in self.predict_sets:
-                    for terminal in self.predict_sets[predict_key]:
-                        parsing_table[non_terminal][terminal] = production
-        return parsing_table
-
-    def parse(self, tokens):
-        self.stack = ['EOF', list(self.cfg.keys())[0]]  # Initialize stack
-        index = 0
+                for symbol in production:
+                    intern_kind(symbol)
+        for row in self.parsing_table.values():
+            for terminal in row:
+                intern_kind(terminal)
+
+        width = len(KIND_NAMES)
+        rows = array('i', [-1]) * width
+        table = array('H')
+        offsets = {}  # Row contents to offset in table
+        productions = [()]
+        production_ids = {}
+        for non_terminal, row in self.parsing_table.items():
+            entries = array('H', bytes(2 * width))
+            for terminal, production in row.items():
+                key = tuple(intern_kind(symbol) for symbol in reversed(production) if symbol != 'ε')
+                if key not in production_ids:
+                    production_ids[key] = len(productions)
+                    productions.append(key)
+                entries[intern_kind(terminal)] = production_ids[key]
+            contents = entries.tobytes()
+            if contents not in offsets:
+                offsets[contents] = len(table)
+                table.extend(entries)
+            rows[intern_kind(non_terminal)] = offsets[contents]
+        return rows, width, table, tuple(productions)
+
+    def construct_sync_sets(self):
+        # FOLLOW of each non-terminal over kinds, with '$' standing for the
+        # EOF token. Panic-mode recovery resumes after a non-terminal once
+        # one of these turns up.
+        eof = TOKEN_KIND[TT_EOF]
+        return {
+            intern_kind(non_terminal): frozenset(eof if terminal == '$' else intern_kind(terminal) for terminal in follow)
+            for non_terminal, follow in self.follow_sets.items()
+        }
+
+    def parse(self, tokens, max_errors=1, derivation=None):
+        # tokens may be a list, a TokenBuffer or a generator such as iter_tokens.
+        # All parsing state is local, so concurrent calls do not interfere.
+        # Up to max_errors syntax errors are reported (None for no limit);
+        # after each one the parser recovers in panic mode and carries on.
+        # When derivation is a list, the leftmost derivation is appended to
+        # it as derive() describes. It is only complete when the parse runs
+        # to the end; build_parse_tree turns it into a tree.
+        stack = [TOKEN_KIND[TT_EOF], self.start]  # Initialize stack
         error_messages = []
+        self.derive(iter(tokens), stack, 0, max_errors, derivation, error_messages)
+        if error_messages:
+            return False, error_messages
+        return True, []
+
+    def derive(self, tokens, stack, position, max_errors, derivation, error_messages):
+        """
+        Parse from tokens, an iterator whose first token is at position,
+        until stack is empty or the '$' end marker is popped, appending
+        errors to error_messages, and return the position reached.
 
-        while self.stack:
-            top = self.stack.pop()
-            token = tokens[index]
-            token_type = token.type  
-            token_value = token.value  
-            line = token.line
-
-            while token_type in {'SPC', 'TAB', 'COMMENT'}:
-                index += 1
-                token = tokens[index]
-                token_type = token.type
-                token_value = token.value
-
-            if token_type in {"IDENTIFIER", "CHU_LIT", "CHUDEL_LIT", "FORSEN_LIT", "FORSENCD_LIT"}:
-                pass
-
-            elif token_value in self.parsing_table.get(top, {}):
-                token_type = token_value 
-
-            #print(f"\nStack Top: {top}, Token Type: {token_type}, Token Value: {token_value}")
-
-
-            if top == token_type or top == token_value:
-                #print(f"Matched: {top}")
-                index += 1  
-            elif top in self.parsing_table:
-                if token_type in self.parsing_table[top]:
-                    production = self.parsing_table[top][token_type]
-                    #print(f"Expand: {top} → {' '.join(production)}")
-                    if production != ['ε']:
-                        self.stack.extend(reversed(production))
-                    #print(f"Updated Stack: {self.stack}")
+        Each production id applied is appended to derivation, if it is a
+        list, and ~position for each token matched. Recovery is recorded
+        too: a non-terminal reached on a token it cannot start with is
+        followed by ~position for each token dropped and then either its
+        production or 0 when it was given up, and a missing terminal by 0.
+        """
+        eof, end = TOKEN_KIND[TT_EOF], self.end
+        skipped = SKIPPED_KINDS
+        rows, width, table, productions, sync = self.rows, self.width, self.table, self.productions, self.sync
+        record = None if derivation is None else derivation.append
+        token = next(tokens, None)
+        terminal = None
+        error_at = -1  # Position of the last syntax error
+        syncing = None  # Non-terminal being recovered
+
+        while stack:
+            if isinstance(token, Error):
+                error_messages.append(token.as_string())
+                return position
+            terminal = token.terminal
+            if terminal in skipped:
+                token = next(tokens, None)
+                position += 1
+                continue
+
+            if syncing is not None:
+                # Drop tokens until one the non-terminal can start with, then
+                # parse it again, or one that can follow it, then give it up
+                if terminal < width and table[rows[syncing] + terminal]:
+                    stack.append(syncing)
+                elif terminal != eof and terminal not in sync.get(syncing, ()):
+                    if record:
+                        record(~position)
+                    token = next(tokens, None)
+                    position += 1
+                    continue
+                elif record:
+                    record(0)
+                syncing = None
+
+            # Expand non-terminals until the current token is matched
+            while True:
+                top = stack.pop()
+                row = rows[top]
+                if row < 0:
+                    # Terminals match on kind, or on the literal text for ones
+                    # like the '0' in "back 0" that stand for a single value
+                    if top == terminal or KIND_NAMES[top] == token.value:
+                        if record:
+                            record(~position)
+                        break
+                    if top == end:
+                        return position
                 else:
-                    expected_tokens = list(set(self.parsing_table[top].keys()) - {'$', 'ε'})
-                    error_message = f"Ln {line} Syntax Error: Unexpected token '{token_value}'. Expected one of: {expected_tokens}"
-                    #print(error_message)
-                    error_messages.append(error_message)
-                    return False, error_messages
-            else:
-                error_message = f"Ln {line} Syntax Error: Unexpected token '{token_value}'. Expected: '{top}'"
-                #print(error_message)
-                error_messages.append(error_message)
-                return False, error_messages
-
-        if token_type == 'EOF' and not self.stack:
-            #print("\nSyntax analysis successful!")
-            return True, []
+                    production = table[row + terminal] if terminal < width else 0
+                    if production:
+                        if record:
+                            record(production)
+                        stack.extend(productions[production])
+                        continue
+
+                # Errors raised while still recovering at the same token
+                # are knock-on effects of the one already reported
+                if position != error_at:
+                    error_messages.append(self.error_message(top, token.line, token.value))
+                    error_at = position
+                    if max_errors is not None and len(error_messages) >= max_errors:
+                        return position
+                if top == eof:
+                    # Only trailing tokens are left
+                    return position
+                if row >= 0:
+                    syncing = top
+                    break
+                # A missing terminal is treated as if it had been there
+                if record:
+                    record(0)
+
+            if syncing is None:
+                token = next(tokens, None)
+                position += 1
+
+        if terminal != eof and not error_messages:
+            error_messages.append("Error: Tokens remaining after parsing")
+        return position
+
+    def error_message(self, top, line, value):
+        # Syntax error for a token with value on line reached with top on the stack
+        row = self.rows[top]
+        if row < 0:
+            return f"Ln {line} Syntax Error: Unexpected token '{value}'. Expected: '{KIND_NAMES[top]}'"
+        expected = {KIND_NAMES[kind] for kind in range(self.width) if self.table[row + kind]}
+        expected_tokens = list(expected - {'$', 'ε'})
+        return f"Ln {line} Syntax Error: Unexpected token '{value}'. Expected one of: {expected_tokens}"
+
+    def build_parse_tree(self, derivation, symbol=None):
+        # ParseNode tree for the derivation of symbol (the start symbol by
+        # default) recorded by derive(), with its recovery
+        rows, productions, leaves, missing = self.rows, self.productions, self.leaves, self.missing
+        steps = iter(derivation)
+        root = []
+        nodes = []
+        pending = [(self.start if symbol is None else symbol, root)]  # Symbols still to be replayed, last first
+        while pending:
+            kind, siblings = pending.pop()
+            step = next(steps)
+            if rows[kind] < 0:
+                siblings.append(leaves[kind] if step else missing[kind])
+                continue
+            node = ParseNode(kind, [], 0)
+            siblings.append(node)
+            nodes.append(node)
+            if step <= 0:
+                # Reached on a token it cannot start with
+                node.errors = 1
+                while step < 0:
+                    node.width += 1
+                    step = next(steps)
+            pending.extend((child, node.children) for child in productions[step])
+        # Children come after their parent in nodes
+        for node in reversed(nodes):
+            for child in node.children:
+                node.width += child.width
+                node.errors += child.errors
+        return root[0]
+
+    def tree_errors(self, tree, tokens):
+        # (position, message) of the syntax errors recovered from in a tree
+        # of a TokenBuffer, in the order the parse met them
+        pending = [(tree, 0)]
+        while pending:
+            node, start = pending.pop()
+            own = node.errors
+            position = start + node.width
+            for child in reversed(node.children):
+                position -= child.width
+                if child.errors:
+                    own -= child.errors
+                    pending.append((child, position))
+            if own:
+                yield start, self.error_message(node.kind, tokens.line(start), tokens.value(start))
+
+    def parse_stream(self, fn, text, max_errors=1, derivation=None):
+        # Parse text while it is being lexed. Tokens are pulled from the
+        # scanner one at a time and never collected, so an early syntax or
+        # lexical error stops both passes, and memory does not grow with
+        # the token count. Derivation indices count the tokens run() makes.
+        return self.parse(stream(fn, text), max_errors, derivation)
+
+
+# Built once from the tables cfg loads and shared by every request; its
+# tables are never modified after construction
+parser = LL1Parser(cfg, predict_sets, parsing_table, follow_sets)
+
+
+#RECURSIVE DESCENT
+
+# The same parser compiled by cfggen into one function per non-terminal.
+# It stops at the first error, and falls back to the table-driven parser
+# when blocks or parentheses nest deeper than the recursion limit allows
+try:
+    import cfggen
+    descent = cfggen.load(parser, SKIPPED_KINDS)
+except (ImportError, OSError, SyntaxError):
+    descent = None
+
+
+def descent_parse(tokens):
+    # tokens has to be a list or TokenBuffer, so it can be parsed again
+    if descent is not None:
+        try:
+            return descent.parse(tokens)
+        except RecursionError:
+            pass
+    return parser.parse(tokens)
+
+
+class IncrementalParse:
+    """
+    A program kept lexed and parsed across edits.
+
+    edit() re-lexes only around the change with relex() and then reparses
+    the smallest node of the previous parse tree that encloses the changed
+    tokens, starts on a token before them and, reparsed on its own, ends on
+    the same token as before. Since the grammar is LL(1) and panic-mode
+    recovery only looks at the top of the stack, a full parse would build
+    exactly that subtree there, syntax errors and all, so every other
+    subtree is kept by reference. When no node qualifies the whole program
+    is parsed again.
+
+    The tree is kept while the program has errors, and the messages are
+    rebuilt from it as parse() would report them. tree is only set when
+    the program is valid.
+    """
+    parser = parser
+
+    def __init__(self, fn, text, max_errors=1):
+        self.fn = fn
+        self.max_errors = max_errors
+        self.tokens, self.errors = run(fn, text)
+        self.region = None  # (first token, token count) reparsed by the last edit
+        self.parse_all()
+
+    @property
+    def text(self):
+        return self.tokens.text
+
+    def parse_all(self):
+        self.region = (0, len(self.tokens))
+        derivation = []
+        self.parser.parse(self.tokens, None, derivation)
+        self.root = self.parser.build_parse_tree(derivation)
+        self.report()
+
+    def report(self):
+        # success, messages and tree from the lexical errors or the tree
+        tokens, root, eof = self.tokens, self.root, TOKEN_KIND[TT_EOF]
+        self.tree = None
+        if self.errors:
+            self.success, self.messages = False, [error.as_string() for error in self.errors]
+            return
+        errors = list(self.parser.tree_errors(root, tokens)) if root.errors else []
+        stop = root.width
+        if stop < len(tokens) - 1:
+            # The start symbol ended before the last token
+            if tokens.value(stop) != KIND_NAMES[eof]:
+                errors.append((stop, self.parser.error_message(eof, tokens.line(stop), tokens.value(stop))))
+            elif not errors:
+                # A token spelled like the end matches it as a literal
+                self.success, self.messages = False, ["Error: Tokens remaining after parsing"]
+                return
+        messages = []
+        error_at = -1
+        for position, message in errors:
+            if position != error_at:
+                messages.append(message)
+                error_at = position
+                if len(messages) == self.max_errors:
+                    break
+        self.success, self.messages = not messages, messages
+        if not messages:
+            self.tree = root
+
+    def edit(self, offset, deleted, inserted):
+        """
+        Replace deleted characters at offset with inserted and bring tokens,
+        errors, success, messages and tree up to date.
+        """
+        old = self.tokens
+        self.tokens, self.errors = relex(self.fn, old, self.errors, offset, deleted, inserted)
+        tokens = self.tokens
+
+        # Old tokens [first, old_stop) were replaced by new [first, new_stop);
+        # past them the streams line up again, as in relex
+        old_last, last = len(old) - 1, len(tokens) - 1
+        first = min(bisect_left(old.ends, offset), old_last)
+        delta = len(inserted) - deleted
+        edit_end = offset + len(inserted)
+        new_stop = first
+        while new_stop < last:
+            start = tokens.starts[new_stop]
+            if start >= edit_end:
+                old_stop = bisect_left(old.starts, start - delta, first, old_last)
+                if old_stop < old_last and old.starts[old_stop] == start - delta:
+                    break
+            new_stop += 1
         else:
-            #print("Error: Tokens remaining after parsing")
-            return False, ["Error: Tokens remaining after parsing"]
+            old_stop = old_last
+        grown = new_stop - old_stop
+
+        # Nodes from the root down that start before first and end at or
+        # after old_stop, with their parent, index in it and start
+        rows = self.parser.rows
+        path = []
+        node, start = self.root, 0
+        while True:
+            if node.errors:
+                # Tokens dropped in recovery come before the children
+                start += node.width - sum(child.width for child in node.children)
+            for index, child in enumerate(node.children):
+                if start < first and start + child.width >= old_stop and rows[child.kind] >= 0:
+                    path.append((child, node, index, start))
+                    node = child
+                    break
+                start += child.width
+            else:
+                break
+
+        failed_end = -1
+        for node, parent, index, start in reversed(path):
+            end = start + node.width
+            if end <= failed_end:
+                # A larger node that ends on the same token as one that did
+                # not fit mostly fails the same way, so go further up
+                continue
+            derivation = []
+            stop = self.parser.derive((TokenView(tokens, i) for i in range(start, len(tokens))),
+                                      [self.parser.end, node.kind], start, None, derivation, [])
+            if stop != end + grown:
+                failed_end = end
+                continue
+            replaced = parent.children[index] = self.parser.build_parse_tree(derivation, node.kind)
+            added = replaced.errors - node.errors
+            for ancestor, _, _, _ in path:
+                if ancestor is node:
+                    break
+                ancestor.width += grown
+                ancestor.errors += added
+            self.root.width += grown
+            self.root.errors += added
+            self.region = (start, replaced.width)
+            return self.report()
+        self.parse_all()
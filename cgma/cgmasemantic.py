@@ -1,6 +1,6 @@
-from cgmalexer import Lexer  
+from cgmalexer import KIND_NAMES
 from cfg import cfg, predict_sets  
-from cgmaparser import LL1Parser
+from cgmaparser import parser
 from flask import Flask, request, jsonify  
 from flask_cors import CORS 
 
@@ -15,38 +15,654 @@ class SemanticError(Exception):
 
 
 ##### SEMANTIC ANALYZER #####
+NUMERIC_TYPES = {"chungus", "chudeluxe"}
+DATA_TYPES = {"chungus", "chudeluxe", "forsen", "forsencd", "lwk"}
+ARITHMETIC_OPERATORS = {"+", "-", "*", "/", "%"}
+LOGICAL_OPERATORS = {"&&", "||"}
+RELATIONAL_OPERATORS = {"==": "EQ", "!=": "NEQ", "<": "LT", ">": "GT", "<=": "LTE", ">=": "GTE"}
+NAME_OPERANDS = {"Identifier", "StructMemberAccess", "ListAccess", "TSFunction", "TaperFunction"}
+# Nodes whose first token is always the same
+FIRST_TOKENS = {
+    "Input": "chat", "List": "[", "Append": "append", "Insert": "insert", "Remove": "remove",
+    "InitialValues": "{", "Group": "(", "TypeCast": "(", "SturdyDeclaration": "sturdy",
+    "Continue": "pause",
+}
+
+
+def leftmost(node):
+    """The operand an expression starts with."""
+    while isinstance(node, BinaryOpNode) or node.node_type == "UnaryOp" and not node.prefix:
+        node = node.children[0]
+    return node
+
+
+def first_value(node):
+    """Text of the first token of a node, for the messages about it."""
+    node_type = node.node_type
+    if isinstance(node, BinaryOpNode):
+        return first_value(node.children[0])
+    if node_type in ("Update", "UnaryOp"):
+        return node.value if node.prefix else first_value(node.children[0])
+    if node_type in ("Assignment", "StructMemberAssignment", "StructMemberAccess", "ListAccess",
+                     "TSFunction", "TaperFunction", "FunctionDeclaration", "Parameter", "Struct",
+                     "StructInstance"):
+        return node.children[0].value
+    return FIRST_TOKENS.get(node_type, node.value)
+
+
+def is_condition(node):
+    """Whether an expression is a comparison or a logical one."""
+    if isinstance(node, BinaryOpNode):
+        return node.value in RELATIONAL_OPERATORS or node.value in LOGICAL_OPERATORS
+    return node.node_type == "UnaryOp" and node.value == "!"
+
+
 class SemanticAnalyzer:
+    """
+    Checks the AST build_ast makes of a program, raising a SemanticError for
+    the first problem found, in source order.
+    """
     def __init__(self, symbol_table):
         self.symbol_table = symbol_table
-        self.visited_nodes = set()
+        self.function_type = None  # Return type of the function being checked
+        self.loops = 0  # Loops around the statement being checked
 
     def analyze(self, node):
-        if node in self.visited_nodes:
-            return
-        
-        self.visited_nodes.add(node)
+        for child in node.children:
+            self.global_statement(child)
+
+    ###### DECLARATIONS ######
+    def global_statement(self, node):
+        node_type = node.node_type
+        if node_type == "FunctionDeclaration":
+            self.function(node)
+        elif node_type in ("VariableDeclaration", "VariableDeclarationList"):
+            first = node.children[0] if node_type == "VariableDeclarationList" else node
+            if len(first.children) < 3:
+                raise SemanticError("Syntax Error: Invalid function or variable declaration.", first.line)
+            self.variables(node)
+        elif node_type == "SturdyDeclaration":
+            self.sturdy(node)
+        elif node_type == "Struct":
+            self.struct(node)
+        elif node_type == "StructInstance":
+            raise SemanticError("Syntax Error: Expected '{' to start struct body.", node.line)
+        else:
+            raise SemanticError(f"Semantic Error: Invalid token '{first_value(node)}' used in global statement.", node.line)
+
+    def function(self, node):
+        name = node.value
+        return_type = node.children[0].value
+        if name in self.symbol_table.functions or name in self.symbol_table.variables:
+            raise SemanticError(f"Semantic Error: '{name}' already declared.", node.line)
+
+        self.symbol_table.enter_scope()
+        params = [param for param in node.children[1].children if param.children[0].value in DATA_TYPES]
+        for param in params:
+            error = self.symbol_table.declare_variable(param.children[1].value, param.children[0].value)
+            if error:
+                raise SemanticError(error, param.line)
+        self.symbol_table.declare_function(name, return_type, params)
+
+        if len(node.children) < 3:
+            raise SemanticError("Syntax Error: Function body must be enclosed in curly braces.", node.line)
+        body = node.children[2].children
+        self.function_type = return_type
+        self.statements(body)
+        if (return_type != "nocap" and name != "skibidi"
+                and not any(statement.node_type == "Return" for statement in body)):
+            raise SemanticError(f"Semantic Error: Function '{name}' must return a value of type '{return_type}'.", node.line)
+        self.function_type = None
+        self.symbol_table.exit_scope()
+
+    def variables(self, node):
+        declarations = node.children if node.node_type == "VariableDeclarationList" else [node]
+        for declaration in declarations:
+            self.variable(declaration)
+
+    def variable(self, node):
+        var_type = node.children[0].value
+        var_name = node.children[1].value
+        line = node.line
+
+        global_var = self.symbol_table.variables.get(var_name)
+        if global_var and global_var.get("is_sturdy"):
+            raise SemanticError(f"Semantic Error: Variable '{var_name}' is declared as sturdy and cannot be re-declared.", line)
+        if len(node.children) < 3:
+            raise SemanticError(f"Semantic Error: Variable must be initialized. Missing '=' after '{var_name}'.", line)
 
-        """Recursively analyze AST nodes."""
-        if node.node_type == "VariableDeclaration":
-            var_type = node.children[0].value
-            var_name = node.children[1].value
-            self.symbol_table.declare_variable(var_name, var_type)
+        value = node.children[2]
+        is_list = False
+        if var_type == "forsen" and value.node_type == "TaperFunction":
+            target = value.children[0].value
+            info = self.symbol_table.lookup_variable(target)
+            if isinstance(info, str):
+                raise SemanticError(f"Semantic Error: Variable '{target}' used before declaration.", line)
+            if info["type"] != "forsencd":
+                raise SemanticError(f"Type Error: Cannot use taper function on '{target}'. Must be a forsencd type identifier.", line)
+            is_list = True
+        elif value.node_type == "List":
+            is_list = True
+            for element in value.children:
+                self.expression(element, var_type)
+        elif value.node_type != "Input":
+            self.expression(value, var_type)
+
+        error = self.symbol_table.declare_variable(var_name, var_type, is_list=is_list)
+        if error:
+            raise SemanticError(error, line)
 
+    def sturdy(self, node):
+        var_type = node.children[0].value
+        var_name = node.children[1].value
+        line = node.line
+        if var_type not in DATA_TYPES:
+            raise SemanticError(f"Semantic Error: Invalid sturdy variable type '{var_type}'.", line)
+        if len(node.children) < 3:
+            raise SemanticError("Semantic Error: Sturdy variables must be initialized.", line)
+
+        value = node.children[2]
+        literal = leftmost(value)
+        if literal.node_type != "Literal" or literal.literal_type != var_type:
+            raise SemanticError(f"Type Error: '{var_name}' must be initialized with a {var_type} literal.", line)
+        # A declaration chained after a comma is kept as a fourth child
+        if value is not literal or len(node.children) > 3:
+            raise SemanticError(f"Semantic Error: Sturdy variable '{var_name}' must be assigned only a single literal.", line)
+
+        error = self.symbol_table.declare_variable(var_name, var_type, value=value, is_sturdy=True)
+        if error:
+            raise SemanticError(error, line)
 
-        elif node.node_type == "Assignment":
-            var_name = node.children[0].value
-            
-        elif node.node_type == "FunctionDeclaration":
-            func_name = node.value
-            return_type = node.children[0].value
-            params = node.children[1].children
-            self.symbol_table.declare_function(func_name, return_type, params)
+    def struct(self, node):
+        members = node.children[1:]
+        for member in members:
+            if member.node_type != "Member" or member.value.split()[0] not in DATA_TYPES:
+                raise SemanticError("Semantic Error: Expected valid data type in struct declaration.", member.line)
+            if member.children:
+                default = member.children[0]
+                self.expression(default.children[0], member.value.split()[0])
+                default.value = default.children[0].value
+        self.symbol_table.declare_struct(node.children[0].value, members)
+
+    def struct_instance(self, node):
+        struct_name = node.children[0].value
+        if isinstance(self.symbol_table.lookup_struct(struct_name), str):
+            raise SemanticError(f"Semantic Error: Struct '{struct_name}' is not defined.", node.line)
+        instance_name = node.children[1].value
+        if instance_name:
+            self.symbol_table.declare_variable(instance_name, struct_name, is_struct=True)
+
+    ###### STATEMENTS ######
+    def statements(self, nodes):
+        for node in nodes:
+            self.statement(node)
+
+    def scoped(self, nodes):
+        self.symbol_table.enter_scope()
+        self.statements(nodes)
+        self.symbol_table.exit_scope()
+
+    def statement(self, node):
+        node_type = node.node_type
+        if node_type in ("VariableDeclaration", "VariableDeclarationList"):
+            self.variables(node)
+        elif node_type == "Struct":
+            self.struct(node)
+        elif node_type == "StructInstance":
+            self.struct_instance(node)
+        elif node_type == "Assignment":
+            self.assignment(node)
+        elif node_type == "Update":
+            self.variable_info(node.children[0], node.line)
+        elif node_type == "FunctionCall":
+            self.call(node, self.function_info(node))
+        elif node_type == "UnaryOp":
+            # A postfix operator on a call
+            call = node.children[0]
+            self.call(call, self.function_info(call), incremented=True)
+        elif node_type == "StructMemberAssignment":
+            self.member_assignment(node)
+        elif node_type == "PrintStatement":
+            self.print_statement(node)
+        elif node_type == "IfStatement":
+            self.if_statement(node)
+        elif node_type == "ForLoop":
+            self.for_loop(node)
+        elif node_type == "WhileLoop":
+            self.expression(node.children[0].children[0], "lwk")
+            self.loop(node.children[1].children)
+        elif node_type == "DoWhileLoop":
+            self.symbol_table.enter_scope()
+            self.loops += 1
+            self.statements(node.children[0].children)
+            self.loops -= 1
+            self.expression(node.children[1].children[0], "lwk")
+            self.symbol_table.exit_scope()
+        elif node_type == "Switch":
+            self.switch(node)
+        elif node_type == "Return":
+            self.return_statement(node)
+        elif node_type != "Continue" or not self.loops:
+            raise SemanticError(f"Semantic Error: Unexpected token '{first_value(node)}' in statement.", node.line)
+
+    def loop(self, nodes):
+        self.loops += 1
+        self.scoped(nodes)
+        self.loops -= 1
+
+    def assignment(self, node):
+        var_name = node.children[0].value
+        value = node.children[1]
+        info = self.variable_info(node.children[0], node.line)
+
+        global_var = self.symbol_table.variables.get(var_name)
+        if global_var and global_var.get("is_sturdy"):
+            raise SemanticError(f"Semantic Error: Variable '{var_name}' is declared as sturdy.", value.line)
+        if value.node_type in ("Append", "Insert", "Remove"):
+            if not info["is_list"]:
+                raise SemanticError(f"Semantic Error: Variable '{var_name}' is not a list.", value.line)
+            elements = value.children[1:] if value.node_type == "Insert" else value.children
+            if value.node_type != "Remove":
+                for element in elements:
+                    self.expression(element, info["type"])
+        elif value.node_type != "Input":
+            self.expression(value, info["type"])
+
+    def member_assignment(self, node):
+        instance = node.children[0].value
+        member = node.children[1].value
+        if member is None:
+            raise SemanticError("Syntax Error: Expected struct member name after '.'.", node.line)
+        if len(node.children) < 3:
+            raise SemanticError("Syntax Error: Expected '=' in struct member assignment.", node.line)
+        self.expression(node.children[2], self.member_type(instance, member, node.line))
+
+    def print_statement(self, node):
+        args = node.children
+        line = node.line
+        first = leftmost(args[0])
+        if first.node_type == "Literal" and first.literal_type == "forsencd":
+            placeholders = self.format_string(args[0], line)
+            if placeholders is None:
+                raise SemanticError("Syntax Error: Expected ')' after yap statement.", line)
+        else:
+            placeholders = 0
+            self.print_argument(args[0], line)
+
+        for arg in args[1:]:
+            first = leftmost(arg)
+            if not (first.node_type == "Literal" and first.literal_type in NUMERIC_TYPES
+                    or first.node_type in NAME_OPERANDS or first.node_type == "FunctionCall"):
+                raise SemanticError("Syntax Error: Expected argument after ',' in yap statement.", line)
+            self.print_argument(arg, line)
+
+        if placeholders != len(args) - 1:
+            raise SemanticError(f"Type Error: Expected {placeholders} arguments, but got {len(args) - 1}.", line)
+
+    def format_string(self, node, line):
+        # Placeholders in a yap() format string, concatenated string literals
+        # only; None if another operator follows them
+        parts = list(self.operands(node))
+        placeholders = self.string_literal(parts[0].value, line)
+        for operator, operand in zip(parts[1::2], parts[2::2]):
+            if operator.value != "+":
+                return None
+            if operand.node_type != "Literal" or operand.literal_type != "forsencd":
+                raise SemanticError("Semantic Error: Only string literals can be concatenated in yap().", line)
+            placeholders += self.string_literal(operand.value, line)
+        return placeholders
+
+    def operands(self, node):
+        # Operands and binary operators of an expression as written
+        if isinstance(node, BinaryOpNode):
+            yield from self.operands(node.children[0])
+            yield node
+            yield from self.operands(node.children[1])
+        else:
+            yield node
+
+    def string_literal(self, value, line):
+        raw = value.replace("\\{", "").replace("\\}", "")
+        if "{" in raw or "}" in raw:
+            if raw.count("{") != raw.count("}"):
+                raise SemanticError(f"Semantic Error: Invalid string literal '{value}' in yap().", line)
+            if "{}" not in raw:
+                raise SemanticError("Syntax Error: Placeholders {} must be adjacent within the string literal.", line)
+        return raw.count("{}")
+
+    def print_argument(self, node, line):
+        # Anything printable: the type of an argument is that of its
+        # first operand, unless it is a condition
+        if is_condition(node):
+            self.expression(node, "lwk")
+            return
+        first = leftmost(node)
+        if first.node_type == "FunctionCall":
+            info = self.function_info(first, line)
+            arg_type = info["return_type"]
+            if arg_type not in DATA_TYPES:
+                raise SemanticError(f"Type Error: Function '{first.value}' returns invalid type '{arg_type}'.", line)
+        elif first.node_type == "Literal":
+            arg_type = first.literal_type
+        elif first.node_type in NAME_OPERANDS:
+            arg_type = self.name_type(first, line)
+            if node is first:
+                return
+        else:
+            arg_type = "chungus"
+        self.expression(node, arg_type)
+
+    def return_statement(self, node):
+        function_type = self.function_type
+        line = node.line
+        if function_type == "nocap":
+            if node.children:
+                raise SemanticError("Type Error: nocap function must not return any value.", line)
+            return
+        if not node.children:
+            self.invalid_operand(function_type, "}", line)
+
+        value = node.children[0]
+        first = leftmost(value)
+        if first.node_type == "FunctionCall":
+            return_type = self.function_info(first, line)["return_type"]
+            if return_type != function_type:
+                raise SemanticError(f"Type Error: Function '{first.value}' returns '{return_type}', but expected '{function_type}'.", line)
+        elif first.node_type in NAME_OPERANDS:
+            name = first.children[0].value if first.children else first.value
+            var_type = self.variable_info(ASTNode("Identifier", name), line)["type"]
+            if var_type != function_type:
+                raise SemanticError(f"Type Error: Variable '{name}' is of type '{var_type}', expected '{function_type}'.", line)
+        self.expression(value, function_type)
+
+    def if_statement(self, node):
+        self.expression(node.children[0].children[0], "lwk")
+        self.scoped(node.children[1].children)
+        for branch in node.children[2:]:
+            if branch.node_type == "ElseIfStatement":
+                self.expression(branch.children[0].children[0], "lwk")
+                self.scoped(branch.children[1].children)
+            else:
+                self.scoped(branch.children[0].children)
+
+    def for_loop(self, node):
+        initialization, condition, update, body = node.children
+        line = node.line
+
+        first = initialization.children[0]
+        if first.node_type in ("VariableDeclaration", "VariableDeclarationList"):
+            self.variables(first)
+        elif first.node_type == "Assignment":
+            self.assignment(first)
+        elif first.node_type in ("Unexpected", "FunctionCall", "StructMemberAssignment") or (
+                first.node_type in ("Update", "UnaryOp") and not first.prefix):
+            self.variable_info(ASTNode("Identifier", first_value(first)), line)
+            raise SemanticError("Syntax Error: Expected '=' after for loop identifier.", line)
+        else:
+            raise SemanticError("Syntax Error: Expected ';' after for loop initialization.", line)
+        if len(initialization.children) > 1:
+            raise SemanticError("Syntax Error: Expected ';' after for loop initialization.", line)
 
-        elif node.node_type == "FunctionCall":
-            func_name = node.value
+        self.expression(condition.children[0], "lwk")
 
-        for child in node.children:
-            self.analyze(child)
+        first = update.children[0]
+        if first.node_type == "Update":
+            self.variable_info(first.children[0], line)
+            if len(update.children) > 1:
+                raise SemanticError("Syntax Error: Expected ')' after for loop update.", line)
+        else:
+            self.variable_info(ASTNode("Identifier", first_value(first)), line)
+            raise SemanticError("Semantic Error: Invalid update statement.", line)
+
+        self.loop(body.children)
+
+    def switch(self, node):
+        self.expression(node.children[0], "chungus")
+        self.symbol_table.enter_scope()
+        for case in node.children[1:-1]:
+            self.statements(case.children[1].children)
+        self.statements(node.children[-1].children[0].children)
+        self.symbol_table.exit_scope()
+
+    ###### EXPRESSIONS ######
+    def expression(self, node, expected):
+        """Check an expression where a value of type expected is needed."""
+        if expected in NUMERIC_TYPES:
+            self.numeric(node)
+        elif expected == "forsen":
+            self.forsen(node)
+        elif expected == "forsencd":
+            self.forsencd(node)
+        elif expected == "lwk":
+            self.condition(node)
+        else:
+            raise SemanticError("Type Error: Invalid type for assignment.", node.line)
+
+    def invalid_operand(self, expected, value, line):
+        if expected == "forsen":
+            raise SemanticError("Type Error: forsen can only be assigned with identifier of type forsen or a forsen literal.", line)
+        if expected == "forsencd":
+            raise SemanticError("Type Error: forsencd can only be assigned a FORSENCD_LIT or an identifier of type forsen/forsencd.", line)
+        if expected == "lwk":
+            raise SemanticError(f"Type Error: Expected valid operand, got '{value}'.", line)
+        if expected in NUMERIC_TYPES:
+            raise SemanticError(f"Semantic Error: Invalid factor '{value}' in expression.", line)
+        raise SemanticError("Type Error: Invalid type for assignment.", line)
+
+    def numeric(self, node):
+        node_type = node.node_type
+        if isinstance(node, BinaryOpNode):
+            left, right = node.children
+            self.numeric(left)
+            if node.value not in ARITHMETIC_OPERATORS:
+                raise SemanticError(f"Semantic Error: Invalid factor '{node.value}' in expression.", node.line)
+            self.numeric(right)
+            while right.node_type == "Group":
+                right = right.children[0]
+            if (node.value in ("/", "%") and right.node_type == "Literal"
+                    and right.literal_type in NUMERIC_TYPES and float(right.value) == 0):
+                raise SemanticError("Semantic Error: Division or modulus by zero is undefined.", node.line)
+        elif node_type == "Literal":
+            if node.literal_type not in NUMERIC_TYPES:
+                raise SemanticError(f"Semantic Error: Invalid factor '{node.value}' in expression.", node.line)
+        elif node_type == "UnaryOp":
+            operand = node.children[0]
+            if node.prefix or operand.node_type != "FunctionCall":
+                self.numeric(operand)
+            else:
+                self.typed_call(operand, NUMERIC_TYPES, "Type Error: Cannot use function '{}' of type {} in this expression.", True)
+        elif node_type in ("Group", "TypeCast"):
+            self.numeric(node.children[-1])
+        else:
+            self.typed_operand(node, "chungus", NUMERIC_TYPES, "Type Error: Cannot use '{}' of type {} in this expression.",
+                               "Type Error: Cannot use function '{}' of type {} in this expression.")
+
+    def forsen(self, node):
+        if isinstance(node, BinaryOpNode):
+            self.forsen(node.children[0])
+            raise SemanticError(f"Semantic Error: Invalid factor '{node.value}' in expression.", node.line)
+        if node.node_type == "Literal":
+            if node.literal_type != "forsen":
+                self.invalid_operand("forsen", node.value, node.line)
+        else:
+            self.typed_operand(node, "forsen", {"forsen"}, "Type Error: Cannot use '{}' of type {} in forsen expression.",
+                               "Type Error: Cannot use function '{}' of type {} in this expression.")
+
+    def forsencd(self, node):
+        if isinstance(node, BinaryOpNode):
+            self.forsencd(node.children[0])
+            if node.value != "+":
+                raise SemanticError(f"Semantic Error: Invalid factor '{node.value}' in expression.", node.line)
+            self.forsencd(node.children[1])
+        elif node.node_type == "Literal":
+            if node.literal_type != "forsencd":
+                self.invalid_operand("forsencd", node.value, node.line)
+        else:
+            self.typed_operand(node, "forsencd", {"forsen", "forsencd"}, "Type Error: Cannot use '{}' of type {} in this expression.",
+                               "Type Error: Cannot use function '{}' of type '{}' in this expression.")
+
+    def typed_operand(self, node, expected, allowed, message, call_message):
+        # A name or call operand where a value of type expected is needed,
+        # one of the types allowed; message and call_message take the name
+        # and its type
+        node_type = node.node_type
+        if node_type == "FunctionCall" or (node_type == "UnaryOp" and not node.prefix
+                                           and node.children[0].node_type == "FunctionCall"):
+            call = node.children[0] if node_type == "UnaryOp" else node
+            self.typed_call(call, allowed, call_message, node_type == "UnaryOp")
+        elif node_type == "Identifier":
+            var_type = self.variable_info(node, node.line)["type"]
+            if var_type not in allowed:
+                raise SemanticError(message.format(node.value, var_type), node.line)
+        elif node_type == "StructMemberAccess":
+            instance, member = node.children[0].value, node.children[1].value
+            member_type = self.member_type(instance, member, node.line)
+            if member_type not in allowed:
+                raise SemanticError(message.format(f"{instance}.{member}", member_type), node.line)
+        elif node_type == "ListAccess":
+            element_type = self.list_access(node)
+            if element_type not in allowed:
+                raise SemanticError(message.format(node.children[0].value, element_type), node.line)
+        elif node_type == "TSFunction" and expected == "chungus":
+            self.ts(node)
+        else:
+            self.invalid_operand(expected, first_value(node), node.line)
+
+    def typed_call(self, node, allowed, message, incremented=False):
+        info = self.function_info(node)
+        if info["return_type"] not in allowed:
+            raise SemanticError(message.format(node.value, info["return_type"]), node.line)
+        self.call(node, info, incremented)
+
+    def condition(self, node):
+        if isinstance(node, BinaryOpNode) and node.value in LOGICAL_OPERATORS:
+            self.condition(node.children[0])
+            self.condition(node.children[1])
+        elif isinstance(node, BinaryOpNode) and node.value in RELATIONAL_OPERATORS:
+            self.comparison(node)
+        elif node.node_type == "UnaryOp" and node.value == "!":
+            operand_type = self.operand_type(node.children[0])
+            if operand_type != "lwk":
+                raise SemanticError(f"Type Error: Cannot apply '!' to type '{operand_type}'.", node.line)
+        elif self.operand_type(node) != "lwk":
+            raise SemanticError(f"Semantic Error: Expected relational operator after {first_value(node)}.", node.line)
+
+    def comparison(self, node):
+        left, right = node.children
+        if isinstance(left, BinaryOpNode) and left.value in RELATIONAL_OPERATORS:
+            # a < b < c: the first comparison, then the operator after it
+            while isinstance(left.children[0], BinaryOpNode) and left.children[0].value in RELATIONAL_OPERATORS:
+                left = left.children[0]
+            self.operand_type(left.children[0])
+            self.operand_type(left.children[1])
+            raise SemanticError("Semantic Error: Cannot chain multiple relational operators.", left.line)
+
+        left_type = self.operand_type(left)
+        operator = RELATIONAL_OPERATORS[node.value]
+        right_type = self.operand_type(right)
+        line = node.line
+        if left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES:
+            return
+        if left_type != right_type:
+            raise SemanticError(f"Type Error: Cannot compare '{left_type}' with '{right_type}'.", line)
+        if left_type in ("forsen", "forsencd", "lwk"):
+            if operator not in ("EQ", "NEQ"):
+                raise SemanticError(f"Semantic Error: Invalid operator '{operator}' for {left_type} type.", line)
+        else:
+            raise SemanticError(f"Type Error: Unsupported type '{left_type}' in relational expression.", line)
+
+    def operand_type(self, node):
+        # Type of an operand of a comparison or a logical operator
+        node_type = node.node_type
+        if node_type == "Literal":
+            return node.literal_type
+        if node_type == "Group":
+            inner = node.children[0]
+            if is_condition(inner):
+                self.condition(inner)
+                return "lwk"
+            return self.operand_type(inner)
+        if is_condition(node):
+            self.condition(node)
+            return "lwk"
+        if node_type == "FunctionCall" or node_type == "UnaryOp" and not node.prefix and node.children[0].node_type == "FunctionCall":
+            call = node if node_type == "FunctionCall" else node.children[0]
+            info = self.symbol_table.lookup_function(call.value)
+            if isinstance(info, str):
+                raise SemanticError(f"Semantic Error: Function '{call.value}' used before declaration.", call.line)
+            self.call(call, info, node_type == "UnaryOp")
+            return info["return_type"]
+        if isinstance(node, BinaryOpNode) or node_type in ("UnaryOp", "TypeCast"):
+            self.numeric(node)
+            return "chungus"
+        if node_type in NAME_OPERANDS:
+            return self.name_type(node, node.line)
+        self.invalid_operand("lwk", first_value(node), node.line)
+
+    def name_type(self, node, line):
+        # Type of a variable, struct member, list element or ts() operand
+        node_type = node.node_type
+        if node_type == "StructMemberAccess":
+            return self.member_type(node.children[0].value, node.children[1].value, line)
+        if node_type == "ListAccess":
+            return self.list_access(node)
+        if node_type == "TSFunction":
+            self.ts(node)
+            return "chungus"
+        if node_type == "TaperFunction":
+            self.variable_info(node.children[0], line)
+            return "forsen"
+        return self.variable_info(node, line)["type"]
+
+    ###### NAMES ######
+    def variable_info(self, node, line):
+        info = self.symbol_table.lookup_variable(node.value)
+        if isinstance(info, str):
+            raise SemanticError(f"Semantic Error: Variable '{node.value}' used before declaration.", line)
+        return info
+
+    def function_info(self, node, line=None):
+        info = self.symbol_table.lookup_function(node.value)
+        if isinstance(info, str):
+            raise SemanticError(info, line or node.line)
+        return info
+
+    def call(self, node, info, incremented=False):
+        name = node.value
+        params = info["params"]
+        for position, arg in enumerate(node.children):
+            if position >= len(params):
+                raise SemanticError(f"Type Error: Too many arguments in function call '{name}'.", node.line)
+            self.expression(arg, params[position].children[0].value)
+        if incremented:
+            raise SemanticError("Type Error: Unary operators cannot be applied to function calls.", node.line)
+        if len(node.children) != len(params):
+            raise SemanticError(f"Type Error: Function '{name}' expects {len(params)} arguments, but {len(node.children)} were provided.", node.line)
+
+    def member_type(self, instance, member, line):
+        info = self.symbol_table.lookup_variable(instance)
+        if isinstance(info, str):
+            raise SemanticError(f"Semantic Error: Struct instance '{instance}' is not declared.", line)
+        struct = self.symbol_table.lookup_struct(info["type"])
+        if isinstance(struct, str) or member not in struct:
+            raise SemanticError(f"Semantic Error: Struct '{info['type']}' has no member '{member}'.", line)
+        return struct[member]["type"]
+
+    def list_access(self, node):
+        # Element type of a list access, after checking its index
+        name = node.children[0].value
+        info = self.symbol_table.lookup_variable(name)
+        if isinstance(info, str):
+            raise SemanticError(f"Semantic Error: List '{name}' used before declaration.", node.line)
+        if not info["is_list"]:
+            raise SemanticError(f"Type Error: '{name}' is not a list.", node.line)
+        self.numeric(node.children[1].children[0])
+        return info["type"]
+
+    def ts(self, node):
+        info = self.variable_info(node.children[0], node.line)
+        if not info["is_list"] and info["type"] != "forsencd":
+            raise SemanticError(f"Type Error: ts() can only be used on lists or strings, but '{node.children[0].value}' is of type {info['type']}.", node.line)
 
 
 ##### AST NODES #####
@@ -82,6 +698,11 @@ class VariableDeclarationNode(ASTNode):
         if value:
             self.add_child(value)
 
+class LiteralNode(ASTNode):
+    def __init__(self, literal_type, value, line=None):
+        super().__init__("Literal", value, line=line)
+        self.literal_type = literal_type
+
 class AssignmentNode(ASTNode):
     def __init__(self, var_name, value, line=None):
         super().__init__("Assignment", line=line)
@@ -134,8 +755,9 @@ class PrintNode(ASTNode):
             self.add_child(arg)
 
 class UnaryOpNode(ASTNode):
-    def __init__(self, operator, operand):
-        super().__init__("UnaryOp", operator)
+    def __init__(self, operator, operand, prefix=True, line=None):
+        super().__init__("UnaryOp", operator, line=line)
+        self.prefix = prefix
         self.add_child(operand)
 
 class SturdyDeclarationNode(ASTNode):
@@ -143,7 +765,8 @@ class SturdyDeclarationNode(ASTNode):
         super().__init__("SturdyDeclaration", line=line)
         self.add_child(ASTNode("Type", var_type, line=line))
         self.add_child(ASTNode("Identifier", var_name, line=line))
-        self.add_child(value)
+        if value:
+            self.add_child(value)
 
 class ReturnNode(ASTNode):
     def __init__(self, return_value=None, line=None):
@@ -153,7 +776,7 @@ class ReturnNode(ASTNode):
 
 class UpdateNode(ASTNode):
     def __init__(self, operator, operand, prefix = True, line=None):
-        super().__init__("Update", line=line)
+        super().__init__("Update", operator, line=line)
         self.prefix = prefix
         self.add_child(operand)
 
@@ -242,10 +865,8 @@ class StructMemberAssignmentNode(ASTNode):
         self.add_child(ASTNode("StructInstance", struct_instance, line=line))
         self.add_child(ASTNode("Member", member_name, line=line))
 
-        if isinstance(value_node, ASTNode) and value_node.node_type in {"Value", "BinaryOp"}:
+        if value_node:
             self.add_child(value_node)
-            
-            self.add_child(ASTNode("Value", value_node, line=line))
 
 class StructMemberAccessNode(ASTNode):
     def __init__(self, struct_instance, member_name, member_type, line=None):
@@ -361,813 +982,690 @@ class SymbolTable:
         print("================================\n")
 
 
-symbol_table = SymbolTable()
-semantic_analyzer = SemanticAnalyzer(symbol_table)
-
 #######################
 ###### BUILD AST ######
 #######################
 
-def build_ast(tokens):
-    """Constructs an AST from the token list after LL(1) parsing."""
-    root = ProgramNode()
-    symbol_table.variables = {}  # Stores variables
-    symbol_table.functions = {}  # Stores function definitions
-    symbol_table.scopes = [{}] 
-    index = 0
-    
-    while index < len(tokens):
-        token = tokens[index]
-        
-        if token.value in {"chungus", "chudeluxe", "forsen", "forsencd", "lwk"}:
-            node, index = parse_functionOrVariable(tokens, index)
-
-            if node:
-                root.add_child(node)
-
-        elif token.value == "nocap":
-            index += 1
-            if tokens[index].type == "IDENTIFIER":
-                func_name = tokens[index].value
-                func_type = "nocap"
-                node, index = parse_function(tokens, index, func_name, func_type)
+# Binding strength of the binary operators, all left-associative
+PRECEDENCE = {
+    "||": 1, "&&": 2,
+    "==": 3, "!=": 3, "<": 3, ">": 3, "<=": 3, ">=": 3,
+    "+": 4, "-": 4, "*": 5, "/": 5, "%": 5,
+}
+
+
+def build_ast(derivation, tokens):
+    """
+    Build the AST of a program from the derivation LL1Parser.parse recorded
+    for it, which has to have parsed without errors. The tree keeps what was
+    written, right or wrong, for SemanticAnalyzer to check: syntax the
+    grammar allows but no statement can use is kept as an "Unexpected" node
+    after the statement, or an "Invalid" one in place of an operand.
+    """
+    return ASTBuilder(derivation, tokens).program()
+
+
+class Name:
+    # An <identifier> as written: its IDENTIFIER token, the one of its
+    # <struct_id> if any, and the node its <identifier_postfix> makes of it
+    # with the first token of that postfix and, for a struct member, the
+    # member token and whether more suffixes follow it
+    def __init__(self, token):
+        self.token = token
+        self.second = None
+        self.postfix = None
+        self.after = None
+        self.member = None
+        self.chained = False
+
+    @property
+    def plain(self):
+        return self.second is None and self.postfix is None
+
+
+class ASTBuilder:
+    # Reads a derivation front to back the way a recursive-descent parser
+    # reads tokens: expand() takes the next production, as the symbol names
+    # it derives, and match() the token of the next matched terminal.
+    # Right-recursive lists are read in loops.
+    def __init__(self, derivation, tokens):
+        self.steps = iter(derivation)
+        self.tokens = tokens
+        self.productions = [tuple(KIND_NAMES[kind] for kind in reversed(production))
+                            for production in parser.productions]
+
+    def expand(self):
+        return self.productions[next(self.steps)]
+
+    def match(self):
+        return self.tokens[~next(self.steps)]
+
+    def unexpected(self, token, value=None):
+        return ASTNode("Unexpected", token.value if value is None else value, line=token.line)
+
+    def nl(self):
+        self.expand()
+        self.match()
+        while self.expand():
+            self.match()
+
+    ###### DECLARATIONS ######
+    def program(self):
+        root = ProgramNode()
+        self.expand()
+        while True:
+            symbols = self.expand()  # <start>
+            if symbols[0] == "chungus":
+                type_token = self.match()
+                if self.expand()[0] == "skibidi":
+                    root.add_child(self.main(type_token))
+                    return root
+                nodes = self.global_data(type_token)
             else:
-                raise SemanticError(f"Semantic Error: Invalid function declaration.", token.line)
-            
-            if node:
-                root.add_child(node)
-            
-
-        elif token.value == "sturdy":
-            node, index = parse_sturdy(tokens, index)
-            if node:
-                root.add_child(node)
-
-        elif token.value == "aura":
-            node, index = parse_struct(tokens, index)
-            if node:
+                nodes = self.global_declaration()
+            for node in nodes:
                 root.add_child(node)
-
-        elif token.value == "IDENTIFIER":
-            if isinstance(symbol_table.lookup_variable(token.value), str):
-                raise SemanticError(f"Semantic Error: Variable '{token.value}' used before declaration.", token.line)
-            raise SemanticError(f"Semantic Error: Invalid global statement.", token.line)
-
-        else:
-            if token.value not in {"EOF"}:
-                raise SemanticError(f"Semantic Error: Invalid token '{token.value}' used in global statement.", token.line)
-            break
-    
-    return root
-
-def parse_functionOrVariable(tokens, index):
-    id_type = tokens[index].value
-    line = tokens[index].line
-
-    if tokens[index + 1].type == "IDENTIFIER" or tokens[index + 1].value == "skibidi":
-        id_name = tokens[index + 1].value
-        index += 2
-    
-        if tokens[index].type == "OPPAR":
-            node, index = parse_function(tokens, index, id_name, id_type)
-        
-        elif tokens[index].type == "IS":
-            node, index = parse_variable(tokens, index, id_name, id_type) 
-        
+            self.nl()
+
+    def main(self, type_token):
+        name = self.match()
+        self.match()
+        self.match()
+        self.match()
+        self.nl()
+        block = ASTNode("Block", line=name.line)
+        self.body(block)
+        back = self.match()
+        zero = self.match()
+        block.add_child(ReturnNode(LiteralNode(infer_literal_type(zero.type), zero.value, line=zero.line), line=back.line))
+        self.nl()
+        self.match()
+        function = FunctionDeclarationNode(type_token.value, name.value, ASTNode("Parameters", line=name.line), line=name.line)
+        function.add_child(block)
+        return function
+
+    def global_declaration(self):
+        symbols = self.expand()
+        if symbols[0] == "<constant_var>":
+            return [self.constant_var()]
+        if symbols[0] == "<id1>":
+            return self.id1()
+        self.expand()
+        return self.global_data(self.match())
+
+    def global_data(self, type_token):
+        # Functions, global variables and structs
+        name = self.identifier()
+        kind = type_token.value
+        pairs, block = self.declaration_tail(name, members=kind == "aura" and name.plain)
+        if kind == "aura":
+            return self.struct(name, pairs, block)
+        if kind == "nocap" or isinstance(name.postfix, FunctionCallNode) and name.second is None:
+            params = ASTNode("Parameters", line=name.token.line)
+            if isinstance(name.postfix, FunctionCallNode):
+                for param in name.postfix.children:
+                    if param.node_type == "Parameter":
+                        params.add_child(param)
+            function = FunctionDeclarationNode(kind, name.token.value, params, line=name.token.line)
+            if block:
+                function.add_child(block)
+            return [function]
+        return self.variables(type_token, name, pairs)
+
+    def local_data(self, type_token, name, pairs, block):
+        if type_token.value == "aura":
+            return self.struct(name, pairs, block)
+        if type_token.value == "nocap":
+            return [FunctionDeclarationNode("nocap", name.token.value, ASTNode("Parameters"), line=type_token.line)]
+        return self.variables(type_token, name, pairs)
+
+    def variables(self, type_token, name, pairs):
+        # A declaration without '=', or with a name other than a plain one,
+        # has no value and ends the list
+        kind = type_token.value
+        if not name.plain or pairs is None:
+            return [VariableDeclarationNode(kind, name.token.value, line=name.token.line)]
+        declarations = []
+        for name, value in pairs:
+            if not name.plain:
+                declarations.append(VariableDeclarationNode(kind, name.token.value, line=name.token.line))
+                break
+            declarations.append(VariableDeclarationNode(kind, name.token.value, value, line=name.token.line))
+        if len(declarations) == 1:
+            return declarations
+        declaration_list = ASTNode("VariableDeclarationList", line=name.token.line)
+        for declaration in declarations:
+            declaration_list.add_child(declaration)
+        return [declaration_list]
+
+    def struct(self, name, pairs, block):
+        line = name.token.line
+        if name.plain and block:
+            return [StructNode(name.token.value, block, line=line)]
+        nodes = [StructInstanceNode(name.token.value, name.second.value if name.second else None, line=line)]
+        if name.postfix is not None:
+            nodes.append(self.unexpected(name.after))
+        elif pairs is not None:
+            nodes.append(self.unexpected(name.token, "="))
+        elif block is not None:
+            nodes.append(self.unexpected(name.token, "{"))
+        return nodes
+
+    def constant_var(self):
+        self.expand()
+        token = self.match()
+        type_token, name = self.data_id()
+        pairs = self.initializations(name)
+        node = SturdyDeclarationNode(type_token.value, name.token.value, pairs[0][1] if name.plain else None, line=token.line)
+        if name.plain and len(pairs) > 1:
+            node.add_child(self.unexpected(token, ","))
+        return node
+
+    def data_id(self):
+        self.expand()
+        if self.expand()[0] == "<gldata_type>":
+            self.expand()
+        return self.match(), self.identifier()
+
+    def declaration_tail(self, name, members=False):
+        # (pairs of initializations, block) of a <declaration_tail>
+        symbols = self.expand()
+        if not symbols:
+            return None, None
+        if symbols[0] == "<var_initialization>":
+            return self.initializations(name), None
+        token = self.match()
+        self.nl()
+        if members:
+            block = self.members()
         else:
-            error = f"Syntax Error: Invalid function or variable declaration."
-            raise SemanticError(error, line)
-        
-        node.line = line
-        return node, index
-    
-    return None, index
-
-def parse_function(tokens, index, func_name, func_type):
-
-    if func_name in symbol_table.functions:
-        error = f"Semantic Error: '{func_name}' already declared."
-        raise SemanticError(error, tokens[index].line)
-    
-    elif func_name in symbol_table.variables:
-        error = f"Semantic Error: '{func_name}' already declared."
-        raise SemanticError(error, tokens[index].line)
-
-    params_node = ASTNode("Parameters")
-    line = tokens[index].line
-    symbol_table.enter_scope()
-    while tokens[index].type != "CLPAR":
-        if tokens[index].value in {"chungus", "chudeluxe", "forsen", "forsencd", "lwk"}:
-            param_type = tokens[index].value
-            index += 1
-            if tokens[index].type == "IDENTIFIER":
-                param_name = tokens[index].value
-                param_node = ASTNode("Parameter")
-                param_node.add_child(ASTNode("Type", param_type))
-                param_node.add_child(ASTNode("Identifier", param_name))
-                params_node.add_child(param_node)
-                error = symbol_table.declare_variable(param_name, param_type)
-                if error:
-                    raise SemanticError(error, line)
-                index += 1
-
-                if tokens[index].type == "COMMA":
-                    index += 1
-
+            block = ASTNode("Block", line=token.line)
+            self.body(block)
+        self.match()
+        return None, block
+
+    def initializations(self, name):
+        # (name, value) pairs of a <var_initialization> and those chained to
+        # it by commas
+        pairs = []
+        while True:
+            self.expand()
+            self.match()
+            pairs.append((name, self.value()))
+            if not self.expand():
+                return pairs
+            self.match()
+            name = self.identifier()
+
+    def members(self):
+        # Body of a struct: a Member per declaration, and any other
+        # statement as it is
+        members = []
+        while True:
+            symbols = self.expand()
+            if not symbols:
+                return members
+            if symbols[0] == "back":
+                members.append(self.return_statement())
+                return members
+            if symbols[0] != "<declaration>":
+                members.extend(self.statement())
+                self.nl()
+                continue
+            symbols = self.expand()
+            if symbols[0] == "<constant_var>":
+                members.append(self.constant_var())
+            elif symbols[0] == "<id1>":
+                members.extend(self.id1())
             else:
-                error = f"Syntax Error: Invalid parameter declaration."
-                raise SemanticError(error, line)
-        
-        else:
-            index += 1
-            
-    symbol_table.declare_function(func_name, func_type, params_node.children)
-    index += 1
-    func_node = FunctionDeclarationNode(func_type, func_name, params_node)
-
-    if tokens[index].type == "OPCUR":
-        index += 1
-        block_node = ASTNode("Block")
-        return_found = False
-        
-        while tokens[index].type != "CLCUR":
-            stmt, index = parse_statement(tokens, index, func_type)
-            if stmt:
-                block_node.add_child(stmt)
-                if isinstance(stmt, ReturnNode):
-                    return_found = True
-        
-        if (func_type != "nocap" and not return_found) and func_name != "skibidi":
-            raise SemanticError(f"Semantic Error: Function '{func_name}' must return a value of type '{func_type}'.", line)
-
-        index += 1
-        func_node.add_child(block_node)
-        symbol_table.exit_scope()
-    else:
-        error = f"Syntax Error: Function body must be enclosed in curly braces."
-        raise SemanticError(error, line)
-
-    return func_node, index
-
-def parse_variable(tokens, index, var_name, var_type):
-    line = tokens[index].line
-    var_nodes = []
-
-    while True:
-        global_var = symbol_table.variables.get(var_name)
-        if global_var and global_var.get("is_sturdy"):
-            raise SemanticError(f"Semantic Error: Variable '{var_name}' is declared as sturdy and cannot be re-declared.", line)
-
-        is_list = False
-
-        var_node = VariableDeclarationNode(var_type, var_name, line=line)
-
-        if tokens[index].type == "IS":
-            index += 1
-
-            if (
-                var_type == "forsen" and
-                tokens[index].type == "IDENTIFIER" and
-                tokens[index + 1].type == "DOT" and
-                tokens[index + 2].value == "taper"
-            ):
-                identifier = tokens[index].value
-
-                identifier_info = symbol_table.lookup_variable(identifier)
-                if isinstance(identifier_info, str):
-                    raise SemanticError(f"Semantic Error: Variable '{identifier}' used before declaration.", line)
-
-                if identifier_info["type"] != "forsencd":
-                    raise SemanticError(f"Type Error: Cannot use taper function on '{identifier}'. Must be a forsencd type identifier.", line)
-
-                index += 5
-                is_list = True
-                taper_node = TaperNode(identifier, line=line)
-                var_node.add_child(taper_node)
-
-
-            elif tokens[index].value == "chat":
-                index += 1
-                if tokens[index].type == "OPPAR":
-                    index += 1
-                    if tokens[index].type != "CLPAR":
-                        raise SemanticError(f"Semantic Error: chat() should not have parameters.", line)
-                    index += 1
-                    value_node = ASTNode("Input", "chat()", line=line)
-                else:
-                    raise SemanticError(f"Syntax Error: Expected () after chat.", line)
-
-                var_node.add_child(value_node)
-
-            elif tokens[index].type == "OPBRA":
-                is_list = True
-                value_node, index = parse_list(tokens, index, var_type)
-                var_node.add_child(value_node)
-
+                type_token, name = self.data_id()
+                pairs, block = self.declaration_tail(name)
+                member = ASTNode("Member", f"{type_token.value} {name.token.value}", line=type_token.line)
+                members.append(member)
+                if pairs is not None and name.plain:
+                    default = ASTNode("DefaultValue", line=type_token.line)
+                    default.add_child(pairs[0][1])
+                    member.add_child(default)
+                if name.second is not None:
+                    members.append(self.unexpected(name.second))
+                elif name.postfix is not None:
+                    members.append(self.unexpected(name.after))
+                elif block is not None:
+                    members.append(self.unexpected(type_token, "{"))
+                elif pairs is not None and len(pairs) > 1:
+                    members.append(self.unexpected(type_token, ","))
+            self.nl()
+
+    ###### STATEMENTS ######
+    def body(self, block):
+        # Statements of a <body> or <body_main>, added to block
+        while True:
+            symbols = self.expand()
+            if not symbols:
+                return
+            if symbols[0] == "back":
+                block.add_child(self.return_statement())
+                return
+            if symbols[0] == "<declaration>":
+                nodes = self.declaration()
             else:
-                value_node, index = parse_expression_type(tokens, index, var_type)
-                var_node.add_child(value_node)
-   
+                nodes = self.statement()
+            for node in nodes:
+                block.add_child(node)
+            self.nl()
+
+    def return_statement(self):
+        token = self.match()
+        value = self.expression() if self.expand() else None
+        self.nl()
+        return ReturnNode(value, line=token.line)
+
+    def declaration(self):
+        symbols = self.expand()
+        if symbols[0] == "<constant_var>":
+            return [self.constant_var()]
+        if symbols[0] == "<id1>":
+            return self.id1()
+        type_token, name = self.data_id()
+        pairs, block = self.declaration_tail(name, members=type_token.value == "aura" and name.plain)
+        return self.local_data(type_token, name, pairs, block)
+
+    def id1(self):
+        if self.expand()[0] == "<prepost_operator>":
+            operator = self.prepost_operator()
+            name = self.identifier()
+            nodes = [UpdateNode(operator.value, ASTNode("Identifier", name.token.value, line=name.token.line),
+                                prefix=True, line=operator.line)]
+            if name.second is not None:
+                nodes.append(self.unexpected(name.second))
+            elif name.postfix is not None:
+                nodes.append(self.unexpected(name.after))
+            return nodes
+
+        name = self.identifier()
+        operator = pairs = None
+        if self.expand()[0] == "<post_operand>":
+            operator = self.post_operand()
         else:
-            raise SemanticError(f"Semantic Error: Variable must be initialized. Missing '=' after '{var_name}'.", line)
-
-        error = symbol_table.declare_variable(var_name, var_type, is_list = is_list)
-
-        if isinstance(error, str):
-            raise SemanticError(error, line)
-        
-        var_nodes.append(var_node)
-
-        if tokens[index].type == "COMMA":
-            index += 1
-            var_name = tokens[index].value
-            index += 1
+            pairs = self.initializations(name)
+        line = name.token.line
+        tail = [self.unexpected(name.token, ",")] if pairs and len(pairs) > 1 else []
+
+        postfix = name.postfix
+        if name.second is not None or isinstance(postfix, ListAccessNode):
+            return [self.unexpected(name.token)]
+        if isinstance(postfix, FunctionCallNode):
+            if operator:
+                return [UnaryOpNode(operator.value, postfix, prefix=False, line=operator.line)]
+            return [postfix, self.unexpected(name.token, "=")] if pairs else [postfix]
+        if postfix is not None:
+            # A struct member, or ts() or taper() with no member name
+            member = None if name.member is None else name.member.value
+            value = pairs[0][1] if pairs and not name.chained else None
+            return [StructMemberAssignmentNode(name.token.value, member, value, line=line)] + tail
+        if operator:
+            return [UpdateNode(operator.value, ASTNode("Identifier", name.token.value, line=line), prefix=False, line=line)]
+        if pairs:
+            return [AssignmentNode(name.token.value, pairs[0][1], line=line)] + tail
+        return [self.unexpected(name.token)]
+
+    def statement(self):
+        symbols = self.expand()
+        keyword = symbols[0]
+        if keyword == "<if_statement>":
+            return [self.if_statement()]
+        token = self.match()
+        line = token.line
+        if keyword == "pause":
+            return [ContinueNode(line=line)]
+
+        if keyword == "yap":
+            self.match()
+            self.expand()
+            args = [self.expression()]
+            while self.expand():
+                self.match()
+                args.append(self.expression())
+            self.match()
+            return [PrintNode(args, line=line)]
+
+        if keyword == "lethimcook":
+            self.match()
+            expression = self.name_operand(self.identifier())
+            self.match()
+            self.match()
+            self.nl()
+            return [self.switch(expression, line)]
+
+        if keyword == "plug":
+            self.match()
+            initialization = ASTNode("Initialization", line=line)
+            if self.expand()[0] == "<data_id>":
+                type_token, name = self.data_id()
+                nodes = self.local_data(type_token, name, self.initializations(name), None)
+            else:
+                nodes = self.id1()
+            for node in nodes:
+                initialization.add_child(node)
+            self.match()
+            condition = self.condition_node(self.expression())
+            self.match()
+            update = ASTNode("Increment", line=line)
+            for node in self.id1():
+                update.add_child(node)
+            self.match()
+            loop = ForLoopNode(initialization, condition, update, line=line)
+            loop.add_child(self.block(self.match()))
+            return [loop]
+
+        if keyword == "lil":
+            loop = DoWhileLoopNode(None, line=line)
+            loop.add_child(self.block(self.match()))
+            self.match()
+            loop.add_child(self.condition())
+            return [loop]
+
+        # jit
+        loop = WhileLoopNode(self.condition(), line=line)
+        loop.add_child(self.block(self.match()))
+        return [loop]
+
+    def condition(self):
+        # ( <expression> )
+        self.match()
+        node = self.condition_node(self.expression())
+        self.match()
+        return node
+
+    def condition_node(self, expression):
+        node = ASTNode("Condition", line=expression.line)
+        node.add_child(expression)
+        return node
+
+    def block(self, token):
+        # <nl> <body> } after the '{' token
+        block = ASTNode("Block", line=token.line)
+        self.nl()
+        self.body(block)
+        self.match()
+        return block
+
+    def if_statement(self):
+        self.expand()
+        token = self.match()
+        node = IfStatementNode(self.condition(), line=token.line)
+        node.add_child(self.block(self.match()))
+        while self.expand():  # <if_tail>
+            hawk = self.match()
+            if self.expand()[0] == "<if_statement>":
+                self.expand()
+                token = self.match()
+                branch = ASTNode("ElseIfStatement", line=token.line)
+                branch.add_child(self.condition())
+                branch.add_child(self.block(self.match()))
+                node.add_child(branch)
+            else:
+                branch = ASTNode("ElseStatement", line=hawk.line)
+                branch.add_child(self.block(self.match()))
+                node.add_child(branch)
+                break
+        return node
+
+    def switch(self, expression, line):
+        cases = []
+        while True:
+            symbols = self.expand()  # <case_statement>
+            token = self.match()
+            if symbols[0] == "caseoh":
+                self.expand()
+                constant = self.match()
+                case = ASTNode("Case", line=token.line)
+                case.add_child(ASTNode("CaseValue", constant.value, line=constant.line))
+            else:
+                case = ASTNode("Default", line=token.line)
+            self.match()
+            self.nl()
+            block = ASTNode("Block", line=token.line)
+            self.case_lines(block)
+            self.match()
+            self.nl()
+            case.add_child(block)
+            if symbols[0] != "caseoh":
+                self.match()
+                return SwitchNode(expression, cases, case, line=line)
+            cases.append(case)
+
+    def case_lines(self, block):
+        while True:
+            symbols = self.expand()
+            if not symbols:
+                return
+            if symbols[0] == "<data_id>":
+                type_token, name = self.data_id()
+                nodes = self.local_data(type_token, name, self.initializations(name), None)
+            elif symbols[0] == "<id1>":
+                nodes = self.id1()
+            else:
+                nodes = self.statement()
+            for node in nodes:
+                block.add_child(node)
+            self.nl()
+
+    ###### EXPRESSIONS ######
+    def value(self):
+        symbols = self.expand()
+        if symbols[0] == "<expression>":
+            return self.expression()
+        if symbols[0] == "<list_value>":
+            return self.list_value()
+        if symbols[0] == "<multi_struct_val>":
+            self.expand()
+        token = self.match()
+        if symbols[0] == "chat":
+            self.match()
+            self.match()
+            return ASTNode("Input", "chat()", line=token.line)
+        # { <identifier> = <expression> <struct_init_tail> }
+        values = ASTNode("InitialValues", line=token.line)
+        while True:
+            name = self.identifier()
+            self.match()
+            assignment = ASTNode("Assignment", line=name.token.line)
+            assignment.add_child(ASTNode("Member", name.token.value, line=name.token.line))
+            assignment.add_child(self.expression())
+            values.add_child(assignment)
+            if not self.expand():
+                self.match()
+                return values
+            self.match()
+
+    def list_value(self):
+        symbols = self.expand()
+        token = self.match()
+        if symbols[0] == "[":
+            elements = self.arguments() if self.expand() else []
+            self.match()
+            return ListNode(line=token.line, elements=elements)
+        self.match()
+        if symbols[0] == "append":
+            node = AppendNode(self.arguments(), line=token.line)
+        elif symbols[0] == "insert":
+            index = self.match()
+            self.match()
+            node = InsertNode(index.value, self.arguments(), line=token.line)
         else:
-            break
-
-    if len(var_nodes) == 1:
-        return var_nodes[0], index
-    else:
-        var_list_node = ASTNode("VariableDeclarationList")
-        for node in var_nodes:
-            var_list_node.add_child(node)
-        return var_list_node, index
-
-
-def parse_statement(tokens, index, func_type = None):
-    token = tokens[index]
-    line = token.line
-
-    if token.value in {"chungus", "chudeluxe", "forsen", "forsencd", "lwk"}:
-        var_type = token.value
-        var_name = tokens[index + 1].value
-        index += 2
-
-        node, index = parse_variable(tokens, index, var_name, var_type)
-        return node, index
-    
-    elif token.value == "aura" and tokens[index + 1].type == "IDENTIFIER" and tokens[index + 2].type == "OPCUR":
-        node, index = parse_struct(tokens, index)
-        return node, index
-
-    elif token.value == "aura":
-        node, index = parse_struct_instance(tokens, index)
-        return node, index
-
-    elif token.type == "IDENTIFIER":
-        if tokens[index + 1].type == "OPPAR":
-            func_name = token.value
-            error = symbol_table.lookup_function(func_name)
-            if isinstance(error, str):
-                error = symbol_table.lookup_function(func_name)
-                raise SemanticError(error, token.line)
-            func_type = symbol_table.lookup_function(func_name)["return_type"]
-            func_params = symbol_table.lookup_function(func_name)["params"]
-            func_call_node, index = parse_function_call(tokens, index, func_name, func_type, func_params)
-            return func_call_node, index
-
-        elif tokens[index + 1].type == "IS":
-            var_name = token.value
-            error = symbol_table.lookup_variable(var_name)
-            if isinstance(error, str):
-                raise SemanticError(error, token.line)
-            
-            index += 2
-            node, index = parse_assignment(tokens, index, token.value, symbol_table.lookup_variable(token.value)["type"])
-            return node, index    
-        
-        elif tokens[index+1].type in {"INC", "DEC"}:
-            operand = ASTNode("Identifier", token.value, line=line)
-            operator = tokens[index + 1].value
-            index += 2
-            return UpdateNode(operator, operand, prefix = False, line=line), index
-        
-        elif tokens[index + 1].type == "DOT":
-            node, index = parse_struct_member_assignment(tokens, index)
-            return node, index
-        
+            node = RemoveNode(None, self.match().value, line=token.line)
+        self.match()
+        return node
+
+    def expression(self):
+        # Operands and operators as written, then grouped by precedence
+        self.expand()
+        operands = [self.operand()]
+        operators = []
+        while True:
+            symbols = self.expand()  # <expression_tail>
+            if not symbols:
+                break
+            if symbols[0] == "<dot_suffix>":
+                # A suffix of something other than a name
+                _, token, _, _ = self.dot_suffix(None)
+                operands[-1] = ASTNode("Invalid", token.value, line=token.line)
+                break
+            self.expand()
+            operators.append(self.match())
+            operands.append(self.operand())
+
+        values = [operands[0]]
+        pending = []
+        for operator, operand in zip(operators, operands[1:]):
+            while pending and PRECEDENCE[pending[-1].value] >= PRECEDENCE[operator.value]:
+                self.reduce(values, pending)
+            pending.append(operator)
+            values.append(operand)
+        while pending:
+            self.reduce(values, pending)
+        return values[0]
+
+    def reduce(self, values, pending):
+        operator = pending.pop()
+        right = values.pop()
+        values.append(BinaryOpNode(values.pop(), operator.value, right, line=operator.line))
+
+    def operand(self):
+        symbols = self.expand()
+        first = symbols[0]
+        if first == "(":
+            token = self.match()
+            if self.expand()[0] == "<dtype1>":
+                self.expand()
+                target = self.match()
+                self.match()
+                return CastNode(target.value, self.expression(), line=token.line)
+            return self.group(token)
+        if first in ("!", "-"):
+            token = self.match()
+            return UnaryOpNode(token.value, self.unary_operand(), line=token.line)
+        if first == "<prepost_operator>":
+            token = self.prepost_operator()
+            return UnaryOpNode(token.value, self.name_operand(self.identifier()), line=token.line)
+        if first == "<identifier>":
+            operand = self.name_operand(self.identifier())
+            token = self.post_operand()
+            if token:
+                operand = UnaryOpNode(token.value, operand, prefix=False, line=token.line)
+            return operand
+        token = self.match()
+        return LiteralNode(infer_literal_type(token.type), token.value, line=token.line)
+
+    def unary_operand(self):
+        # <bool_operand> or <arith_operand>
+        first = self.expand()[0]
+        if first == "(":
+            return self.group(self.match())
+        if first == "<identifier>":
+            return self.name_operand(self.identifier())
+        token = self.match()
+        return LiteralNode(infer_literal_type(token.type), token.value, line=token.line)
+
+    def group(self, token):
+        # <expression> ) after the '(' token
+        group = ASTNode("Group", line=token.line)
+        group.add_child(self.expression())
+        self.match()
+        return group
+
+    def prepost_operator(self):
+        self.expand()
+        return self.match()
+
+    def post_operand(self):
+        return self.prepost_operator() if self.expand() else None
+
+    def name_operand(self, name):
+        # The operand a name makes in an expression
+        if name.second is not None:
+            return ASTNode("Invalid", name.second.value, line=name.second.line)
+        if name.postfix is not None:
+            return name.postfix
+        return ASTNode("Identifier", name.token.value, line=name.token.line)
+
+    def identifier(self):
+        self.expand()
+        name = Name(self.match())
+        if self.expand():
+            name.second = self.match()
+        name.postfix, name.after, name.member, name.chained = self.identifier_postfix(name.second or name.token)
+        return name
+
+    def identifier_postfix(self, base):
+        # (node, first token, member token, chained) of an <identifier_postfix>
+        symbols = self.expand()
+        if not symbols:
+            return None, None, None, False
+        if symbols[0] == "<dot_suffix>":
+            return self.dot_suffix(base)
+        token = self.match()
+        content = self.expand()
+        if not content:
+            args = []
+        elif content[0] == "<parameter>":
+            args = self.parameters()
         else:
-            raise SemanticError(f"Semantic Error: Unexpected token '{tokens[index].value}' in statement.", line)
-    
-    elif tokens[index].type in {"INC", "DEC"}:
-        operator = tokens[index].value
-        index += 1
-
-        if tokens[index].type == "IDENTIFIER":
-            var_name = symbol_table.lookup_variable(tokens[index].value)
-            if isinstance(var_name, str):
-                raise SemanticError(f"Semantic Error: Variable '{var_name}' used before declaration.", line)
-            
-            operand = ASTNode("Identifier", tokens[index].value, line=line)
-            index += 1
-
-            return UpdateNode(operator, operand, prefix = True, line=line), index
-    
-    elif token.value == "aura" and tokens[index + 1].type == "IDENTIFIER" and tokens[index + 2].type == "IDENTIFIER":
-        node, index = parse_struct_instance(tokens, index)
-        return node, index
-
-    elif token.value == "aura" and tokens[index + 1].type == "IDENTIFIER" and tokens[index + 2].type == "OPCUR":
-        node, index = parse_struct(tokens, index)
-        return node, index
-
-
-    elif token.value == "yap":
-        node, index = parse_print(tokens, index)
-        return node, index
-
-    elif token.value == "tuah":
-        node, index = parse_if(tokens, index)
-        return node, index
-
-    elif token.value == "back":
-        node, index = parse_return(tokens, index, func_type)
-        return node, index 
-    
-    elif token.value == "plug":
-        node, index = parse_for(tokens, index)
-        return node, index
-
-    elif token.value == "jit":
-        node, index = parse_while(tokens, index)
-        return node, index
-    
-    elif token.value == "lil":
-        node, index = parse_do(tokens, index)
-        return node, index
-    
-    elif token.value == "lethimcook":
-        node, index = parse_switch(tokens, index)
-        return node, index
-
-    else:
-        raise SemanticError(f"Semantic Error: Unexpected token '{token.value}' in statement.", line)
-
-
-def parse_expression_type(tokens, index, var_type):
-    line = tokens[index].line
-    if var_type in {"chungus", "chudeluxe"}:
-        return parse_expression(tokens, index)
-
-    elif var_type == "forsencd":
-        return parse_expression_forsencd(tokens, index)
-
-    elif var_type == "forsen":
-        return parse_expression_forsen(tokens, index)
-    
-    elif var_type == "lwk":
-        return parse_expression_lwk(tokens, index)
-
-    else:
-        error = f"Type Error: Invalid type for assignment."
-        raise SemanticError(error, line)
-
-def parse_expression_forsen(tokens, index):
-    line = tokens[index].line
-    if tokens[index].type == "IDENTIFIER" and tokens[index + 1].type == "OPPAR":
-        func_name = tokens[index].value
-        func_info = symbol_table.lookup_function(func_name)
-        func_return_type = func_info["return_type"]
-        func_params = func_info["params"]
-        
-        if func_return_type not in {"forsen"}:
-            error = f"Type Error: Cannot use function '{func_name}' of type {func_return_type} in this expression."
-            raise SemanticError(error, line)
-        index += 1
-        return parse_function_call(tokens, index, func_name, func_return_type, func_params)
-
-    elif (
-        tokens[index].type == "IDENTIFIER" and
-        tokens[index + 1].type == "DOT" and
-        tokens[index + 2].type == "IDENTIFIER"
-    ):
-        struct_instance = tokens[index].type 
-        member_name = tokens[index + 2].value 
-        index += 3 
-
-        instance_info = symbol_table.lookup_variable(struct_instance)
-        if isinstance(instance_info, str):
-            raise SemanticError(f"Semantic Error: Struct instance '{struct_instance}' is not declared.", token.line)
-
-        struct_name = instance_info["type"]
-        struct_info = symbol_table.lookup_struct(struct_name)
-
-        if member_name not in struct_info:
-            raise SemanticError(f"Semantic Error: Struct '{struct_name}' has no member '{member_name}'.", token.line)
-
-        expected_type = struct_info[member_name]["type"]
-
-        if expected_type not in {"forsen"}:
-            raise SemanticError(f"Type Error: Cannot use '{struct_instance}.{member_name}' of type {expected_type} in this expression.", token.line)
-
-        return StructMemberAccessNode(struct_instance, member_name, expected_type, line=token.line), index
-    
-    elif tokens[index].type == "IDENTIFIER":
-        variable_info = symbol_table.lookup_variable(tokens[index].value)
-        if isinstance(variable_info, str):
-            error = f"Semantic Error: Variable '{tokens[index].value}' used before declaration."
-            raise SemanticError(error, line)
-        
-        if variable_info["type"] != "forsen":
-            error = f"Type Error: Cannot use '{tokens[index].value}' of type {variable_info['type']} in forsen expression.", line
-            raise SemanticError(error, line)
-
-        node = ASTNode("Value", tokens[index].value)
-        index += 1
-        return node, index
-
-    elif tokens[index].type == "FORSEN_LIT":
-        node = ASTNode("Value", tokens[index].value)
-        index += 1
-        return node, index
-
-    else:
-        error = f"Type Error: forsen can only be assigned with identifier of type forsen or a forsen literal."
-        raise SemanticError(error, line) 
-
-def parse_expression_forsencd(tokens, index):
-    line = tokens[index].line  
-
-    if tokens[index].type not in {"FORSENCD_LIT", "IDENTIFIER"}:
-        raise SemanticError(f"Type Error: forsencd can only be assigned a FORSENCD_LIT or an identifier of type forsen/forsencd.", line)
-
-    if tokens[index].type == "IDENTIFIER" and tokens[index + 1].type == "OPPAR":
-        func_name = tokens[index].value
-        func_info = symbol_table.lookup_function(func_name)
-
-        if isinstance(func_info, str):  # Function not found
-            raise SemanticError(f"Semantic Error: Function '{func_name}' is not defined.", line)
-
-        func_return_type = func_info["return_type"]
-        if func_return_type not in {"forsen", "forsencd"}:
-            raise SemanticError(f"Type Error: Cannot use function '{func_name}' of type '{func_return_type}' in this expression.", line)
-
-        node, index = parse_function_call(tokens, index, func_name, func_return_type, func_info["params"])
-
-    elif (
-        tokens[index].type == "IDENTIFIER" and
-        tokens[index + 1].type == "DOT" and
-        tokens[index + 2].type == "IDENTIFIER"
-    ):
-        struct_instance = tokens[index].value 
-        member_name = tokens[index + 2].value 
-        index += 3 
-
-        instance_info = symbol_table.lookup_variable(struct_instance)
-        if isinstance(instance_info, str):
-            raise SemanticError(f"Semantic Error: Struct instance '{struct_instance}' is not declared.", tokens[index].line)
-
-        struct_name = instance_info["type"]
-        struct_info = symbol_table.lookup_struct(struct_name)
-
-        if member_name not in struct_info:
-            raise SemanticError(f"Semantic Error: Struct '{struct_name}' has no member '{member_name}'.", tokens[index].line)
-
-        expected_type = struct_info[member_name]["type"]
-
-        if expected_type not in {"forsencd", "forsen"}:
-            raise SemanticError(f"Type Error: Cannot use '{struct_instance}.{member_name}' of type {expected_type} in this expression.", tokens[index].line)
-
-        struct_node = StructMemberAccessNode(struct_instance, member_name, expected_type, line=tokens[index].line)
-        return struct_node, index
-    
-    
-    elif tokens[index].type == "IDENTIFIER":
-        var_name = tokens[index].value
-        var_info = symbol_table.lookup_variable(var_name)
-
-        if isinstance(var_info, str):  # Variable not found
-            raise SemanticError(f"Semantic Error: Variable '{var_name}' used before declaration.", line)
-
-        if var_info["type"] not in {"forsen", "forsencd"}:
-            raise SemanticError(f"Type Error: Cannot use '{var_name}' of type {var_info['type']} in this expression.", line)
-
-        node = ASTNode("Value", var_name, line=line)
-        index += 1  
-
-    elif tokens[index].type == "FORSENCD_LIT":
-        node = ASTNode("Value", tokens[index].value, line=line)
-        index += 1 
-
-    left_node = node
-
-    if tokens[index].type == "PLUS":
-        while tokens[index].type == "PLUS":
-            op = tokens[index].value  
-            index += 1 
-
-            if tokens[index].type not in {"FORSENCD_LIT", "IDENTIFIER"}:
-                raise SemanticError(f"Type Error: forsencd can only be assigned a FORSENCD_LIT or an identifier of type forsen/forsencd.", line)
-
-            if tokens[index].type == "IDENTIFIER" and tokens[index + 1].type == "OPPAR":
-                func_name = tokens[index].value
-                func_info = symbol_table.lookup_function(func_name)
-
-                if isinstance(func_info, str):  # Function not found
-                    raise SemanticError(f"Semantic Error: Function '{func_name}' is not defined.", line)
-
-                func_return_type = func_info["return_type"]
-                if func_return_type not in {"forsen", "forsencd"}:
-                    raise SemanticError(f"Type Error: Cannot use function '{func_name}' of type '{func_return_type}' in this expression.", line)
-
-                right_node, index = parse_function_call(tokens, index, func_name, func_return_type, func_info["params"])
-
-            elif (
-                tokens[index].type == "IDENTIFIER" and
-                tokens[index + 1].type == "DOT" and
-                tokens[index + 2].type == "IDENTIFIER"
-            ):
-                struct_instance = tokens[index].value 
-                member_name = tokens[index + 2].value 
-                index += 3 
-
-                instance_info = symbol_table.lookup_variable(struct_instance)
-                if isinstance(instance_info, str):
-                    raise SemanticError(f"Semantic Error: Struct instance '{struct_instance}' is not declared.", tokens[index].line)
-
-                struct_name = instance_info["type"]
-                struct_info = symbol_table.lookup_struct(struct_name)
-
-                if member_name not in struct_info:
-                    raise SemanticError(f"Semantic Error: Struct '{struct_name}' has no member '{member_name}'.", tokens[index].line)
-
-                expected_type = struct_info[member_name]["type"]
-
-                if expected_type not in {"forsencd", "forsen"}:
-                    raise SemanticError(f"Type Error: Cannot use '{struct_instance}.{member_name}' of type {expected_type} in this expression.", tokens[index].line)
-
-                struct_node = StructMemberAccessNode(struct_instance, member_name, expected_type, line=tokens[index].line)
-                return struct_node, index
-
-            elif tokens[index].type == "IDENTIFIER":
-                var_name = tokens[index].value
-                var_info = symbol_table.lookup_variable(var_name)
-
-                if isinstance(var_info, str):  # Variable not found
-                    raise SemanticError(f"Semantic Error: Variable '{var_name}' used before declaration.", line)
-
-                if var_info["type"] not in {"forsen", "forsencd"}:
-                    raise SemanticError(f"Type Error: Cannot use '{var_name}' of type {var_info['type']} in this expression.", line)
-
-                right_node = ASTNode("Value", var_name, line=line)
-                index += 1 
-
-            elif tokens[index].type == "FORSENCD_LIT":
-                right_node = ASTNode("Value", tokens[index].value, line=line)
-                index += 1  
-
-            left_node = BinaryOpNode(left_node, op, right_node, line=line)
-    else:
-        return left_node, index 
-
-
-def parse_expression(tokens, index):
-    """Parses an expression with right-to-left associativity for + and -."""
-    right_node, index = parse_term(tokens, index)
-
-    if tokens[index].type in {"PLUS", "MINUS"}:
-        op = tokens[index].value
-        index += 1
-        left_node, index = parse_term(tokens, index)
-        right_node = BinaryOpNode(left_node, op, right_node)
-
-    return right_node, index
-
-def parse_term(tokens, index):
-    """Parses multiplication, division, and modulus with right-to-left associativity."""
-    right_node, index = parse_unary(tokens, index)
-
-    while tokens[index].type in {"MUL", "DIV", "MOD"}:
-        op = tokens[index].value
-        index += 1
-        left_node, index = parse_unary(tokens, index)
-        if op in {"/", "%"} and isinstance(left_node, ASTNode) and int(left_node.value) == 0:
-            raise SemanticError(f"Semantic Error: Division or modulus by zero is undefined.", tokens[index].line)
-        right_node = BinaryOpNode(left_node, op, right_node)
-
-    return right_node, index
-
-def parse_unary(tokens, index):
-    """Parses unary operators (++x, --x, !x, -x) with right-to-left associativity."""
-    if tokens[index].type in {"INC", "DEC", "NOT", "NEGAT"}:
-        op = tokens[index].value
-        index += 1
-        operand, index = parse_unary(tokens, index)
-        return UnaryOpNode(op, operand), index
-
-    return parse_factor(tokens, index)
-
-def parse_factor(tokens, index):
-    """Parses literals, identifiers, parenthesized expressions, and postfix operators."""
-    token = tokens[index]
-    if (tokens[index-1].type not in {"IDENTIFIER", "CHU_LIT", "CHUDEL_LIT", "PLUS", "MINUS", "MUL", "DIV", "MOD"} and
-        token.type == "OPPAR" and
-        tokens[index + 1].value in {"chungus", "chudeluxe"} and
-        tokens[index + 2].type == "CLPAR"
-    ):
-        target_type = tokens[index + 1].value 
-        index += 3
-        expr_node, index = parse_factor(tokens, index)
-
-        cast_node = CastNode(target_type, expr_node, line=token.line)
-        return cast_node, index
-    
-    elif token.type in {"CHU_LIT", "CHUDEL_LIT"}:
-        node = ASTNode("Value", token.value)
-        index += 1  
-
-        if tokens[index].type in {"INC", "DEC"}:
-            op = tokens[index].value
-            index += 1
-            node = UnaryOpNode(op, node)
-
-        return node, index
-    
-    elif token.type in {"IDENTIFIER"} and tokens[index + 1].type == "OPPAR":
-        func_name = token.value
-        func_info = symbol_table.lookup_function(func_name)
-        func_return_type = func_info["return_type"]
-        func_params = func_info["params"]
-        if func_return_type not in {"chungus", "chudeluxe"}:
-            error = f"Type Error: Cannot use function '{func_name}' of type {func_return_type} in this expression."
-            raise SemanticError(error, token.line)
-
-        node, index = parse_function_call(tokens, index, func_name, func_return_type, func_params)
-
-        return node, index
-
-    elif (
-        tokens[index].type == "IDENTIFIER" and
-        tokens[index + 1].type == "DOT" and
-        tokens[index + 2].value == "ts"
-    ):
-        identifier = tokens[index].value
-
-        identifier_info = symbol_table.lookup_variable(identifier)
-        if isinstance(identifier_info, str):
-            raise SemanticError(f"Semantic Error: Variable '{identifier}' used before declaration.", token.line)  
-
-        if not identifier_info["is_list"] and identifier_info["type"] != "forsencd":
-            raise SemanticError(f"Type Error: ts() can only be used on lists or strings, but '{identifier}' is of type {identifier_info['type']}.", token.line)
-        
-        index += 5
-
-        ts_node, index = TSNode(identifier, line=token.line), index
-        return ts_node, index
-
-    elif (
-        token.type == "IDENTIFIER" and
-        tokens[index + 1].type == "DOT" and
-        tokens[index + 2].type == "IDENTIFIER"
-    ):
-        struct_instance = token.value 
-        member_name = tokens[index + 2].value 
-        index += 3 
-
-        instance_info = symbol_table.lookup_variable(struct_instance)
-        if isinstance(instance_info, str):
-            raise SemanticError(f"Semantic Error: Struct instance '{struct_instance}' is not declared.", token.line)
-
-        struct_name = instance_info["type"]
-        struct_info = symbol_table.lookup_struct(struct_name)
-
-        if member_name not in struct_info:
-            raise SemanticError(f"Semantic Error: Struct '{struct_name}' has no member '{member_name}'.", token.line)
-
-        expected_type = struct_info[member_name]["type"]
-
-        if expected_type not in {"chungus", "chudeluxe"}:
-            raise SemanticError(f"Type Error: Cannot use '{struct_instance}.{member_name}' of type {expected_type} in this expression.", token.line)
-
-        struct_node = StructMemberAccessNode(struct_instance, member_name, expected_type, line=token.line)
-        return struct_node, index
-
-    elif token.type == "IDENTIFIER" and tokens[index + 1].type == "OPBRA":
-        list_name = token.value
-        list_info = symbol_table.lookup_variable(list_name)
-
-        if isinstance(list_info, str):
-            raise SemanticError(f"Semantic Error: List '{list_name}' used before declaration.", token.line)
-
-        if not list_info["is_list"]:
-            raise SemanticError(f"Type Error: '{list_name}' is not a list.", token.line)
-
-        index += 2
-        expr_node, index = parse_expression(tokens, index)
-
-        if tokens[index].type != "CLBRA":
-            raise SemanticError("Syntax Error: Missing closing bracket.", token.line)
-
-        index_node = ASTNode("Index", line=token.line)
-        index_node.add_child(expr_node)
-
-        index += 1
-        list_access_node = ListAccessNode(list_name, index_node, line=token.line)
-        return list_access_node, index
-        
-
-    elif token.type in {"IDENTIFIER"}:
-        variable_info = symbol_table.lookup_variable(token.value)
-        if isinstance(variable_info, str):
-            raise SemanticError(f"Semantic Error: Variable '{token.value}' used before declaration.", token.line)
-        
-        if variable_info["type"] not in {"chungus", "chudeluxe"}:
-            error = f"Type Error: Cannot use '{token.value}' of type {variable_info['type']} in this expression."
-            raise SemanticError(error, token.line)
-        
-        node = ASTNode("Value", token.value)
-        index += 1  
-
-        if tokens[index].type in {"INC", "DEC"}:
-            op = tokens[index].value
-            index += 1
-            node = UnaryOpNode(op, node)
-
-        return node, index
-
-    elif token.type == "OPPAR":
-        index += 1  
-        node, index = parse_expression(tokens, index)  
-        if tokens[index].type == "CLPAR":
-            index += 1  
-        return node, index  
-
-    else:
-        error = f"Semantic Error: Invalid factor '{token.value}' in expression."
-        raise SemanticError(error, token.line)
-
-def parse_expression_lwk(tokens, index):
-    line = tokens[index].line
-    
-    left_node, index = parse_relational(tokens, index)
-
-    while tokens[index].type in {"AND", "OR"}:
-        operator = tokens[index].value
-        index += 1 
-        right_node, index = parse_relational(tokens, index)  # Parse the right-hand side
-        left_node = BinaryOpNode(left_node, operator, right_node, line=line)  # Build AST node
-    
-    return left_node, index
-
-def parse_relational(tokens, index):
-    line = tokens[index].line
-    token = tokens[index]
-
-    if tokens[index].type == "NOT": 
-        index += 1  
-        operand_node, index, operand_type = parse_operand(tokens, index)
-
-        if operand_type != "lwk":
-            raise SemanticError(f"Type Error: Cannot apply '!' to type '{operand_type}'.", line)
-
-        return UnaryOpNode("NOT", operand_node), index
-    left_node, index, left_type = parse_operand(tokens, index)
-
-    if left_type == "lwk" and tokens[index].type not in {"EQ", "NEQ"}:
-        return left_node, index
-
-    if tokens[index].type not in {"LTE", "GTE", "LT", "GT", "EQ", "NEQ"}:
-        error = f"Semantic Error: Expected relational operator after {left_node.value}."
-        raise SemanticError(error, line)
-
-    operator = tokens[index].type
-    index += 1  
-
-    right_node, index, right_type = parse_operand(tokens, index)
-
-    if tokens[index].type in {"LTE", "GTE", "LT", "GT", "EQ", "NEQ"}:
-        error = f"Semantic Error: Cannot chain multiple relational operators."
-        raise SemanticError(error, line)
-
-   
-    if left_type in {"chungus", "chudeluxe"}:
-        if right_type not in {"chungus", "chudeluxe"}:
-            raise SemanticError(f"Type Error: Cannot compare '{left_type}' with '{right_type}'.", line)
-        if operator not in {"LTE", "GTE", "LT", "GT", "EQ", "NEQ"}:
-            raise SemanticError(f"Semantic Error: Invalid operator '{operator}' for {left_type}.", line)
-
-    elif left_type == "forsen":
-        if right_type != "forsen":
-            raise SemanticError(f"Type Error: Cannot compare '{left_type}' with '{right_type}'.", line)
-        if operator not in {"EQ", "NEQ"}:
-            raise SemanticError(f"Semantic Error: Invalid operator '{operator}' for forsen type.", line)
-
-    elif left_type == "forsencd":
-        if right_type != "forsencd":
-            raise SemanticError(f"Type Error: Cannot compare '{left_type}' with '{right_type}'.", line)
-        if operator not in {"EQ", "NEQ"}:
-            raise SemanticError(f"Semantic Error: Invalid operator '{operator}' for forsencd type.", line)
-
-    elif left_type == "lwk":
-        if right_type != "lwk":
-            raise SemanticError(f"Type Error: Cannot compare '{left_type}' with '{right_type}'.", line)
-        if operator not in {"EQ", "NEQ"}:
-            raise SemanticError(f"Semantic Error: Invalid operator '{operator}' for lwk type.", line)
-
-    else:
-        raise SemanticError(f"Type Error: Unsupported type '{left_type}' in relational expression.", line)
-
-    return BinaryOpNode(left_node, operator, right_node, line=line), index
+            args = self.arguments()
+        self.match()
+        return FunctionCallNode(base.value, args, line=base.line), token, None, False
+
+    def dot_suffix(self, base):
+        # Like identifier_postfix, for a <dot_suffix> after the name base,
+        # or None after another operand
+        name = base.value if base else None
+        if self.expand()[0] == "<index>":
+            self.expand()
+            token = self.match()
+            index = ASTNode("Index", line=token.line)
+            index.add_child(self.expression())
+            self.match()
+            return ListAccessNode(name, index, line=token.line), token, None, False
+        token = self.match()
+        content = self.expand()[0]
+        keyword = self.match()
+        if content == "ts":
+            self.match()
+            self.match()
+            return TSNode(name, line=keyword.line), token, None, False
+        if content == "taper":
+            self.match()
+            self.match()
+            return TaperNode(name, line=keyword.line), token, None, False
+        if self.expand():
+            # a.b.c: only one member deep
+            _, suffix, _, _ = self.dot_suffix(keyword)
+            return ASTNode("Invalid", suffix.value, line=suffix.line), token, keyword, True
+        return StructMemberAccessNode(name, keyword.value, None, line=keyword.line), token, keyword, False
+
+    def arguments(self):
+        self.expand()
+        args = [self.expression()]
+        while self.expand():
+            self.match()
+            args.append(self.expression())
+        return args
+
+    def parameters(self):
+        self.expand()
+        params = [self.parameter()]
+        while self.expand():
+            self.match()
+            params.append(self.parameter())
+        return params
+
+    def parameter(self):
+        type_token, name = self.data_id()
+        param = ASTNode("Parameter", line=type_token.line)
+        param.add_child(ASTNode("Type", type_token.value, line=type_token.line))
+        param.add_child(ASTNode("Identifier", name.token.value, line=name.token.line))
+        return param
 
 
 def infer_literal_type(token_type):
@@ -1182,1061 +1680,3 @@ def infer_literal_type(token_type):
     if token_type == "LWK_LIT":
         return "lwk"
     return None
-
-
-def parse_operand(tokens, index):
-    token = tokens[index]
-    line = token.line
-
-    if token.type in {"CHU_LIT", "CHUDEL_LIT", "FORSEN_LIT", "FORSENCD_LIT", "LWK_LIT"}:
-        return ASTNode("Value", token.value, line=line), index + 1, infer_literal_type(token.type)
-
-    
-
-    if token.type == "IDENTIFIER" and tokens[index + 1].type == "OPPAR":
-        func_info = symbol_table.lookup_function(token.value)
-        if isinstance(func_info, str):
-            raise SemanticError(f"Semantic Error: Function '{token.value}' used before declaration.", line)
-        func_return_type = func_info["return_type"]
-        func_params = func_info["params"]
-
-        func_node, index = parse_function_call(tokens, index, token.value, func_return_type, func_params)
-        return func_node, index, func_return_type
-
-    if (
-        token.type == "IDENTIFIER"
-        and tokens[index + 1].type == "DOT"
-        and tokens[index + 2].type == "IDENTIFIER"
-    ):
-        struct_instance = token.value
-        member_name = tokens[index + 2].value
-        index += 3  
-
-        instance_info = symbol_table.lookup_variable(struct_instance)
-        if isinstance(instance_info, str):
-            raise SemanticError(f"Semantic Error: Struct instance '{struct_instance}' is not declared.", line)
-
-        struct_name = instance_info["type"]
-        struct_info = symbol_table.lookup_struct(struct_name)
-
-        if member_name not in struct_info:
-            raise SemanticError(f"Semantic Error: Struct '{struct_name}' has no member '{member_name}'.", line)
-
-        expected_type = struct_info[member_name]["type"]
-
-        struct_node = StructMemberAccessNode(struct_instance, member_name, expected_type, line=line)
-        return struct_node, index, expected_type
-
-    if token.type == "IDENTIFIER":
-        variable_info = symbol_table.lookup_variable(token.value)
-        if isinstance(variable_info, str):
-            raise SemanticError(f"Semantic Error: Variable '{token.value}' used before declaration.", line)
-        var_type = variable_info["type"]
-        return ASTNode("Variable", token.value, line=line), index + 1, var_type
-
-    raise SemanticError(f"Type Error: Expected valid operand, got '{token.value}'.", line)
-
-
-def parse_assignment(tokens, index, var_name, var_type):
-    line = tokens[index].line
-
-    global_var = symbol_table.variables.get(var_name)
-    if global_var and global_var["is_sturdy"]:
-        raise SemanticError(f"Semantic Error: Variable '{var_name}' is declared as sturdy.", line)
-
-    if tokens[index].value == "chat":
-        index += 1
-        if tokens[index].type == "OPPAR":
-            index += 1
-            if tokens[index].type != "CLPAR":
-                raise SemanticError(f"Semantic Error: chat() should not have parameters.", line)
-            index += 1
-            value_node = ASTNode("Input", "chat()", line=line)
-        else:
-            raise SemanticError(f"Syntax Error: Expected '()' after chat.", line)
-
-    elif tokens[index].value == "append":
-        value_node, index = parse_append(tokens, index, var_name, var_type)
-
-    elif tokens[index].value == "insert":
-        value_node, index = parse_insert(tokens, index, var_name, var_type)
-
-    elif tokens[index].value == "remove":
-        value_node, index = parse_remove(tokens, index, var_name, var_type)
-
-    elif tokens[index].type == "IDENTIFIER" and tokens[index + 1].type == "OPPAR":
-        value_node, index = parse_function_call(tokens, index, tokens[index].value, var_type, [])
-
-    else:
-        value_node, index = parse_expression_type(tokens, index, var_type)
-
-    assignment_node = AssignmentNode(var_name, value_node, line=line)
-
-    return assignment_node, index
-
-
-def parse_function_call(tokens, index, func_name, func_type, func_params):
-    line = tokens[index].line
-    
-    index += 2
-    args_node = ASTNode("Arguments")
-    provided_args = []  
-    expected_params = func_params  
-    
-    while tokens[index].type != "CLPAR":
-        if len(provided_args) >= len(expected_params):
-            raise SemanticError(f"Type Error: Too many arguments in function call '{func_name}'.", line)
-
-        expected_type = expected_params[len(provided_args)].children[0].value 
-        
-        expr_node, index = parse_expression_type(tokens, index, expected_type)
-
-        arg_node = ASTNode("Argument")
-        arg_node.add_child(expr_node)
-        args_node.add_child(arg_node)
-
-        provided_args.append((arg_node, expected_type))
-
-   
-        if tokens[index].type == "COMMA":
-            index += 1 
-
-    index += 1 
-
-    if tokens[index].type in {"INC", "DEC"}:
-        raise SemanticError(f"Type Error: Unary operators cannot be applied to function calls.", line)
-
-    if len(provided_args) != len(expected_params):
-        raise SemanticError(f"Type Error: Function '{func_name}' expects {len(expected_params)} arguments, but {len(provided_args)} were provided.", line)
-
-    for i, (arg_node, arg_type) in enumerate(provided_args):
-        expected_type = expected_params[i].children[0].value  # Get expected type
-
-        if expected_type in {"chungus", "chudeluxe"} and arg_type == "chungus":
-            continue 
-        
-        if arg_type != expected_type:
-            raise SemanticError(f"Type Error: Argument {i+1} of '{func_name}' should be '{expected_type}', but got '{arg_type}'.", line)
-
-    return FunctionCallNode(func_name, args_node.children, line=line), index
-
-
-def parse_argument(tokens, index):
-    line = tokens[index].line
-
-    if tokens[index].type == "IDENTIFIER":
-        arg_name = tokens[index].value
-        arg_info = symbol_table.lookup_variable(arg_name)
-        if isinstance(arg_info, str):
-            raise SemanticError(f"Semantic Error: Variable '{arg_name}' used before declaration.", line)
-        
-        arg_type = arg_info["type"]
-        arg_node = ASTNode("Value", arg_name, line=line)
-        index += 1
-
-    else:
-        raise SemanticError(f"Semantic Error: Invalid argument in function call.", line)
-
-    return arg_node, arg_type, index
-    
-def parse_print(tokens, index):
-    line = tokens[index].line
-    index += 1
-
-    if tokens[index].type != "OPPAR":
-        raise SemanticError(f"Syntax Error: Expected '(' after yep statement.", line)
-    index += 1
-    token = tokens[index]
-
-    args = []
-    placeholder_count = 0
-
-    if tokens[index].type == "FORSENCD_LIT":
-        format_node, index, placeholder_count = parse_string_concatenation(tokens, index) 
-        args.append(format_node)
-
-    elif tokens[index].type == "IDENTIFIER":
-        identif_name = tokens[index].value
-
-        if tokens[index + 1].type == "OPPAR":
-            func_name = identif_name
-            func_info = symbol_table.lookup_function(func_name)
-            if isinstance(func_info, str):
-                raise SemanticError(f"Semantic Error: Function '{func_name}' is not defined.", line)
-            if func_info["return_type"] in {"chungus", "chudeluxe"}:
-                expr_node, index = parse_expression(tokens, index)
-                args.append(expr_node)
-            elif func_info["return_type"] in {"forsen"}:
-                expr_node, index = parse_expression_forsen(tokens, index)
-                args.append(expr_node)
-            elif func_info["return_type"] in {"forsencd"}:
-                expr_node, index = parse_expression_forsencd(tokens, index)
-                args.append(expr_node)
-            elif func_info["return_type"] in {"lwk"}:
-                expr_node, index = parse_expression_lwk(tokens, index)
-                args.append(expr_node)
-            else:
-                raise SemanticError(f"Type Error: Function '{func_name}' returns invalid type '{func_info['return_type']}'.", line)
-        else:   
-            arg_info = symbol_table.lookup_variable(identif_name)
-            if isinstance(arg_info, str):
-                raise SemanticError(f"Semantic Error: Variable '{identif_name}' used before declaration.", line)
-            if arg_info["type"] in {"chungus", "chudeluxe"}:
-                expr_node, index = parse_expression(tokens, index)
-                args.append(expr_node)
-            else:
-                args.append(ASTNode("Value", identif_name, line=line))
-                index += 1
-
-    else:
-        expr_node, index = parse_expression(tokens, index)
-        args.append(expr_node)
-    
-    acutal_args = []
-    while tokens[index].type == "COMMA":
-        index += 1
-
-        if tokens[index].type in {"CHU_LIT", "CHUDEL_LIT"}:
-            arg_node, index = parse_expression(tokens, index)
-            acutal_args.append(arg_node)
-
-        elif tokens[index].type == "IDENTIFIER":
-            arg_name = tokens[index].value
-            arg_info = symbol_table.lookup_variable(arg_name)
-            if arg_info["type"] in {"chungus", "chudeluxe"}:
-                arg_node, index = parse_expression(tokens, index)
-                acutal_args.append(arg_node)
-            else:
-                acutal_args.append(ASTNode("Value", arg_name, line=line))
-                index += 1
-
-        else:
-            raise SemanticError(f"Syntax Error: Expected argument after ',' in yap statement.", line)
-
-    if placeholder_count != len(acutal_args):
-        raise SemanticError(f"Type Error: Expected {placeholder_count} arguments, but got {len(acutal_args)}.", line)
-    
-    args.extend(acutal_args)
-
-    if tokens[index].type != "CLPAR":
-        raise SemanticError(f"Syntax Error: Expected ')' after yap statement.", line)
-    index += 1
-
-    return PrintNode(args, line=line), index
-
-def parse_string_concatenation(tokens, index):
-    line = tokens[index].line
-    if tokens[index].type != "FORSENCD_LIT":
-        raise SemanticError(f"Semantic Error: String concatenation must start with a string literal.", line)
-    
-    format_string = tokens[index].value
-    raw_string = format_string.replace("\\{", "").replace("\\}", "")
-    if "{" in raw_string or "}" in raw_string:
-        if raw_string.count("{") != raw_string.count("}"):
-            raise SemanticError(f"Semantic Error: Invalid string literal '{format_string}' in yap().", line)
-        if "{}" not in raw_string:
-            raise SemanticError(f"Syntax Error: Placeholders {{}} must be adjacent within the string literal.", line)
-        
-    placeholder_count = raw_string.count("{}")
-    left_node = ASTNode("FormattedString", tokens[index].value, line=line)
-    index += 1
-
-    while index < len(tokens) and tokens[index].type == "PLUS":
-        index += 1
-        if tokens[index].type != "FORSENCD_LIT":
-            raise SemanticError(f"Semantic Error: Only string literals can be concatenated in yap().", line)
-
-        format_string = tokens[index].value
-        raw_string = format_string.replace("\\{", "").replace("\\}", "")
-        
-        if "{" in raw_string or "}" in raw_string:
-            if raw_string.count("{") != raw_string.count("}"):
-                raise SemanticError(f"Semantic Error: Invalid string literal '{format_string}' in yap().", line)
-            if "{}" not in raw_string:
-                raise SemanticError(f"Syntax Error: Placeholders {{}} must be adjacent within the string literal.", line)
-        
-        placeholder_count += raw_string.count("{}")
-        right_node = ASTNode("FormattedString", tokens[index].value, line=line)
-        index += 1
-
-        left_node = BinaryOpNode(left_node, "+", right_node, line=line)
-
-    return left_node, index, placeholder_count
-
-
-def parse_sturdy(tokens, index):
-    token = tokens[index]
-    line = token.line
-    index += 1 
-    if tokens[index].value not in {"chungus", "chudeluxe", "forsen", "forsencd", "lwk"}:
-        raise SemanticError(f"Semantic Error: Invalid sturdy variable type '{tokens[index].value}'.", line)
-    
-    var_type = tokens[index].value
-    index += 1  
-
-    if tokens[index].type != "IDENTIFIER":
-        raise SemanticError(f"Syntax Error: Expected identifier after '{var_type}'.", line)
-    
-    var_name = tokens[index].value
-    index += 1
-
-    if tokens[index].type != "IS":
-        raise SemanticError(f"Semantic Error: Sturdy variables must be initialized.", line)
-    index += 1
-
-    expected_literals = {
-        "chungus": "CHU_LIT",
-        "chudeluxe": "CHUDEL_LIT",
-        "forsen": "FORSEN_LIT",
-        "forsencd": "FORSENCD_LIT",
-        "lwk": "LWK_LIT"
-    }
-    
-    if tokens[index].type != expected_literals[var_type]:
-        raise SemanticError(f"Type Error: '{var_name}' must be initialized with a {var_type} literal.", line)
-
-    value_node = ASTNode("Value", tokens[index].value, line=line)
-    index += 1
-
-    if tokens[index].type not in {"NL"}:
-        raise SemanticError(f"Semantic Error: Sturdy variable '{var_name}' must be assigned only a single literal.", line)
-
-    error = symbol_table.declare_variable(var_name, var_type, value=value_node, is_list=False, is_sturdy=True)
-    if isinstance(error, str):
-        raise SemanticError(error, line)
-
-    return SturdyDeclarationNode(var_type, var_name, value_node, line=line), index
-
-def parse_if(tokens, index):
-    line = tokens[index].line
-    index += 1  # Move past "tuah"
-
-    if tokens[index].type != "OPPAR":
-        raise SemanticError(f"Syntax Error: Expected '(' after 'tuah'.", line)
-    index += 1 
-
-    condition_expr, index = parse_expression_lwk(tokens, index)  # Parse lwk expression
-
-
-    print(tokens[index].type)
-
-    if tokens[index].type != "CLPAR":
-        raise SemanticError(f"Syntax Error: Expected ')' after 'tuah' condition.", line)
-    
-    index += 1  
-
-    symbol_table.enter_scope()
-    
-    condition_node = ASTNode("Condition", line=line)
-    condition_node.add_child(condition_expr)
-
-    if_node = IfStatementNode(condition_node, line=line)
-    
-    if tokens[index].type == "OPCUR":
-        index += 1
-
-        block_node = ASTNode("Block", line=line)
-
-        while tokens[index].type != "CLCUR":
-            stmt, index = parse_statement(tokens, index)
-            if stmt:
-                block_node.add_child(stmt)
-
-        if tokens[index].type != "CLCUR":
-            raise SemanticError(f"Syntax Error: Expected '}}' after 'tuah' block.", line)
-        index += 1
-        symbol_table.exit_scope()
-        if_node.add_child(block_node)
-
-    else:
-        raise SemanticError(f"Syntax Error: Expected '{{' after 'tuah' condition.", line)
-
-
-    while tokens[index].value == "hawk" and tokens[index + 1].value == "tuah":
-        index += 2
-        if tokens[index].type != "OPPAR":
-            raise SemanticError(f"Syntax Error: Expected '(' after 'tuah'.", line)
-        index += 1  
-
-        elseif_node = ASTNode("ElseIfStatement", line=line)
-        
-        elseif_condition_expr, index = parse_expression_lwk(tokens, index)
-
-        if tokens[index].type != "CLPAR":
-            raise SemanticError(f"Syntax Error: Expected ')' after 'tuah' condition.", line)
-        index += 1 
-
-        symbol_table.enter_scope()
-        
-        elseif_condition_node = ASTNode("Condition", line=line)
-        elseif_condition_node.add_child(elseif_condition_expr)
-        elseif_node.add_child(elseif_condition_node)
-        
-        if tokens[index].type == "OPCUR":
-            index += 1
-
-            elseif_block_node = ASTNode("Block", line=line)
-
-            while tokens[index].type != "CLCUR":
-                stmt, index = parse_statement(tokens, index)
-                if stmt:
-                    elseif_block_node.add_child(stmt)
-    
-            elseif_node.add_child(elseif_block_node)
-            index += 1
-
-            symbol_table.exit_scope()
-            if_node.add_child(elseif_node)
-
-        else:
-            raise SemanticError(f"Syntax Error: Expected '{{' after 'tuah' condition.", line)
-
-
-    if tokens[index].value == "hawk" and tokens[index + 1].value not in {"tuah", "{"}:
-        raise SemanticError(f"Syntax Error: Unexpected token after 'hawk'", line)
-    
-    if tokens[index].value == "hawk":
-        index += 1
-
-        if tokens[index].type == "OPCUR":
-            index += 1
-            symbol_table.enter_scope()
-
-            else_node = ASTNode("ElseStatement", line=line)
-            else_block_node = ASTNode("Block", line=line)
-
-            while tokens[index].type != "CLCUR":
-                stmt, index = parse_statement(tokens, index)
-                if stmt:
-                    else_block_node.add_child(stmt)
-
-        index += 1
-        symbol_table.exit_scope()
-        else_node.add_child(else_block_node)
-        if_node.add_child(else_node)
-    
-    return if_node, index
-
-
-def parse_return(tokens, index, func_type):
-    line = tokens[index].line
-    index += 1
-
-    if func_type == "nocap":
-        if tokens[index].type not in {"NL", "CLCUR"}:
-            raise SemanticError(f"Type Error: nocap function must not return any value.", line)
-        return ReturnNode(None, line=line), index
-
-    elif tokens[index].type == "IDENTIFIER":
-        identifier = tokens[index].value
-
-        if tokens[index+1].type == "OPPAR":  # Function call case
-            func_info = symbol_table.lookup_function(identifier)
-
-            if isinstance(func_info, str):  # Function not found
-                raise SemanticError(f"Semantic Error: Function '{identifier}' is not defined.", line)
-
-            return_type = func_info["return_type"]
-            if return_type != func_type:
-                raise SemanticError(f"Type Error: Function '{identifier}' returns '{return_type}', but expected '{func_type}'.", line)
-
-            return_expr, index = parse_function_call(tokens, index, identifier, return_type, func_info["params"])
-
-        else:  # Variable case
-            print(tokens[index])
-            var_info = symbol_table.lookup_variable(identifier)
-            if isinstance(var_info, str):
-                raise SemanticError(f"Semantic Error: Variable '{identifier}' used before declaration.", line)
-
-            if var_info["type"] != func_type:
-                raise SemanticError(f"Type Error: Variable '{identifier}' is of type '{var_info['type']}', expected '{func_type}'.", line)
-
-            return_expr, index = parse_expression_type(tokens, index, func_type)
-
-    else:  
-        return_expr, index = parse_expression_type(tokens, index, func_type)
-
-    return ReturnNode(return_expr, line=line), index
-
-
-
-def parse_for(tokens, index):
-    line = tokens[index].line
-    index += 1
-
-    if tokens[index].type != "OPPAR":
-        raise SemanticError(f"Syntax Error: Expected '(' after 'plug'.", line)
-    index += 1
-
-    if tokens[index].value in {"chungus", "chudeluxe", "forsen", "forsencd", "lwk"}:
-        var_type = tokens[index].value
-        var_name = tokens[index + 1].value
-        index += 2
-
-        initialization, index = parse_variable(tokens, index, var_name, var_type)
-
-    elif tokens[index].type == "IDENTIFIER":
-        identifier_name = tokens[index].value
-        var_info = symbol_table.lookup_variable(identifier_name)
-        if isinstance(var_info, str):
-            raise SemanticError(f"Semantic Error: Variable '{identifier_name}' used before declaration.", line)
-        index += 1
-        if tokens[index].type != "IS":
-            raise SemanticError(f"Syntax Error: Expected '=' after for loop identifier.", line)
-        index += 1
-        initialization, index = parse_assignment(tokens, index, identifier_name, var_info["type"])
-        
-    if tokens[index].type != "SEMICOL":
-        raise SemanticError(f"Syntax Error: Expected ';' after for loop initialization.", line)
-    index += 1
-
-    condition, index = parse_expression_lwk(tokens, index)
-
-    condition_node = ASTNode("Condition", line=line)
-    condition_node.add_child(condition)
-
-    if tokens[index].type != "SEMICOL":
-        raise SemanticError(f"Syntax Error: Expected ';' after for loop condition.", line)
-    index += 1
-
-    update, index = parse_update(tokens, index)
-
-    if tokens[index].type != "CLPAR":
-        raise SemanticError(f"Syntax Error: Expected ')' after for loop update.", line)
-    index += 1
-
-    symbol_table.enter_scope()
-
-    for_node = ForLoopNode(initialization, condition_node, update, line=line)
-
-    if tokens[index].type == "OPCUR":
-        index += 1
-
-        block_node = ASTNode("Block", line=line)
-
-        while tokens[index].type != "CLCUR":
-            print(tokens[index].value)
-            if tokens[index].value == "pause":
-                index += 1
-                cont_node = ContinueNode(line)
-                block_node.add_child(cont_node)
-
-            elif tokens[index].value == "getout":
-                index +=1
-                break_node = BreakNode(line)
-                block_node.add_child(break_node)
-
-            else:
-                stmt, index = parse_statement(tokens, index)
-                if stmt:
-                    block_node.add_child(stmt)
-
-        index += 1
-        
-
-        symbol_table.exit_scope()
-
-        for_node.add_child(block_node)
-    
-    else:
-        raise SemanticError(f"Syntax Error: Expected '{{' after for loop condition.", line)
-    
-    return for_node, index
-
-def parse_update(tokens, index):
-    line = tokens[index].line
-
-    if tokens[index].type == "IDENTIFIER":
-        var_name = symbol_table.lookup_variable(tokens[index].value)
-        if isinstance(var_name, str):
-            raise SemanticError(f"Semantic Error: Variable '{var_name}' used before declaration.", line)
-        operand = ASTNode("Identifier", tokens[index].value, line=line)
-
-        index += 1
-
-        if tokens[index].type in {"INC", "DEC"}:
-            operator = tokens[index].value
-            index += 1
-            return UpdateNode(operator, operand, prefix = False, line=line), index
-    
-    elif tokens[index].type in {"INC", "DEC"}:
-        operator = tokens[index].value
-        index += 1
-
-        if tokens[index].type == "IDENTIFIER":
-            var_name = symbol_table.lookup_variable(tokens[index].value)
-            if isinstance(var_name, str):
-                raise SemanticError(f"Semantic Error: Variable '{var_name}' used before declaration.", line)
-            
-            operand = ASTNode("Identifier", tokens[index].value, line=line)
-            index += 1
-
-            return UpdateNode(operator, operand, prefix = True, line=line), index
-        
-    raise SemanticError(f"Semantic Error: Invalid update statement.", line)
-    
-def parse_while(tokens, index):
-    line = tokens[index].line
-    index += 1
-    
-    if tokens[index].type != "OPPAR":
-        raise SemanticError(f"Syntax Error: Expected '(' after 'while'.", line)
-    index += 1
-
-
-    condition, index = parse_expression_lwk(tokens, index)
-
-    if tokens[index].type != "CLPAR":
-        raise SemanticError(f"Syntax Error: Expected ')' after 'while' condition.", line)
-    
-    index += 1
-
-    symbol_table.enter_scope()
-
-    condition_node = ASTNode("Condition", line=line)
-    condition_node.add_child(condition)
-    while_node = WhileLoopNode(condition_node, line=line)
-
-    if tokens[index].type == "OPCUR":
-        index += 1
-
-        block_node = ASTNode("Block", line=line)
-
-        while tokens[index].type != "CLCUR":
-
-            if tokens[index].value == "pause":
-                index += 1
-                cont_node = ContinueNode(line)
-                block_node.add_child(cont_node)
-
-            elif tokens[index].value == "getout":
-                index += 1
-                break_node = BreakNode(line)
-                block_node.add_child(break_node)
-
-            else:
-                stmt, index = parse_statement(tokens, index)
-                if stmt:
-                    block_node.add_child(stmt)
-
-        index += 1
-        symbol_table.exit_scope()
-
-        while_node.add_child(block_node)
-    
-    else:
-        raise SemanticError(f"Syntax Error: Expected '{{' after 'while' condition.", line)
-    
-    return while_node, index
-
-def parse_do(tokens, index):
-    line = tokens[index].line
-    index += 1
-
-    symbol_table.enter_scope()
-
-    if tokens[index].type != "OPCUR":
-        raise SemanticError(f"Syntax Error: Expected '{{' after 'do'.", line)
-    index += 1
-
-    block_node = ASTNode("Block", line=line)
-
-    while tokens[index].type != "CLCUR":
-
-        if tokens[index].value == "pause":
-            index += 1
-            cont_node = ContinueNode(line)
-            block_node.add_child(cont_node)
-
-        elif tokens[index].value == "getout":
-            index += 1
-            break_node = BreakNode(line)
-            block_node.add_child(break_node)
-
-
-        stmt, index = parse_statement(tokens, index)
-        if stmt:
-            block_node.add_child(stmt)
-        
-        
-        
-
-    index += 1
-
-    if tokens[index].value != "jit":
-        raise SemanticError(f"Syntax Error: Expected 'jit' after 'do' block.", line)
-    index += 1
-
-    if tokens[index].type != "OPPAR":
-        raise SemanticError(f"Syntax Error: Expected '(' after 'jit'.", line)
-    index += 1
-
-    condition, index = parse_expression_lwk(tokens, index)
-
-    if tokens[index].type != "CLPAR":
-        raise SemanticError(f"Syntax Error: Expected ')' after 'jit' condition.", line)
-    index += 1
-
-    do_node = DoWhileLoopNode(condition, line=line)
-
-    condition_node = ASTNode("Condition", line=line)
-    condition_node.add_child(condition)
-
-    do_node.add_child(block_node)
-    do_node.add_child(condition_node)
-
-    symbol_table.exit_scope()
-    return do_node, index
-
-def parse_switch(tokens, index):
-    line = tokens[index].line
-    index += 1
-
-    if tokens[index].type != "OPPAR":
-        raise SemanticError(f"Syntax Error: Expected '(' after 'switch'.", line)
-    index += 1
-
-    switch_expr, index = parse_expression(tokens, index)
-
-    if tokens[index].type != "CLPAR":
-        raise SemanticError(f"Syntax Error: Expected ')' after 'switch' expression.", line)
-    index += 1
-
-    if tokens[index].type != "OPCUR":
-        raise SemanticError(f"Syntax Error: Expected '{{' after 'switch' expression.", line)
-    index += 1
-    
-    symbol_table.enter_scope()
-
-    case_nodes = []
-    default_case = None
-
-    while tokens[index].type == "NL":
-        index += 1
-
-    while tokens[index].value == "caseoh":
-        case_line = tokens[index].line
-        index += 1
-        line = tokens[index].line
-
-        if tokens[index].type not in {"FORSENCD_LIT", "FORSEN_LIT", "LWK_LIT", "CHU_LIT", "CHUDEL_LIT"}:
-            raise SemanticError(f"Semantic Error: Expected a valid literal value after 'caseoh'.", line)
-        
-        case_value = ASTNode("CaseValue", tokens[index].value, line=case_line)
-        index += 1
-
-        if tokens[index].type != "COLON":
-            raise SemanticError(f"Syntax Error: Expected ':' after 'caseoh' value.", line)
-        index += 1
-
-        case_block = ASTNode("Block", line=case_line)
-
-        while tokens[index].value != "getout":
-            line = tokens[index].line
-            stmt, index = parse_statement(tokens, index)
-            if stmt:
-                case_block.add_child(stmt)
-            
-
-        index += 1
-
-        while tokens[index].type == "NL":
-            index += 1
-
-        case_node = ASTNode("Case", line=case_line)
-        case_node.add_child(case_value)
-        case_node.add_child(case_block)
-        case_nodes.append(case_node)
-    
-    
-    line = tokens[index].line
-
-
-    if tokens[index].value != "npc":
-        raise SemanticError(f"Semantic Error: Expected 'npc' after switch cases.", line)
-
-    if tokens[index].value == "npc":
-        line = tokens[index].line
-        index += 1
-             
-        if tokens[index].type != "COLON":
-            raise SemanticError(f"Syntax Error: Expected ':' after 'npc'.", line)
-        index += 1
-        
-        default_block = ASTNode("Block", line=line)
-
-        while tokens[index].value != "getout":
-            stmt, index = parse_statement(tokens, index)
-            if stmt:
-                default_block.add_child(stmt)
-            
-
-        if tokens[index].value == "getout":
-            index += 1
-            
-
-        default_case = ASTNode("DefaultCase", line=line)
-        default_case.add_child(default_block)
-        
-    if tokens[index].type != "CLCUR":
-        raise SemanticError(f"Syntax Error: Expected '}}' after switch statement.", line)
-        
-    index += 1
-
-    symbol_table.exit_scope()
-
-    return SwitchNode(switch_expr, case_nodes, default_case, line=line), index
-
-def parse_list(tokens, index, expected_type):
-    line = tokens[index].line
-    if tokens[index].type != "OPBRA":
-        raise SemanticError(f"Semantic Error: Expected '[' for list declaration.", line)
-    index += 1
-    
-    elements = []
-
-    if tokens[index].type == "CLBRA":
-        index += 1
-        return ListNode(elements=[], line=line), index
-    
-    while tokens[index].type != "CLBRA":
-        expr, index = parse_expression_type(tokens, index, expected_type)
-        elements.append(expr)
-
-        if tokens[index].type == "COMMA":
-            index += 1
-    
-    if tokens[index].type != "CLBRA":
-        raise SemanticError(f"Syntax Error: Expected ']' after list elements.", line)
-
-    index += 1
-
-    return ListNode(elements = elements, line = line), index
-
-def parse_append(tokens, index, var_name, expected_type):
-
-    line = tokens[index].line
-    if symbol_table.lookup_variable(var_name)["is_list"] == False:
-        raise SemanticError(f"Semantic Error: Variable '{var_name}' is not a list.", line)
-    
-    if tokens[index].value != "append":
-        raise SemanticError(f"Semantic Error: Expected 'append'.", line)
-    
-    index += 1
-    if tokens[index].type != "OPPAR":
-        raise SemanticError(f"Syntax Error: Expected '(' after 'append'.", line)
-    index += 1
-
-    elements = []
-    while tokens[index].type != "CLPAR":
-        elem, index = parse_expression_type(tokens, index, expected_type)
-        elements.append(elem)
-
-        if tokens[index].type == "COMMA":
-            index += 1
-
-    if tokens[index].type != "CLPAR":
-        raise SemanticError(f"Syntax Error: Expected ')' after append arguments.", line)
-    index += 1  
-
-    return AppendNode(elements, line=line), index
-
-def parse_insert(tokens, index, var_name, expected_type):
-    line = tokens[index].line
-    if symbol_table.lookup_variable(var_name)["is_list"] == False:
-        raise SemanticError(f"Semantic Error: Variable '{var_name}' is not a list.", line)
-    
-    if tokens[index].value != "insert":
-        raise SemanticError(f"Semantic Error: Expected 'insert'.", line)
-
-    index += 1
-    if tokens[index].type != "OPPAR":
-        raise SemanticError(f"Syntax Error: Expected '(' after 'insert'.", line)
-    index += 1
-
-    if tokens[index].type != "CHU_LIT":
-        raise SemanticError(f"Semantic Error: Expected chungus literal as index in 'insert'.", line)
-    index_value = tokens[index].value
-    index += 1
-
-    if tokens[index].type != "COMMA":
-        raise SemanticError(f"Syntax Error: Expected ',' after index in 'insert'.", line)
-    index += 1  
-
-    elements = []
-
-    while tokens[index].type != "CLPAR":
-        elem, index = parse_expression_type(tokens, index, expected_type)
-        elements.append(elem)
-
-        if tokens[index].type == "COMMA":
-            index += 1
-
-    if tokens[index].type != "CLPAR":
-        raise SemanticError(f"Syntax Error: Expected ')' after insert arguments.", line)
-    index += 1
-
-    return InsertNode(index_value, elements, line=line), index
-
-def parse_remove(tokens, index, var_name, expected_type):
-    line = tokens[index].line
-    if symbol_table.lookup_variable(var_name)["is_list"] == False:
-        raise SemanticError(f"Semantic Error: Variable '{var_name}' is not a list.", line)
-    
-    if tokens[index].value != "remove":
-        raise SemanticError(f"Semantic Error: Expected 'remove'.", line)
-
-    index += 1
-    if tokens[index].type != "OPPAR":
-        raise SemanticError(f"Syntax Error: Expected '(' after 'remove'.", line)
-    index += 1
-
-    if tokens[index].type == "CHU_LIT":
-        value = tokens[index].value
-        index += 1
-        
-    else:
-        raise SemanticError(f"Semantic Error: Expected chungus literal or identifier as argument to 'remove'.", line)
-
-    if tokens[index].type != "CLPAR":
-        raise SemanticError(f"Syntax Error: Expected ')' after remove argument.", line)
-    index += 1
-
-    return RemoveNode(var_name, value, line=line), index
-
-def parse_struct(tokens, index):
-    line = tokens[index].line
-    index += 1 
-
-    if tokens[index].type != "IDENTIFIER":
-        raise SemanticError(f"Semantic Error: Expected struct name after 'aura'.", line)
-
-    struct_name = tokens[index].value
-    index += 1
-
-    if tokens[index].type != "OPCUR":  # Expect `{`
-        raise SemanticError(f"Syntax Error: Expected '{{' to start struct body.", line)
-    index += 1
-
-    while tokens[index].type == "NL":
-        index += 1
-
-    members = []
-    while tokens[index].type != "CLCUR":  # Until `}`
-        line = tokens[index].line
-        if tokens[index].value not in {"chungus", "chudeluxe", "forsen", "forsencd", "lwk"}:
-            raise SemanticError(f"Semantic Error: Expected valid data type in struct declaration.", line)
-        
-        member_type = tokens[index].value
-        index += 1
-
-        if tokens[index].type != "IDENTIFIER":
-            raise SemanticError(f"Semantic Error: Expected member variable name after data type.", line)
-
-        member_name = tokens[index].value
-        index += 1
-
-        default_value = None
-
-        if tokens[index].type == "IS":
-            index += 1
-            default_node, index = parse_expression_type(tokens, index, member_type)
-            default_value = default_node.value
-
-        member_node = ASTNode("Member", f"{member_type} {member_name}", line=line)
-
-        if default_value:
-            member_node.add_child(ASTNode("DefaultValue", default_value, line=line))
-
-        members.append(member_node)
-
-    index += 1  # Move past `}`
-
-    symbol_table.declare_struct(struct_name, members)
-
-    return StructNode(struct_name, members, line=line), index
-
-def parse_struct_instance(tokens, index):
-    line = tokens[index].line
-
-    if tokens[index].value == "aura":
-        index += 1 
-
-    if tokens[index].type != "IDENTIFIER":
-        raise SemanticError(f"Semantic Error: Expected struct name after 'aura'.", line)
-
-    struct_name = tokens[index].value
-    index += 1
-
-    struct_info = symbol_table.lookup_struct(struct_name)
-    if isinstance(struct_info, str):
-        raise SemanticError(f"Semantic Error: Struct '{struct_name}' is not defined.", line)
-
- 
-    struct_instances = []
-    while tokens[index].type == "IDENTIFIER":
-        instance_name = tokens[index].value
-        index += 1
-
-       
-        symbol_table.declare_variable(instance_name, struct_name, is_struct=True)
-
-        struct_instances.append(StructInstanceNode(struct_name, instance_name, line=line))
-
-        if tokens[index].type == "COMMA":
-            index += 1
-        else:
-            break
-
-    if len(struct_instances) == 1:
-        return struct_instances[0], index
-    else:
-        struct_list_node = ASTNode("StructInstanceList")
-        for instance in struct_instances:
-            struct_list_node.add_child(instance)
-        return struct_list_node, index
-
-def parse_struct_member_assignment(tokens, index):
-    line = tokens[index].line
-
-    if tokens[index].type != "IDENTIFIER":
-        raise SemanticError(f"Semantic Error: Expected struct instance name.", line)
-
-    struct_instance = tokens[index].value  # e.g., `Rojo`
-    index += 1
-
-    if tokens[index].type != "DOT":
-        raise SemanticError(f"Syntax Error: Expected '.' after struct instance '{struct_instance}'.", line)
-    index += 1
-
-    if tokens[index].type != "IDENTIFIER":
-        raise SemanticError(f"Syntax Error: Expected struct member name after '.'.", line)
-
-    member_name = tokens[index].value  # e.g., `num`
-    index += 1
-
-    if tokens[index].type != "IS":
-        raise SemanticError(f"Syntax Error: Expected '=' in struct member assignment.", line)
-    index += 1
-
-    instance_info = symbol_table.lookup_variable(struct_instance)
-    if isinstance(instance_info, str):
-        raise SemanticError(f"Semantic Error: Struct instance '{struct_instance}' is not declared.", line)
-
-    struct_name = instance_info["type"]
-    struct_info = symbol_table.lookup_struct(struct_name)
-
-    if member_name not in struct_info:
-        raise SemanticError(f"Semantic Error: Struct '{struct_name}' has no member '{member_name}'.", line)
-
-    expected_type = struct_info[member_name]["type"]
-
-
-    value_node, index = parse_expression_type(tokens, index, expected_type)
-
-    if isinstance(value_node, ASTNode) and value_node.node_type == "Value":
-        final_value = value_node 
-    else:
-        final_value = value_node  
-
-    return StructMemberAssignmentNode(struct_instance, member_name, final_value, line=line), index
@@ -0,0 +1,44 @@
+"""
+Keep generated modules next to the sources.
+
+cgmagen and cfggen write modules whose second line is a marker naming a
+hash of what they were generated from. load() imports such a module as it
+is while the marker still matches, and writes it again first otherwise.
+"""
+import importlib.util
+import os
+import types
+
+
+def load(name, marker, generate, directory=None):
+    """
+    Import the module name from directory, by default the one holding this
+    file, calling generate() for its source and writing it out first when
+    its second line is not marker. Falls back to running the new source in
+    memory when directory is not writable.
+    """
+    directory = directory or os.path.dirname(os.path.abspath(__file__))
+    path = os.path.join(directory, name + '.py')
+    try:
+        with open(path, encoding='utf-8') as file:
+            file.readline()
+            current = file.readline() == marker + '\n'
+    except OSError:
+        current = False
+
+    if not current:
+        source = generate()
+        try:
+            temporary = f'{path}.{os.getpid()}.tmp'
+            with open(temporary, 'w', encoding='utf-8') as file:
+                file.write(source)
+            os.replace(temporary, path)
+        except OSError:
+            module = types.ModuleType(name)
+            exec(compile(source, path, 'exec'), module.__dict__)
+            return module
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
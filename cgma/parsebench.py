@@ -0,0 +1,72 @@
+"""
+Benchmark the generated recursive-descent parser against LL1Parser.
+
+    python parsebench.py [--repeat N] [--copies N] [FILE_OR_GLOB ...]
+
+Lexes each program once, checks that cfggen's parser and the table-driven
+LL1Parser.parse give the same result for it, and prints the best time of
+each. With --copies, every program that parses is also timed with its
+functions repeated that many times, for a longer run through the same code.
+Defaults to the sample program next to the cgma directory.
+"""
+import argparse
+import glob
+import os
+import re
+
+from cfgbench import best_time
+import cgmalexer
+from cgmaparser import parser, descent, SKIPPED_KINDS
+import cfggen
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'sample.txt')
+
+
+def expand(patterns):
+    paths = []
+    for pattern in patterns:
+        paths.extend(sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern])
+    return paths
+
+
+def repeated(text, copies):
+    # text with every function but skibidi repeated copies times; the
+    # parser does not mind the duplicate names
+    parts = re.split(r'(?m)^(?=\w)', text)
+    main = [part for part in parts if re.match(r'\w+\s+skibidi\b', part)]
+    others = ''.join(part for part in parts if part not in main)
+    return others * copies + ''.join(main)
+
+
+def compare(label, text, module, repeat):
+    tokens, errors = cgmalexer.run(label, text)
+    tokens = list(tokens)
+    table_result = parser.parse(tokens)
+    descent_result = module.parse(tokens)
+    assert table_result == descent_result, f"{label}: {table_result} != {descent_result}"
+    table = best_time(lambda: parser.parse(tokens), repeat)
+    recursive = best_time(lambda: module.parse(tokens), repeat)
+    status = 'ok' if table_result[0] else 'error'
+    print(f"{label:<32} {len(tokens):>8} tokens {status:>6}   LL1Parser {table * 1000:9.2f} ms"
+          f"   descent {recursive * 1000:9.2f} ms   {table / recursive:5.1f}x")
+    return table_result[0]
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument('paths', nargs='*', metavar='FILE_OR_GLOB', default=[SAMPLE], help='programs to parse')
+    arguments.add_argument('--repeat', type=int, default=5, help='timing runs, the best one is reported')
+    arguments.add_argument('--copies', type=int, default=0, help='also time programs that parse repeated this many times')
+    args = arguments.parse_args(argv)
+
+    module = descent or cfggen.load(parser, SKIPPED_KINDS)
+    for path in expand(args.paths):
+        with open(path, encoding='utf-8') as file:
+            text = file.read()
+        label = os.path.basename(path)
+        if compare(label, text, module, args.repeat) and args.copies:
+            compare(f'{label} x{args.copies}', repeated(text, args.copies), module, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Random CGMA programs for the differential tests.
+
+program() derives a sentence from cfg, choosing productions at random and
+the shortest ones once the derivation gets deep, writes it out as source
+with one sample text per token type, and optionally mutates a few tokens
+so that broken programs are covered too. COUNT, which CGMA_RANDOM_PROGRAMS
+overrides, is how many programs each test draws.
+"""
+import os
+import random
+
+from cfg import cfg
+
+COUNT = int(os.environ.get('CGMA_RANDOM_PROGRAMS', 300))
+
+TEXT = {
+    'IDENTIFIER': 'x',
+    'CHU_LIT': '1',
+    'CHUDEL_LIT': '1.5',
+    'FORSEN_LIT': '"s\\n"',
+    'FORSENCD_LIT': "'c'",
+    'LWK_LIT': 'true',
+    'NL': '\n',
+}
+# Written without a blank after them, or before them, as the lexer requires.
+# '-' is written both ways, to lex as NEGAT as well as MINUS.
+ATTACHED = frozenset({'.', '!'})
+ATTACHED_BEFORE = frozenset({'.'})
+MAX_DEPTH = 12
+
+
+def heights(cfg):
+    # Least derivation height of every non-terminal
+    height = {}
+    changed = True
+    while changed:
+        changed = False
+        for non_terminal, productions in cfg.items():
+            for production in productions:
+                candidate = 1 + max([height.get(symbol, float('inf')) if symbol in cfg else 0
+                                     for symbol in production])
+                if candidate < height.get(non_terminal, float('inf')):
+                    height[non_terminal] = candidate
+                    changed = True
+    return height
+
+
+HEIGHT = heights(cfg)
+
+
+def derive(generator, symbol, depth, out):
+    if symbol not in cfg:
+        if symbol != 'ε':
+            out.append(TEXT.get(symbol, symbol))
+        return
+    productions = cfg[symbol]
+    if depth > MAX_DEPTH:
+        height = lambda production: max([HEIGHT[item] if item in cfg else 0 for item in production])
+        lowest = min(map(height, productions))
+        productions = [production for production in productions if height(production) == lowest]
+    for item in generator.choice(productions):
+        derive(generator, item, depth + 1, out)
+
+
+def write(generator, words):
+    parts = []
+    previous = '\n'
+    for word in words:
+        attached = previous in ATTACHED or word in ATTACHED_BEFORE or previous == '-' and generator.random() < .5
+        if parts and not attached:
+            parts.append(' /* c */ ' if generator.random() < .03 else ' ')
+        parts.append(word)
+        if word == '\n' and generator.random() < .5:
+            parts.append('\t')
+        previous = word
+    return ''.join(parts)
+
+
+def program(generator, mutate=True):
+    words = []
+    derive(generator, next(iter(cfg)), 0, words)
+    if mutate and generator.random() < .6:
+        for _ in range(generator.randint(1, 3)):
+            index = generator.randrange(len(words) + 1)
+            choice = generator.random()
+            if choice < .4 and words:
+                del words[min(index, len(words) - 1)]
+            elif choice < .8:
+                words.insert(index, generator.choice(words + ['-', '0', 'back', '$', 'EOF']))
+            elif words:
+                words[min(index, len(words) - 1)] = generator.choice(words)
+    return write(generator, words)
+
+
+def programs(seed, count=None):
+    generator = random.Random(seed)
+    for _ in range(COUNT if count is None else count):
+        yield program(generator)
@@ -0,0 +1,162 @@
+"""
+Differential tests for the lexer: every way of lexing a text has to give
+the tokens and errors of scan(), the reference definition, and tokens
+built by hand have to match the grammar terminals of lexed ones.
+"""
+import random
+
+import pytest
+
+import cgmalexer
+from cgmalexer import Token, KIND_NAMES, run
+from programs import programs
+
+FRAGMENTS = ['\n', '\n\t', '\t', '  ', 'x', 'x.ts()', '-1', '- 1', '-x', 'chungus', '/*', '*/', '// c\n',
+             '"a\\n', '"', '\\', '\\\n', '1.5', '.', '+', '!x', 'back 0', '{', '}', '\n\n\t\t', "'c'", '$']
+
+
+def texts(seed, count=None):
+    # Random programs, and soups of fragments that open and close comments,
+    # strings and escapes anywhere
+    generator = random.Random(seed)
+    for index, text in enumerate(programs(seed, count)):
+        yield text
+        if index % 3 == 0:
+            yield ''.join(generator.choice(FRAGMENTS) for _ in range(generator.randint(1, 200)))
+
+
+def listed(tokens):
+    return [(token.type, token.value, token.line, token.start, token.end) for token in tokens]
+
+
+def messages(errors):
+    return [error.as_string() for error in errors]
+
+
+def test_specialized_scan_matches_reference():
+    for text in texts(1):
+        assert list(cgmalexer.scan(text)) == list(cgmalexer.reference_scan(text)), text
+
+
+def test_tokenize_matches_scan():
+    # run() fills the buffer through tokenize(); with an error limit it
+    # goes through scan() instead
+    for text in texts(2):
+        tokens, errors = run('<test>', text)
+        limited, limited_errors = run('<test>', text, max_errors=10 ** 9)
+        assert listed(tokens) == listed(limited), text
+        assert messages(errors) == messages(limited_errors), text
+
+
+@pytest.mark.parametrize('chunk_size', [7, 64, None])
+def test_iter_tokens_matches_run(chunk_size):
+    for text in texts(3):
+        tokens, errors = run('<test>', text)
+        source = text if chunk_size is None else ChunkedText(text)
+        streamed = list(cgmalexer.iter_tokens('<test>', source, chunk_size or cgmalexer.CHUNK_SIZE))
+        assert listed(token for token in streamed if isinstance(token, Token)) == listed(tokens), text
+        assert messages(error for error in streamed if not isinstance(error, Token)) == messages(errors), text
+
+
+class ChunkedText:
+    # A text file stand-in for iter_tokens
+    def __init__(self, text):
+        self.text = text
+        self.offset = 0
+
+    def read(self, size):
+        chunk = self.text[self.offset:self.offset + size]
+        self.offset += len(chunk)
+        return chunk
+
+
+def test_stream_matches_run():
+    # stream() reuses one cursor, so each token is read as it is yielded
+    for text in texts(4):
+        tokens, errors = run('<test>', text)
+        streamed = list(listed([token])[0] if not isinstance(token, cgmalexer.Error) else token.as_string()
+                        for token in cgmalexer.stream('<test>', text))
+        assert [item for item in streamed if isinstance(item, tuple)] == listed(tokens), text
+        assert [item for item in streamed if isinstance(item, str)] == messages(errors), text
+
+
+def test_relex_matches_run():
+    generator = random.Random(5)
+    for text in texts(5, 100):
+        tokens, errors = run('<test>', text)
+        for _ in range(5):
+            offset = generator.randrange(len(text) + 1)
+            deleted = min(generator.randrange(4), len(text) - offset)
+            inserted = generator.choice(FRAGMENTS + ['', ' '])
+            tokens, errors = cgmalexer.relex('<test>', tokens, errors, offset, deleted, inserted)
+            text = text[:offset] + inserted + text[offset + deleted:]
+            fresh, fresh_errors = run('<test>', text)
+            assert listed(tokens) == listed(fresh), text
+            assert messages(errors) == messages(fresh_errors), text
+
+
+def test_run_parallel_matches_run(monkeypatch):
+    monkeypatch.setattr(cgmalexer, 'PARALLEL_MIN_SIZE', 0)
+    text = ''.join(texts(6, 200))
+    tokens, errors = run('<test>', text)
+    merged, merged_errors = cgmalexer.run_parallel('<test>', text, 3)
+    assert listed(merged) == listed(tokens)
+    assert messages(merged_errors) == messages(errors)
+
+
+def test_hand_built_tokens_match_lexed_terminals():
+    for text in texts(7):
+        tokens, _ = run('<test>', text)
+        for token in tokens:
+            assert Token(token.type, token.value, token.line).terminal == token.terminal, (token, text)
+
+
+@pytest.mark.parametrize('type_, value, source, terminal', [
+    ('DOT', '.', 'x.ts', '.'),
+    ('NEGAT', '-', '-1', '-'),
+    ('MINUS', '-', 'x - 1', '-'),
+    ('NL', '\\n', 'x\nx', 'NL'),
+    ('IDENTIFIER', 'x', 'x', 'IDENTIFIER'),
+    ('KEYWORD', 'chungus', 'chungus x', 'chungus'),
+    ('LWK_LIT', 'true', 'true', 'LWK_LIT'),
+])
+def test_terminals(type_, value, source, terminal):
+    assert KIND_NAMES[Token(type_, value).terminal] == terminal
+    tokens, errors = run('<test>', source)
+    assert not errors
+    assert [KIND_NAMES[token.terminal] for token in tokens if token.type == type_][:1] == [terminal]
+
+
+@pytest.mark.parametrize('opening', ['/* never closed\n', '// one long line ', '\n' + ' ' * 50])
+def test_iter_tokens_scans_open_constructs_once(monkeypatch, opening):
+    # A comment or blank run open across many chunks must not be scanned
+    # again from its start for every chunk
+    filler = '\tchungus y = 2 + x\n' if opening.startswith('/*') else ' ' * 19
+    text = 'chungus skibidi(){\n' + opening + filler * 20000 + '\nback 0\n}\n'
+    scanned = []
+    scan = cgmalexer.scan
+    monkeypatch.setattr(cgmalexer, 'scan', lambda buffer, i=0: scanned.append(len(buffer) - i) or scan(buffer, i))
+    streamed = list(cgmalexer.iter_tokens('<test>', ChunkedText(text), 1024))
+    monkeypatch.undo()
+    tokens, errors = run('<test>', text)
+    assert listed(token for token in streamed if isinstance(token, Token)) == listed(tokens)
+    assert messages(error for error in streamed if not isinstance(error, Token)) == messages(errors)
+    assert sum(scanned) < 4 * len(text)
+
+
+@pytest.mark.parametrize('encoded', [
+    b'chungus skibidi(){\n\tback 0\n}\n',
+    b'chungus skibidi(){\r\n\tback 0\r\n}\r\n',
+    b'chungus skibidi(){\r\tback 0\r}\r',
+    b'\xef\xbb\xbfchungus skibidi(){\r\n\tyap("\xc3\xa9")\r\n\tback 0\r\n}\r\n',
+    b'',
+])
+def test_run_file_matches_reading_the_file(tmp_path, encoded):
+    path = tmp_path / 'program.cgma'
+    path.write_bytes(encoded)
+    with open(path, encoding='utf-8-sig') as file:
+        text = file.read()
+    tokens, errors = cgmalexer.run_file(str(path))
+    expected, expected_errors = run(str(path), text)
+    assert listed(tokens) == listed(expected)
+    assert messages(errors) == messages(expected_errors)
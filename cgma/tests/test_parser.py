@@ -0,0 +1,213 @@
+"""
+Differential tests for the parsers: LL1Parser.parse has to give the first
+error of the original parser, kept below as baseline_parse, and the other
+ways of parsing (hand-built Tokens, parse_stream, the generated
+recursive-descent parser, incremental reparsing) have to agree with it.
+"""
+import random
+import re
+
+import pytest
+
+import cfggen
+import cgmalexer
+from cfg import cfg, parsing_table
+from cgmalexer import Token, run
+from cgmaparser import parser, descent, descent_parse, IncrementalParse, SKIPPED_KINDS
+from programs import programs
+
+# Programs covering terminals the lexer maps onto other grammar symbols
+PROGRAMS = [
+    'chungus skibidi(){\nx.ts()\nback 0\n}',
+    'chungus skibidi(){\ny.taper()\nback 0\n}',
+    'chungus skibidi(){\nx.y = 1\nback 0\n}',
+    'chungus skibidi(){\nchungus x = -1\nback 0\n}',
+    'chungus skibidi(){\n\tchungus x = 1 - 1\n\tyap(!x)\n\tback 0\n}',
+]
+
+
+# The parser as it was before integer kinds and the dense table, matching
+# tokens by type or value against the parsing_table dict
+
+def baseline_parse(tokens):
+    stack = ['EOF', next(iter(cfg))]  # Initialize stack
+    index = 0
+    error_messages = []
+
+    while stack:
+        top = stack.pop()
+        token = tokens[index]
+        token_type = token.type
+        token_value = token.value
+        line = token.line
+
+        while token_type in {'SPC', 'TAB', 'COMMENT'}:
+            index += 1
+            token = tokens[index]
+            token_type = token.type
+            token_value = token.value
+
+        if token_type in {"IDENTIFIER", "CHU_LIT", "CHUDEL_LIT", "FORSEN_LIT", "FORSENCD_LIT"}:
+            pass
+
+        elif token_value in parsing_table.get(top, {}):
+            token_type = token_value
+
+        if top == token_type or top == token_value:
+            index += 1
+        elif top in parsing_table:
+            if token_type in parsing_table[top]:
+                production = parsing_table[top][token_type]
+                if production != ['ε']:
+                    stack.extend(reversed(production))
+            else:
+                expected_tokens = list(set(parsing_table[top].keys()) - {'$', 'ε'})
+                error_message = f"Ln {line} Syntax Error: Unexpected token '{token_value}'. Expected one of: {expected_tokens}"
+                error_messages.append(error_message)
+                return False, error_messages
+        else:
+            error_message = f"Ln {line} Syntax Error: Unexpected token '{token_value}'. Expected: '{top}'"
+            error_messages.append(error_message)
+            return False, error_messages
+
+    if token_type == 'EOF' and not stack:
+        return True, []
+    else:
+        return False, ["Error: Tokens remaining after parsing"]
+
+
+def normalized(result):
+    # "Expected one of" lists come from sets, so their order varies
+    success, messages = result
+    return success, [re.sub(r"(?<=one of: )\[.*\]$", lambda match: str(sorted(eval(match.group(0)))), message)
+                     for message in messages]
+
+
+def lexed(seed, count=None):
+    # (text, tokens) of the random programs without lexical errors
+    for text in programs(seed, count):
+        tokens, errors = run('<test>', text)
+        if not errors:
+            yield text, tokens
+
+
+def mutations(generator, tokens, count=3):
+    # Copies of a token list with a few tokens dropped, repeated or cut off
+    tokens = list(tokens)
+    yield tokens
+    for _ in range(count):
+        changed = list(tokens)
+        for _ in range(generator.randint(1, 3)):
+            if len(changed) < 3:
+                break
+            index = generator.randrange(len(changed) - 1)
+            choice = generator.random()
+            if choice < .4:
+                del changed[index]
+            elif choice < .8:
+                changed.insert(index, changed[generator.randrange(len(changed) - 1)])
+            else:
+                changed = changed[:index] + changed[-1:]
+        yield changed
+
+
+@pytest.mark.parametrize('text', PROGRAMS)
+def test_programs_parse(text):
+    tokens, errors = run('<test>', text)
+    assert not errors
+    assert baseline_parse(list(tokens)) == (True, [])
+    assert parser.parse(tokens) == (True, [])
+    assert parser.parse([Token(token.type, token.value, token.line) for token in tokens]) == (True, [])
+    assert parser.parse_stream('<test>', text) == (True, [])
+    assert descent_parse(tokens) == (True, [])
+
+
+def test_parse_matches_baseline():
+    generator = random.Random(1)
+    for text, tokens in lexed(1):
+        for changed in mutations(generator, tokens):
+            assert normalized(parser.parse(changed)) == normalized(baseline_parse(changed)), text
+
+
+def test_hand_built_tokens_parse_the_same():
+    for text, tokens in lexed(2):
+        built = [Token(token.type, token.value, token.line) for token in tokens]
+        assert parser.parse(built, max_errors=None) == parser.parse(tokens, max_errors=None), text
+
+
+@pytest.mark.parametrize('max_errors', [1, None])
+def test_parse_stream_matches_parse(max_errors):
+    # Lexical errors included: both stop at the first one
+    for text in programs(3):
+        listed = list(cgmalexer.iter_tokens('<test>', text))
+        assert parser.parse_stream('<test>', text, max_errors) == parser.parse(listed, max_errors), text
+
+
+def test_recovery_keeps_the_first_error():
+    for text, tokens in lexed(4):
+        first = parser.parse(tokens)
+        recovered = parser.parse(tokens, max_errors=None)
+        assert recovered[0] == first[0], text
+        assert recovered[1][:1] == first[1], text
+
+
+def test_descent_matches_parse():
+    module = descent or cfggen.load(parser, SKIPPED_KINDS)
+    generator = random.Random(5)
+    for text in programs(5):
+        tokens, errors = run('<test>', text)
+        tokens = list(tokens)
+        variants = list(mutations(generator, tokens))
+        if errors:
+            variants.append(tokens[:5] + [errors[0]] + tokens[5:])
+        for changed in variants:
+            assert module.parse(changed) == parser.parse(changed), text
+
+
+def shape(node):
+    return node.kind, node.width, node.errors, tuple(shape(child) for child in node.children)
+
+
+@pytest.mark.parametrize('max_errors', [1, None])
+def test_incremental_matches_fresh_parse(max_errors):
+    # Broken programs included: the tree is kept through syntax and
+    # lexical errors, and has to be the one a fresh parse recovers
+    generator = random.Random(6)
+    for text in programs(6, 100):
+        document = IncrementalParse('<test>', text, max_errors)
+        for _ in range(8):
+            text = document.text
+            offset = generator.randrange(len(text) + 1)
+            deleted = min(generator.randrange(4), len(text) - offset)
+            digits = [match.start() for match in re.finditer(r'\d', text)]
+            if digits and generator.random() < .5:
+                offset, deleted = generator.choice(digits), 1
+                inserted = generator.choice(['7', '12', '3 + 4', '(5)', 'x', '$', 'back'])
+            else:
+                inserted = generator.choice(['', '1', ' + 1', '\n', ' ', 'x', '(', ')', '}', '{', '.ts()', '"'])
+            document.edit(offset, deleted, inserted)
+            fresh = IncrementalParse('<test>', document.text, max_errors)
+            assert (document.success, document.messages) == (fresh.success, fresh.messages), document.text
+            assert shape(document.root) == shape(fresh.root), document.text
+            assert (document.tree is None) == (fresh.tree is None), document.text
+            if not document.errors:
+                assert (document.success, document.messages) == parser.parse(document.tokens, max_errors)
+
+
+def test_incremental_keeps_errors_local():
+    body = '\tchungus y = 1\n\tyap(y)\n'
+    text = 'chungus f(){\n' + body * 50 + '}\nchungus skibidi(){\n' + body * 50 + '\tback 0\n}'
+    document = IncrementalParse('<test>', text, max_errors=None)
+    assert document.success
+    # Break a statement in the first function, then edit the second
+    broken = text.index('= 1')
+    document.edit(broken, 3, '= = 1')
+    assert not document.success and document.tree is None
+    assert document.region[1] < 20
+    document.edit(document.text.rindex('= 1') + 2, 1, '2')
+    assert document.region[1] < 20
+    assert document.messages == IncrementalParse('<test>', document.text, max_errors=None).messages
+    # Fixing the statement makes the program valid again
+    document.edit(broken, 5, '= 1')
+    assert document.success and document.region[1] < 20
+    assert shape(document.tree) == shape(IncrementalParse('<test>', document.text).tree)
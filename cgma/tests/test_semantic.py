@@ -0,0 +1,175 @@
+"""
+Tests for the semantic analysis: build_ast turns the derivation the parser
+records into an AST, and SemanticAnalyzer has to report the first problem
+in it with the messages /api/semantic has always given.
+"""
+import pytest
+
+from cgmalexer import run
+from cgmaparser import parser
+from cgmasemantic import SemanticAnalyzer, SemanticError, SymbolTable, build_ast
+from programs import programs
+
+
+def main(body, globals_=''):
+    # A program whose skibidi() runs the lines of body
+    return globals_ + 'chungus skibidi(){\n' + ''.join('\t' + line + '\n' for line in body.split('\n')) + '\tback 0\n}'
+
+
+STRUCT = 'aura P {\n\tchungus x = 1\n\tforsencd name\n\tforsen c\n\tlwk ok\n}\n'
+FUNCTIONS = ('chungus add(chungus a, chungus b){\n\tback a + b\n}\n'
+             'forsen first(){\n\tback \'c\'\n}\n'
+             'lwk yes(){\n\tback true\n}\n'
+             'nocap hi(){\n\tyap("hi")\n\tback\n}\n')
+CALLS = FUNCTIONS.count('\n')
+
+PROGRAMS = [
+    # declarations and expressions
+    (main('chungus a = 1\nchudeluxe b = 1.5\nforsen c = \'c\'\nforsencd d = "d"\nlwk e = true'), None),
+    (main('chungus a = 1, b = 2, c = a + b * (a - 1) % 2'), None),
+    (main('chungus a = 1\nchudeluxe b = -a + (chudeluxe) a / 2.5'), None),
+    (main('chungus a = b'), "Ln 2 Semantic Error: Variable 'b' used before declaration."),
+    (main('chungus a = 1\nchungus a = 2'), "Ln 3 Semantic Error: Variable 'a' already declared in this scope."),
+    (main('chungus a = "s"'), "Ln 2 Semantic Error: Invalid factor '\"s\"' in expression."),
+    (main('chungus a = 1 < 2'), "Ln 2 Semantic Error: Invalid factor '<' in expression."),
+    (main('chungus a = 1 / 0'), "Ln 2 Semantic Error: Division or modulus by zero is undefined."),
+    (main('chudeluxe a = 1 % (0.0)'), "Ln 2 Semantic Error: Division or modulus by zero is undefined."),
+    (main('chungus a'), "Ln 2 Semantic Error: Variable must be initialized. Missing '=' after 'a'."),
+    (main('forsencd s = "x"\nchungus a = s'), "Ln 3 Type Error: Cannot use 's' of type forsencd in this expression."),
+    (main('chungus n = 1\nforsen c = n'), "Ln 3 Type Error: Cannot use 'n' of type chungus in forsen expression."),
+    (main('forsen c = "s"'),
+     "Ln 2 Type Error: forsen can only be assigned with identifier of type forsen or a forsen literal."),
+    (main('forsen c = \'a\'\nforsencd s = "a" + c + "b"'), None),
+    (main('forsencd s = "a" - "b"'), "Ln 2 Semantic Error: Invalid factor '-' in expression."),
+    (main('forsencd s = "a"\nforsen c = s.taper()\nchungus n = s.ts()'), None),
+    (main('chungus s = 1\nforsen c = s.taper()'),
+     "Ln 3 Type Error: Cannot use taper function on 's'. Must be a forsencd type identifier."),
+    (main('chungus s = 1\nchungus n = s.ts()'),
+     "Ln 3 Type Error: ts() can only be used on lists or strings, but 's' is of type chungus."),
+    (main('chungus a = [1, 2]\nchungus b = a[0] + a.ts()\na = append(3)\na = insert(0, 4)\na = remove(0)'), None),
+    (main('chungus a = 1\na = append(2)'), "Ln 3 Semantic Error: Variable 'a' is not a list."),
+    (main('chungus x = 1\nchungus b = x[0]'), "Ln 3 Type Error: 'x' is not a list."),
+    (main('chungus a = chat()'), None),
+    # conditions
+    (main('lwk b = 1 + 1 < 3 && (true == false) || !true'), None),
+    (main('lwk b = 1'), "Ln 2 Semantic Error: Expected relational operator after 1."),
+    (main('chungus a = 1\nlwk b = !a'), "Ln 3 Type Error: Cannot apply '!' to type 'chungus'."),
+    (main('lwk b = 1 < 2 < 3'), "Ln 2 Semantic Error: Cannot chain multiple relational operators."),
+    (main('lwk b = "a" == 1'), "Ln 2 Type Error: Cannot compare 'forsencd' with 'chungus'."),
+    (main('lwk b = "a" < "b"'), "Ln 2 Semantic Error: Invalid operator 'LT' for forsencd type."),
+    (main('chungus a = [1]\nlwk c = a.taper()'), "Ln 3 Semantic Error: Expected relational operator after a."),
+    # sturdy variables
+    ('sturdy chungus a = 1\n' + main('yap("{}", a)'), None),
+    ('sturdy chungus a = 1\n' + main('a = 2'), "Ln 3 Semantic Error: Variable 'a' is declared as sturdy."),
+    ('sturdy chungus a = 1\n' + main('chungus a = 2'),
+     "Ln 3 Semantic Error: Variable 'a' is declared as sturdy and cannot be re-declared."),
+    ('sturdy chungus a = "s"\n' + main(''), "Ln 1 Type Error: 'a' must be initialized with a chungus literal."),
+    ('sturdy chungus a = 1 + 1\n' + main(''),
+     "Ln 1 Semantic Error: Sturdy variable 'a' must be assigned only a single literal."),
+    ('sturdy aura a = 1\n' + main(''), "Ln 1 Semantic Error: Invalid sturdy variable type 'aura'."),
+    (main('sturdy chungus a = 1'), "Ln 2 Semantic Error: Unexpected token 'sturdy' in statement."),
+    # statements
+    (main('chungus a = 1\n++a\na--\na = a * 2'), None),
+    (main('a--'), "Ln 2 Semantic Error: Variable 'a' used before declaration."),
+    (main('chungus a = 1\na'), "Ln 3 Semantic Error: Unexpected token 'a' in statement."),
+    (main('chungus a = 1, b = 2\na = 1, b = 2'), "Ln 3 Semantic Error: Unexpected token ',' in statement."),
+    (main('pause'), "Ln 2 Semantic Error: Unexpected token 'pause' in statement."),
+    (main('yap("{} and {}", 1, 2.5)\nyap(1 + 2)\nyap(1 < 2)'), None),
+    (main('yap("{} {}", 1)'), "Ln 2 Type Error: Expected 2 arguments, but got 1."),
+    (main('yap("{", 1)'), "Ln 2 Semantic Error: Invalid string literal '\"{\"' in yap()."),
+    (main('yap("{ }", 1)'), "Ln 2 Syntax Error: Placeholders {} must be adjacent within the string literal."),
+    (main('yap("a" + 1)'), "Ln 2 Semantic Error: Only string literals can be concatenated in yap()."),
+    (main('yap("a" * "b")'), "Ln 2 Syntax Error: Expected ')' after yap statement."),
+    (main('yap("{}", "s")'), "Ln 2 Syntax Error: Expected argument after ',' in yap statement."),
+    (main('yap("{}", q)'), "Ln 2 Semantic Error: Variable 'q' used before declaration."),
+    # control flow
+    (main('chungus a = 1\ntuah(a == 1){\n\tyap("x")\n}hawk tuah(a + 1 > 2){\n\tyap("y")\n}hawk{\n\tyap("z")\n}'), None),
+    (main('chungus a = 1\ntuah(a){\n\tyap("x")\n}'), "Ln 3 Semantic Error: Expected relational operator after a."),
+    (main('tuah(true){\n\tchungus a = 1\n}\nyap("{}", a)'), "Ln 5 Semantic Error: Variable 'a' used before declaration."),
+    (main('plug(chungus i = 0; i < 3; ++i){\n\ttuah(i == 1){\n\t\tpause\n\t}\n}'), None),
+    (main('plug(i = 0; i < 3; i++){\n}'), "Ln 2 Semantic Error: Variable 'i' used before declaration."),
+    (main('chungus i = 0\nplug(i; i < 3; i++){\n}'), "Ln 3 Syntax Error: Expected '=' after for loop identifier."),
+    (main('chungus i = 0\nplug(i = 0; i < 3; i = i + 1){\n}'), "Ln 3 Semantic Error: Invalid update statement."),
+    (main('plug(chungus i = 0; i < 3; j++){\n}'), "Ln 2 Semantic Error: Variable 'j' used before declaration."),
+    (main('chungus a = 1\nlil{\n\ta++\n\tpause\n}jit(a < 3)'), None),
+    (main('chungus a = 1\nlethimcook(a){\n\tcaseoh 1:\n\t\tyap("x")\n\t\tgetout\n\tnpc:\n\t\tgetout\n}'), None),
+    (main('forsencd a = "s"\nlethimcook(a){\n\tcaseoh 1:\n\t\tgetout\n\tnpc:\n\t\tgetout\n}'),
+     "Ln 3 Type Error: Cannot use 'a' of type forsencd in this expression."),
+    # functions
+    (main('add(1, 2)\nhi()\nchungus r = add(add(1, 2), 3) * 2\nforsen c = first()\nlwk y = yes() == true', FUNCTIONS),
+     None),
+    (main('add(1)', FUNCTIONS), f"Ln {CALLS + 2} Type Error: Function 'add' expects 2 arguments, but 1 were provided."),
+    (main('add(1, 2, 3)', FUNCTIONS), f"Ln {CALLS + 2} Type Error: Too many arguments in function call 'add'."),
+    (main('add(1, 2)++', FUNCTIONS), f"Ln {CALLS + 2} Type Error: Unary operators cannot be applied to function calls."),
+    (main('chungus r = nope(1)', FUNCTIONS), f"Ln {CALLS + 2} Semantic Error: Function 'nope' is not defined."),
+    (main('lwk r = nope()', FUNCTIONS), f"Ln {CALLS + 2} Semantic Error: Function 'nope' used before declaration."),
+    (main('chungus r = first()', FUNCTIONS),
+     f"Ln {CALLS + 2} Type Error: Cannot use function 'first' of type forsen in this expression."),
+    (main('yap(hi())', FUNCTIONS), f"Ln {CALLS + 2} Type Error: Function 'hi' returns invalid type 'nocap'."),
+    ('chungus f(){\n\tyap("x")\n}\n' + main(''), "Ln 1 Semantic Error: Function 'f' must return a value of type 'chungus'."),
+    ('chungus f(){\n\tback 1\n}\nchungus f(){\n\tback 1\n}\n' + main(''), "Ln 4 Semantic Error: 'f' already declared."),
+    ('chungus f(chungus a, chungus a){\n\tback 1\n}\n' + main(''),
+     "Ln 1 Semantic Error: Variable 'a' already declared in this scope."),
+    ('chungus f()\n' + main(''), "Ln 1 Syntax Error: Function body must be enclosed in curly braces."),
+    ('nocap f(){\n\tback 1\n}\n' + main(''), "Ln 2 Type Error: nocap function must not return any value."),
+    ('chungus f(){\n\tforsencd s = "s"\n\tback s\n}\n' + main(''),
+     "Ln 3 Type Error: Variable 's' is of type 'forsencd', expected 'chungus'."),
+    ('chungus f(){\n\tjit(true){\n\t\tback "s"\n\t}\n\tback 1\n}\n' + main(''),
+     "Ln 3 Semantic Error: Invalid factor '\"s\"' in expression."),
+    ('chungus f(){\n\tback\n}\n' + main(''), "Ln 2 Semantic Error: Invalid factor '}' in expression."),
+    ('chungus g\n' + main(''), "Ln 1 Syntax Error: Invalid function or variable declaration."),
+    ('x = 1\n' + main(''), "Ln 1 Semantic Error: Invalid token 'x' used in global statement."),
+    # structs
+    (main('aura P p\np.x = p.x + 2\np.name = "n" + p.name\np.ok = p.x > 1\np.c = \'c\'', STRUCT), None),
+    (main('aura P p\np.x = "s"', STRUCT), "Ln 9 Semantic Error: Invalid factor '\"s\"' in expression."),
+    (main('aura P p\np.zz = 1', STRUCT), "Ln 9 Semantic Error: Struct 'P' has no member 'zz'."),
+    (main('aura P p\nq.x = 1', STRUCT), "Ln 9 Semantic Error: Struct instance 'q' is not declared."),
+    (main('aura P p\np.x.y = 1', STRUCT), "Ln 9 Syntax Error: Expected '=' in struct member assignment."),
+    (main('aura P p\np.ts() = 1', STRUCT), "Ln 9 Syntax Error: Expected struct member name after '.'."),
+    (main('aura P p\nforsencd v = p.x', STRUCT), "Ln 9 Type Error: Cannot use 'p.x' of type chungus in this expression."),
+    (main('aura Q q', STRUCT), "Ln 8 Semantic Error: Struct 'Q' is not defined."),
+    (main('aura P p = 1', STRUCT), "Ln 8 Semantic Error: Unexpected token '=' in statement."),
+    (STRUCT + 'aura P q\n' + main(''), "Ln 7 Syntax Error: Expected '{' to start struct body."),
+    ('aura P {\n\tchungus x = "s"\n}\n' + main(''), "Ln 2 Semantic Error: Invalid factor '\"s\"' in expression."),
+    ('aura P {\n\tyap("x")\n}\n' + main(''), "Ln 2 Semantic Error: Expected valid data type in struct declaration."),
+    ('aura P {\n\tchungus a b\n}\n' + main(''), "Ln 2 Semantic Error: Expected valid data type in struct declaration."),
+]
+
+
+def analyze(text):
+    # The message /api/semantic gives for a program, None if there is none
+    tokens, errors = run('<test>', text)
+    assert not errors, text
+    derivation = []
+    assert parser.parse(tokens, derivation=derivation) == (True, []), text
+    try:
+        SemanticAnalyzer(SymbolTable()).analyze(build_ast(derivation, tokens))
+    except SemanticError as error:
+        return str(error)
+    return None
+
+
+@pytest.mark.parametrize('text, message', PROGRAMS)
+def test_programs(text, message):
+    assert analyze(text) == message
+
+
+def test_structs_are_per_analysis():
+    # The table of one analysis must not leak into the next
+    assert analyze(main('aura P p\np.x = 1', STRUCT)) is None
+    assert analyze(main('aura P p\np.x = 1')) == "Ln 2 Semantic Error: Struct 'P' is not defined."
+
+
+def test_random_programs_build_and_analyze():
+    # Any program that parses gets an AST and at most a SemanticError
+    for text in programs(7):
+        tokens, errors = run('<test>', text)
+        derivation = []
+        if errors or not parser.parse(tokens, derivation=derivation)[0]:
+            continue
+        root = build_ast(derivation, tokens)
+        assert root.children[-1].value == 'skibidi', text
+        try:
+            SemanticAnalyzer(SymbolTable()).analyze(root)
+        except SemanticError:
+            pass
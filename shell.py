@@ -7,7 +7,7 @@ def process_input():
     Process the input text using cgmalexer and update the output and error sections.
     """
     input_text = input_textbox.get("1.0", tk.END).strip()  # Get input from the text box
-    tokens, errors = cgmalexer.run('<file>', input_text)
+    tokens, errors = cgmalexer.cached_run('<file>', input_text)
 
     # Clear the previous tokens
     for item in token_output_tree.get_children():